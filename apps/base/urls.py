@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'base'
 
+# Di bawah ASGI (ASYNC_VIEWS) homepage memakai view async
+home = (views.AsyncHomeView if settings.ASYNC_VIEWS else views.HomeView).as_view()
+
 urlpatterns = [
     # Halaman Utama
-    path('', views.HomeView.as_view(), name='home'),
+    path('', home, name='home'),
     # Halaman Tentang Kami
     path('about/', views.AboutView.as_view(), name='about'),
 ]
\ No newline at end of file
@@ -1,33 +1,57 @@
+import asyncio
+
 from django.shortcuts import render
 from django.views.generic import TemplateView
-from apps.core.models import Destination, Category, District
-from django.db.models import Sum
+from apps.core.models import Category
+from apps.core.cache import CatalogPageCacheMixin
+from apps.core.routers import replica_reads
+from apps.core.stats import aget_stats, destination_objects, get_stats
+from apps.core.views import alist
 from typing import Any
 
 
-class HomeView(TemplateView):
+@replica_reads
+class HomeView(CatalogPageCacheMixin, TemplateView):
     # View homepage, menampilkan destinasi unggulan & kategori.
     template_name = 'base/home.html'
+    cache_query_params = ()
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         # Ambil context data standar dari parent
         context = super().get_context_data(**kwargs)
-        # Query 3 destinasi terbaru untuk slider hero
-        context['featured_destinations'] = Destination.objects.order_by('-created_at')[:3]
-        # Query 3 destinasi terpopuler berdasarkan views
-        context['popular_destinations'] = Destination.objects.order_by('-view_count')[:3]
-        # Query semua kategori untuk navigasi/widget
-        context['category_list'] = Category.objects.all()
-        # Statistik untuk homepage
-        context['destination_count'] = Destination.objects.count()
-        context['district_count'] = District.objects.count()
-        context['total_views'] = Destination.objects.aggregate(Sum('view_count'))['view_count__sum'] or 0
+        # Statistik, destinasi terbaru & terpopuler dari read model CatalogStats
+        context.update(self.catalog_context(get_stats(), Category.objects.all()))
         return context
 
+    def catalog_context(self, stats, category_list) -> dict[str, Any]:
+        return {
+            # 3 destinasi terbaru untuk slider hero
+            'featured_destinations': destination_objects(stats.recent_destinations[:3]),
+            # 3 destinasi terpopuler berdasarkan views
+            'popular_destinations': destination_objects(stats.top_destinations[:3]),
+            # Query semua kategori untuk navigasi/widget
+            'category_list': category_list,
+            # Statistik untuk homepage
+            'destination_count': stats.destination_count,
+            'district_count': stats.district_count,
+            'total_views': stats.total_views,
+        }
+
+
+class AsyncHomeView(HomeView):
+    # Homepage untuk ASGI: statistik & kategori diambil bersamaan
+
+    async def get(self, request, *args: Any, **kwargs: Any):
+        stats, category_list = await asyncio.gather(aget_stats(), alist(Category.objects.all()))
+        context = TemplateView.get_context_data(self, **kwargs)
+        context.update(self.catalog_context(stats, category_list))
+        return self.render_to_response(context)
+
 
-class AboutView(TemplateView):
+class AboutView(CatalogPageCacheMixin, TemplateView):
     # View untuk halaman 'Tentang Kami'.
     template_name = 'base/about.html'
+    cache_query_params = ()
 
 
 # --- Custon Error Handlers ---
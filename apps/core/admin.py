@@ -1,22 +1,82 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin, TabularInline
+from unfold.contrib.filters.admin import AutocompleteSelectFilter
+from .db import retry_on_lock
 from .models import Category, Destination, District, DestinationGallery
+from .images import derivative_url
+from .pagination import estimated_count
+from .storage import delete_files_on_error
+
+
+class EstimatedCountPaginator(Paginator):
+    # Paginator changelist yang memakai jumlah baris dari cache (per versi
+    # katalog + query) sehingga COUNT(*) tidak dijalankan di setiap halaman.
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
+
+
+def destination_total(field):
+    # Jumlah destinasi per kecamatan/kategori sebagai subquery berkorelasi.
+    # Tiap baris dihitung dari index FK destinasi; berbeda dengan Count() + JOIN,
+    # anotasi ini tidak ikut dalam COUNT(*) changelist dan tanpa GROUP BY besar.
+    totals = (
+        Destination.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(totals, output_field=IntegerField()), 0)
+
+class RetryOnLockMixin:
+    # Simpan/hapus dari admin berjalan dalam satu transaksi; view diulang
+    # utuh (di luar transaksi itu) jika database terkunci. save_model tidak
+    # bisa di-retry sendiri karena berada di dalam transaksi tersebut, jadi
+    # upload dari percobaan yang gagal dihapus lagi; percobaan ulang menulis
+    # file yang sama (nama ber-hash isi).
+
+    @retry_on_lock
+    def changeform_view(self, request, *args, **kwargs):
+        # Percobaan sebelumnya sudah membaca upload sampai habis
+        for _, uploads in request.FILES.lists():
+            for upload in uploads:
+                upload.seek(0)
+        with delete_files_on_error():
+            return super().changeform_view(request, *args, **kwargs)
+
+    @retry_on_lock
+    def delete_view(self, *args, **kwargs):
+        return super().delete_view(*args, **kwargs)
+
 
 @admin.register(District)
-class DistrictAdmin(ModelAdmin):
-    list_display = ('name', 'slug')
+class DistrictAdmin(RetryOnLockMixin, ModelAdmin):
+    list_display = ('name', 'slug', 'destination_total')
     search_fields = ('name',)
 
+    def get_queryset(self, request):
+        # Jumlah destinasi dihitung dalam query changelist (tanpa COUNT per baris)
+        return super().get_queryset(request).annotate(destination_total=destination_total('district'))
+
+    @admin.display(description="Total Destinations", ordering='destination_total')
+    def destination_total(self, obj):
+        return obj.destination_total
+
 class DestinationGalleryInline(TabularInline):
     model = DestinationGallery
     extra = 1
     fields = ('image', 'caption')
 
 @admin.register(Category)
-class CategoryAdmin(ModelAdmin):
+class CategoryAdmin(RetryOnLockMixin, ModelAdmin):
     # Konfigurasi Admin untuk model Kategori dengan Unfold.
-    list_display = ('name', 'slug', 'icon_preview')
+    list_display = ('name', 'slug', 'icon_preview', 'destination_count_badge')
     exclude = ['slug']  # Sembunyikan slug (otomatis)
     list_per_page = 20
     search_fields = ('name',)
@@ -44,25 +104,40 @@ class CategoryAdmin(ModelAdmin):
         return "-"
     icon_preview.short_description = "Icon"
 
+    def get_queryset(self, request):
+        # Jumlah destinasi di-annotate sekali untuk semua baris
+        return super().get_queryset(request).annotate(destination_total=destination_total('category'))
+
     def destination_count_badge(self, obj):
         # Tampilkan badge jumlah destinasi
-        count = obj.destinations.count()
+        count = obj.destination_total
         color = "green" if count > 0 else "gray"
         return format_html(
             '<span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-{}-100 text-{}-800">{} Destinations</span>',
             color, color, count
         )
     destination_count_badge.short_description = "Total Destinations"
+    destination_count_badge.admin_order_field = 'destination_total'
 
 
 @admin.register(Destination)
-class DestinationAdmin(ModelAdmin):
+class DestinationAdmin(RetryOnLockMixin, ModelAdmin):
     # Konfigurasi Admin Destinasi dengan preview gambar & badge.
     list_display = ('image_preview', 'name', 'category_badge', 'district', 'view_count', 'created_at')
     list_per_page = 15
     search_fields = ('name', 'district__name', 'manager__username')
-    list_filter = ('district', 'category')
+    # Filter & field FK memakai autocomplete (AJAX) agar tidak memuat semua baris
+    list_filter = (
+        ('district', AutocompleteSelectFilter),
+        ('category', AutocompleteSelectFilter),
+    )
     list_filter_submit = True
+    autocomplete_fields = ['district', 'category']
+    # Kategori & kecamatan di-JOIN, bukan query per baris
+    list_select_related = ('category', 'district')
+    # Tanpa COUNT(*) kedua untuk total tanpa filter, jumlah hasil dari cache
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     exclude = ['manager', 'slug']
     readonly_fields = ['view_count', 'created_at']
     
@@ -97,7 +172,7 @@ class DestinationAdmin(ModelAdmin):
         if obj.main_image:
             return format_html(
                 '<img src="{}" style="width: 50px; height: 50px; object-fit: cover; border-radius: 6px;" />',
-                obj.main_image.url
+                derivative_url(obj.main_image, 100)
             )
         return "-"
     image_preview.short_description = "Photo"
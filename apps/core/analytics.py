@@ -0,0 +1,137 @@
+# Analitik tayangan berbasis bucket waktu (DestinationViewBucket).
+# Buffer tayangan (counters.py) mengumpulkan hit per (destinasi, jam) di
+# memori lalu menulisnya sekaligus dengan INSERT ... ON CONFLICT DO UPDATE.
+# Bucket per jam yang lebih tua dari VIEW_ANALYTICS_HOURLY_DAYS digabung ke
+# bucket harian, dan bucket harian di luar VIEW_ANALYTICS_RETENTION_DAYS
+# dihapus (command rollup_view_analytics).
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Destination, DestinationViewBucket
+
+HOUR = DestinationViewBucket.HOUR
+DAY = DestinationViewBucket.DAY
+
+# Jumlah baris per statement upsert (4 parameter per baris, batas variabel SQLite)
+UPSERT_CHUNK_SIZE = 200
+
+# Jumlah bucket per jam yang diproses per transaksi saat rollup
+ROLLUP_CHUNK_SIZE = 5000
+
+
+def analytics_enabled():
+    return getattr(settings, 'VIEW_ANALYTICS_ENABLED', True)
+
+
+def recording_granularity():
+    # Periode bucket yang ditulis dari request: per jam (default) atau per hari
+    return HOUR if getattr(settings, 'VIEW_ANALYTICS_HOURLY', True) else DAY
+
+
+def bucket_start(moment, granularity):
+    # Awal periode (waktu lokal TIME_ZONE) yang memuat 'moment'
+    local = timezone.localtime(moment)
+    if granularity == HOUR:
+        return local.replace(minute=0, second=0, microsecond=0)
+    return local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _upsert_sql(connection, rows):
+    table = DestinationViewBucket._meta.db_table
+    values = ', '.join(['(%s, %s, %s, %s)'] * rows)
+    insert = f'INSERT INTO {table} (destination_id, granularity, bucket_start, views) VALUES {values}'
+    if connection.vendor == 'mysql':
+        return f'{insert} ON DUPLICATE KEY UPDATE views = views + VALUES(views)'
+    # SQLite >= 3.24 & PostgreSQL
+    return (
+        f'{insert} ON CONFLICT (destination_id, granularity, bucket_start) '
+        f'DO UPDATE SET views = {table}.views + excluded.views'
+    )
+
+
+def upsert_buckets(counts, using='default'):
+    # Tambahkan tayangan ke bucket: counts = {(pk, granularity, bucket_start): n}.
+    # Bucket baru dibuat, bucket lama dijumlahkan; satu statement per chunk.
+    items = [(key, views) for key, views in counts.items() if views]
+    if not items:
+        return 0
+    # Lewati destinasi yang sudah dihapus sejak tayangan dicatat (FK gagal)
+    pks = list({pk for (pk, _, _), _ in items})
+    existing = set()
+    for start in range(0, len(pks), UPSERT_CHUNK_SIZE):
+        existing.update(
+            Destination.objects.using(using).filter(pk__in=pks[start:start + UPSERT_CHUNK_SIZE])
+            .values_list('pk', flat=True)
+        )
+    items = [item for item in items if item[0][0] in existing]
+    if not items:
+        return 0
+    connection = connections[using]
+    field = DestinationViewBucket._meta.get_field('bucket_start')
+    with transaction.atomic(using=using, savepoint=False), connection.cursor() as cursor:
+        for start in range(0, len(items), UPSERT_CHUNK_SIZE):
+            chunk = items[start:start + UPSERT_CHUNK_SIZE]
+            params = []
+            for (pk, granularity, moment), views in chunk:
+                params += [pk, granularity, field.get_db_prep_value(moment, connection), views]
+            cursor.execute(_upsert_sql(connection, len(chunk)), params)
+    return len(items)
+
+
+def top_destinations(start, end, limit=10):
+    # Destinasi terpopuler dalam rentang [start, end): [(destination_id, views), ...].
+    # Memakai index covering (bucket_start, destination, views); bucket per jam
+    # dan harian tidak pernah tumpang tindih, jadi keduanya cukup dijumlahkan.
+    rows = (
+        DestinationViewBucket.objects.filter(bucket_start__gte=start, bucket_start__lt=end)
+        .values('destination_id')
+        .annotate(total=Sum('views'))
+        .order_by('-total', 'destination_id')[:limit]
+    )
+    return [(row['destination_id'], row['total']) for row in rows]
+
+
+def daily_views(destination_id, start, end):
+    # Deret tayangan harian satu destinasi: {date: views} untuk rentang [start, end)
+    series = Counter()
+    rows = DestinationViewBucket.objects.filter(
+        destination_id=destination_id, bucket_start__gte=start, bucket_start__lt=end,
+    ).values_list('bucket_start', 'views')
+    for moment, views in rows:
+        series[timezone.localtime(moment).date()] += views
+    return dict(sorted(series.items()))
+
+
+def rollup(now=None, hourly_days=None, retention_days=None):
+    # Gabungkan bucket per jam yang lama ke bucket harian, lalu hapus bucket
+    # harian di luar masa retensi. Kembalikan jumlah (digabung, dihapus).
+    now = now or timezone.now()
+    if hourly_days is None:
+        hourly_days = getattr(settings, 'VIEW_ANALYTICS_HOURLY_DAYS', 7)
+    if retention_days is None:
+        retention_days = getattr(settings, 'VIEW_ANALYTICS_RETENTION_DAYS', 400)
+    # Batas dibulatkan ke awal hari agar satu hari tidak terpecah dua granularitas
+    hourly_cutoff = bucket_start(now - timedelta(days=hourly_days), DAY)
+    retention_cutoff = bucket_start(now - timedelta(days=retention_days), DAY)
+
+    merged = 0
+    hourly = DestinationViewBucket.objects.filter(granularity=HOUR, bucket_start__lt=hourly_cutoff)
+    while True:
+        with transaction.atomic():
+            rows = list(hourly.order_by('bucket_start').values_list('id', 'destination_id', 'bucket_start', 'views')[:ROLLUP_CHUNK_SIZE])
+            if not rows:
+                break
+            daily = Counter()
+            for _, pk, moment, views in rows:
+                daily[(pk, DAY, bucket_start(moment, DAY))] += views
+            upsert_buckets(daily)
+            DestinationViewBucket.objects.filter(id__in=[row[0] for row in rows]).delete()
+        merged += len(rows)
+
+    pruned, _ = DestinationViewBucket.objects.filter(bucket_start__lt=retention_cutoff).delete()
+    return merged, pruned
@@ -0,0 +1,176 @@
+# API JSON read-only untuk katalog (aplikasi mobile & kiosk mitra).
+# Query memakai values() dengan kolom seperlunya (tanpa instance model),
+# daftar destinasi berhalaman cursor, dan setiap respons diberi ETag kuat
+# dari versi katalog sehingga klien bisa revalidasi murah (304 tanpa query).
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Count
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+
+from .cache import get_catalog_version
+from .models import Category, Destination, DestinationGallery, District
+from .pagination import paginate_by_cursor
+
+# Kolom ringkas destinasi untuk daftar. view_count sengaja tidak ikut:
+# penghitung tayangan tidak menaikkan versi katalog, jadi akan membuat ETag basi.
+DESTINATION_LIST_FIELDS = ('id', 'slug', 'name', 'main_image', 'created_at', 'district_id', 'category_id')
+
+
+def catalog_etag(request):
+    # ETag kuat: versi katalog + path lengkap (termasuk query string)
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'"{get_catalog_version()}-{path_hash}"'
+
+
+def catalog_api(view):
+    # Decorator endpoint API: hanya GET/HEAD, jawab 304 jika If-None-Match
+    # cocok (sebelum query apa pun), dan pasang ETag pada respons 200.
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        etag = catalog_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'CATALOG_API_MAX_AGE', 0))
+        return response
+    return wrapper
+
+
+def _media_url(name):
+    return default_storage.url(name) if name else None
+
+
+def _page_size(request):
+    # ?limit=<n>, dibatasi CATALOG_API_MAX_PAGE_SIZE
+    default = getattr(settings, 'CATALOG_API_PAGE_SIZE', 20)
+    try:
+        limit = int(request.GET.get('limit', default))
+    except ValueError:
+        limit = default
+    return max(1, min(limit, getattr(settings, 'CATALOG_API_MAX_PAGE_SIZE', 100)))
+
+
+def _page_link(request, cursor):
+    # URL halaman lain dengan parameter query yang sama, hanya cursor diganti
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return f'{request.path}?{params.urlencode()}'
+
+
+def _related_map(model):
+    # Peta id -> {'name', 'slug'} untuk kecamatan/kategori (tabel kecil),
+    # di-cache per versi katalog. Query destinasi jadi tanpa JOIN sehingga
+    # SQLite bisa langsung memakai index (created_at, id) untuk ORDER BY.
+    key = f'catalog:api:{model._meta.model_name}:{get_catalog_version()}'
+    mapping = cache.get(key)
+    if mapping is None:
+        mapping = {row['id']: row for row in model.objects.values('id', 'name', 'slug')}
+        for row in mapping.values():
+            del row['id']
+        cache.set(key, mapping, getattr(settings, 'CATALOG_PAGE_CACHE_TIMEOUT', 60 * 15))
+    return mapping
+
+
+def _slug_to_id(mapping, slug):
+    for pk, row in mapping.items():
+        if row['slug'] == slug:
+            return pk
+    return None
+
+
+def _destination_summary(row, districts, categories):
+    return {
+        'id': row['id'],
+        'slug': row['slug'],
+        'name': row['name'],
+        'url': reverse('core:destination_detail', kwargs={'slug': row['slug']}),
+        'main_image': _media_url(row['main_image']),
+        'district': districts.get(row['district_id']),
+        'category': categories.get(row['category_id']),
+        'created_at': row['created_at'],
+    }
+
+
+@catalog_api
+def destination_list(request):
+    # Daftar destinasi berhalaman cursor, filter ?category=<slug> & ?district=<slug>
+    districts = _related_map(District)
+    categories = _related_map(Category)
+    queryset = Destination.objects.values(*DESTINATION_LIST_FIELDS)
+    for param, mapping, field in (('category', categories, 'category_id'), ('district', districts, 'district_id')):
+        slug = request.GET.get(param)
+        if not slug:
+            continue
+        pk = _slug_to_id(mapping, slug)
+        if pk is None:
+            # Slug tidak dikenal: halaman kosong (bukan filter IS NULL)
+            return JsonResponse({'results': [], 'next': None, 'previous': None})
+        queryset = queryset.filter(**{field: pk})
+
+    page = paginate_by_cursor(queryset, _page_size(request), request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [_destination_summary(row, districts, categories) for row in page],
+        'next': _page_link(request, page.next_cursor),
+        'previous': _page_link(request, page.previous_cursor),
+    })
+
+
+@catalog_api
+def destination_detail(request, slug):
+    # Detail destinasi beserta galeri (dua query ringan)
+    row = (
+        Destination.objects.filter(slug=slug)
+        .values(*DESTINATION_LIST_FIELDS, 'description', 'additional_info', 'maps_embed_url')
+        .first()
+    )
+    if row is None:
+        raise Http404("Destination not found")
+    data = _destination_summary(row, _related_map(District), _related_map(Category))
+    data.update({
+        'description': row['description'],
+        'additional_info': row['additional_info'],
+        'maps_embed_url': row['maps_embed_url'] or None,
+        'gallery': [
+            {'image': _media_url(image), 'caption': caption}
+            for image, caption in DestinationGallery.objects.filter(destination_id=row['id'])
+            .order_by('id').values_list('image', 'caption')
+        ],
+    })
+    return JsonResponse(data)
+
+
+@catalog_api
+def category_list(request):
+    # Semua kategori beserta jumlah destinasinya (satu query agregat)
+    rows = (
+        Category.objects.order_by('name')
+        .values('id', 'slug', 'name', 'icon', 'description')
+        .annotate(destination_count=Count('destinations'))
+    )
+    return JsonResponse({'results': list(rows)})
+
+
+@catalog_api
+def district_list(request):
+    # Semua kecamatan beserta jumlah destinasinya (satu query agregat)
+    rows = (
+        District.objects.order_by('name')
+        .values('id', 'slug', 'name', 'description', 'thumbnail')
+        .annotate(destination_count=Count('destinations'))
+    )
+    return JsonResponse({
+        'results': [dict(row, thumbnail=_media_url(row['thumbnail'])) for row in rows],
+    })
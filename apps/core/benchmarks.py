@@ -0,0 +1,377 @@
+# Benchmark HTTP end-to-end untuk semua URL publik (apps.base & apps.core).
+# Setiap route dipanggil N kali dengan C worker paralel, lewat test client
+# (in-process WSGI, worker = thread), aplikasi ASGI in-process (worker =
+# coroutine) atau ke server lokal (urllib). Hasilnya p50/p95/p99, throughput
+# dan jumlah query per request (dibaca dari header Server-Timing), dalam
+# bentuk JSON yang bisa disimpan sebagai baseline lalu dibandingkan.
+import asyncio
+import json
+import math
+import re
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connections
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from .models import Category, Destination, District
+from .views import BENCHMARK_KEY
+
+# Namespace URL yang di-benchmark
+NAMESPACES = ('base', 'core')
+
+# Sumber slug untuk route berparameter <slug>
+SLUG_SOURCES = {
+    'core:destination_detail': Destination,
+    'core:api_destination_detail': Destination,
+    'core:district_detail': District,
+    'core:category_detail': Category,
+}
+
+# Variasi query string tambahan per route (dicatat sebagai skenario terpisah)
+EXTRA_QUERIES = {
+    'core:destination_list': ('?q=pantai',),
+}
+
+# Regresi hanya dilaporkan jika selisih p95 juga melewati batas ini (noise)
+MIN_REGRESSION_MS = 1.0
+
+# Kenaikan rata-rata query per request yang dianggap regresi
+QUERY_REGRESSION_MARGIN = 0.5
+
+# Proses baru untuk mengukur waktu start: django.setup(), lalu request pertama
+# (memuat middleware & urls, kompilasi template) lewat test client
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import django
+django.setup()
+ready = time.perf_counter()
+from django.test import Client
+status = Client(HTTP_HOST='localhost').get('/about/').status_code
+done = time.perf_counter()
+print(json.dumps({'setup_ms': (ready - started) * 1000, 'first_request_ms': (done - ready) * 1000, 'status': status}))
+"""
+
+SERVER_TIMING_QUERIES_RE = re.compile(r'db;desc="(\d+) queries"')
+
+
+def percentile(values, pct):
+    # Persentil nearest-rank dari daftar yang sudah terurut
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def public_routes():
+    # Nama route (namespace:nama) beserta nama parameternya, urut seperti urls.py
+    routes = []
+    for resolver in get_resolver().url_patterns:
+        if not isinstance(resolver, URLResolver) or resolver.namespace not in NAMESPACES:
+            continue
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                routes.append((f'{resolver.namespace}:{pattern.name}', sorted(pattern.pattern.converters)))
+    return routes
+
+
+def build_targets(samples=20):
+    # {skenario: [url, ...]}; route berparameter memakai slug contoh dari database.
+    # Mengembalikan juga daftar route yang dilewati (parameter tak dikenal / tabel kosong).
+    targets = {}
+    skipped = []
+    for name, params in public_routes():
+        if not params:
+            urls = [reverse(name)]
+        elif params == ['slug'] and name in SLUG_SOURCES:
+            slugs = SLUG_SOURCES[name].objects.order_by('pk').values_list('slug', flat=True)[:samples]
+            urls = [reverse(name, kwargs={'slug': slug}) for slug in slugs]
+        else:
+            urls = []
+        if not urls:
+            skipped.append(name)
+            continue
+        targets[name] = urls
+        for query in EXTRA_QUERIES.get(name, ()):
+            targets[f'{name}{query}'] = [f'{url}{query}' for url in urls]
+    return targets, skipped
+
+
+def query_count(server_timing):
+    match = SERVER_TIMING_QUERIES_RE.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+class ClientTransport:
+    # Request in-process lewat django.test.Client (satu client per thread)
+
+    def __init__(self, host='localhost'):
+        self.host = host
+        self.local = threading.local()
+
+    def get(self, url):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            # Ditandai agar tidak menaikkan view_count/analitik destinasi sampel
+            client = self.local.client = Client(HTTP_HOST=self.host, **{BENCHMARK_KEY: True})
+        response = client.get(url)
+        return response.status_code, response.get('Server-Timing')
+
+    def close(self):
+        # Koneksi database milik thread worker
+        connections.close_all()
+
+
+class ASGITransport:
+    # Request in-process lewat ASGIHandler Django, persis seperti server ASGI:
+    # satu event loop, tiap request dengan ThreadSensitiveContext sendiri
+    is_async = True
+
+    def __init__(self, host='localhost'):
+        self.host = host
+        self.application = ASGIHandler()
+
+    async def get(self, url):
+        path, _, query = url.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', self.host.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': (self.host, 80),
+            BENCHMARK_KEY: True,
+        }
+        sent = asyncio.Event()
+        response = {}
+
+        async def receive():
+            if not response:
+                response['requested'] = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Klien tidak pernah putus; handler membatalkan penunggu ini di akhir
+            await sent.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = {name.lower(): value for name, value in message['headers']}
+            elif not message.get('more_body'):
+                sent.set()
+
+        await self.application(scope, receive, send)
+        timing = response.get('headers', {}).get(b'server-timing')
+        return response.get('status'), timing.decode() if timing else None
+
+    def close(self):
+        pass
+
+
+class HTTPTransport:
+    # Request ke server yang sedang berjalan (mis. runserver/gunicorn lokal)
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def get(self, url):
+        try:
+            with urllib.request.urlopen(self.base_url + url, timeout=self.timeout) as response:
+                response.read()
+                return response.status, response.headers.get('Server-Timing')
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers.get('Server-Timing')
+
+    def close(self):
+        pass
+
+
+def _run_chunk(transport, urls):
+    # [(durasi ms, status, Server-Timing)]; status None jika request gagal total
+    results = []
+    for url in urls:
+        started = time.perf_counter()
+        try:
+            status, timing = transport.get(url)
+        except Exception:
+            status, timing = None, None
+        results.append(((time.perf_counter() - started) * 1000, status, timing))
+    return results
+
+
+async def _run_chunk_async(transport, urls):
+    results = []
+    for url in urls:
+        started = time.perf_counter()
+        try:
+            status, timing = await transport.get(url)
+        except Exception:
+            status, timing = None, None
+        results.append(((time.perf_counter() - started) * 1000, status, timing))
+    return results
+
+
+async def _measure_async(transport, warmup, chunks):
+    # Worker berupa coroutine di satu event loop (tanpa thread per worker)
+    for url in warmup:
+        await transport.get(url)
+    started = time.perf_counter()
+    batches = await asyncio.gather(*[_run_chunk_async(transport, chunk) for chunk in chunks])
+    return batches, time.perf_counter() - started
+
+
+def measure(transport, urls, requests, concurrency, warmup=0):
+    # Jalankan 'requests' request (url bergiliran) dengan 'concurrency' worker
+    plan = [url for url, _ in zip(cycle(urls), range(requests))]
+    chunks = [plan[i::concurrency] for i in range(concurrency)]
+    timings = []
+    queries = []
+    statuses = {}
+    errors = 0
+
+    def worker(chunk):
+        try:
+            return _run_chunk(transport, chunk)
+        finally:
+            transport.close()
+
+    if getattr(transport, 'is_async', False):
+        warmup_plan = [url for url, _ in zip(cycle(urls), range(warmup))]
+        batches, wall = asyncio.run(_measure_async(transport, warmup_plan, chunks))
+    else:
+        for url, _ in zip(cycle(urls), range(warmup)):
+            transport.get(url)
+        started = time.perf_counter()
+        if concurrency == 1:
+            # Tanpa thread: koneksi database thread pemanggil tetap dipakai
+            batches = [_run_chunk(transport, plan)]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                batches = list(pool.map(worker, chunks))
+        wall = time.perf_counter() - started
+
+    for batch in batches:
+        for elapsed, status, timing in batch:
+            if status is None:
+                errors += 1
+                continue
+            timings.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if status >= 500:
+                errors += 1
+            count = query_count(timing)
+            if count is not None:
+                queries.append(count)
+    timings.sort()
+    return {
+        'requests': requests,
+        'errors': errors,
+        'status': statuses,
+        'mean_ms': statistics.mean(timings) if timings else None,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'p99_ms': percentile(timings, 99),
+        'max_ms': timings[-1] if timings else None,
+        'throughput_rps': len(timings) / wall if wall else None,
+        'queries_per_request': statistics.mean(queries) if queries else None,
+        'max_queries': max(queries) if queries else None,
+    }
+
+
+def run_suite(transport, targets, requests=100, concurrency=1, warmup=5):
+    return {name: measure(transport, urls, requests, concurrency, warmup) for name, urls in targets.items()}
+
+
+def compare(baseline, current, threshold=0.2):
+    # Daftar regresi: p95 naik > threshold (dan > MIN_REGRESSION_MS), rata-rata
+    # query per request bertambah, atau route mulai error. Route tanpa baseline diabaikan.
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        old, new = before.get('p95_ms'), result.get('p95_ms')
+        if old is not None and new is not None and new > old * (1 + threshold) and new - old > MIN_REGRESSION_MS:
+            regressions.append(f'{name}: p95 {old:.2f} ms -> {new:.2f} ms (+{new - old:.2f} ms)')
+        # Rata-rata, bukan maksimum: flush buffer tayangan menambah query sesekali
+        old, new = before.get('queries_per_request'), result.get('queries_per_request')
+        if old is not None and new is not None and new > old + QUERY_REGRESSION_MARGIN:
+            regressions.append(f'{name}: queries per request {old:.2f} -> {new:.2f}')
+        if result.get('errors') and not before.get('errors'):
+            regressions.append(f'{name}: {result["errors"]} errors (baseline had none)')
+    return regressions
+
+
+def compare_interfaces(wsgi, asgi):
+    # Baris perbandingan per route (hasil run_suite WSGI vs ASGI):
+    # (route, req/s WSGI, req/s ASGI, rasio ASGI/WSGI, p95 WSGI, p95 ASGI)
+    rows = []
+    for name in wsgi:
+        if name not in asgi:
+            continue
+        before, after = wsgi[name], asgi[name]
+        ratio = None
+        if before.get('throughput_rps') and after.get('throughput_rps') is not None:
+            ratio = after['throughput_rps'] / before['throughput_rps']
+        rows.append((
+            name, before.get('throughput_rps'), after.get('throughput_rps'), ratio,
+            before.get('p95_ms'), after.get('p95_ms'),
+        ))
+    return rows
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def run_site_benchmark(arguments, env):
+    # Jalankan 'manage.py benchmark_site' di proses terpisah (settings/urls
+    # dibaca ulang sesuai env), kembalikan laporan JSON-nya
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'report.json')
+        command = [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'benchmark_site', *arguments, '--output', path]
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr[-2000:] or result.stdout[-2000:])
+        return load_report(path)
+
+
+def measure_startup(env, runs=5):
+    # Median waktu start proses baru: total proses, django.setup() dan request pertama
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr[-2000:])
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        sample['process_ms'] = elapsed
+        samples.append(sample)
+    return {
+        key: statistics.median(sample[key] for sample in samples)
+        for key in ('process_ms', 'setup_ms', 'first_request_ms')
+    }
@@ -0,0 +1,100 @@
+# Cache halaman publik berbasis versi katalog.
+# Setiap perubahan konten (Destination, Category, District, DestinationGallery)
+# menaikkan nomor generasi katalog lewat signal, sehingga kunci cache lama
+# otomatis tidak terpakai lagi tanpa perlu menghapus entri satu per satu.
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+CATALOG_VERSION_KEY = 'catalog:version'
+# Parameter query yang mengubah isi halaman; parameter lain (utm_*, dsb.)
+# tidak ikut kunci agar tidak membuat entri cache baru.
+CATALOG_PAGE_QUERY_PARAMS = ('page', 'cursor', 'category', 'q')
+
+
+def get_catalog_version():
+    # Ambil nomor generasi katalog saat ini (mulai dari 1)
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    # Naikkan generasi katalog; semua halaman ter-cache jadi kedaluwarsa
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Kunci belum ada (cache baru/di-restart)
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        return cache.incr(CATALOG_VERSION_KEY)
+
+
+def catalog_page_cache_key(request, user=None, params=CATALOG_PAGE_QUERY_PARAMS):
+    # Kunci cache halaman, atau None jika request tidak boleh di-cache.
+    # Hanya GET/HEAD dari pengunjung anonim yang dilayani dari cache,
+    # sehingga admin/editor selalu melihat halaman yang dirender ulang.
+    # Kunci = path + parameter query yang dipakai view (params) saja.
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    if (user or request.user).is_authenticated:
+        return None
+    query = urlencode([(name, value) for name in sorted(params) for value in request.GET.getlist(name)])
+    path_hash = hashlib.md5(f'{request.path}?{query}'.encode(), usedforsecurity=False).hexdigest()
+    return f'catalog:page:{get_catalog_version()}:{path_hash}'
+
+
+class CatalogPageCacheMixin:
+    # Mixin untuk view publik: layani halaman dari cache jika tersedia,
+    # simpan hasil render 200 OK ke cache setelah template selesai dirender.
+    # View dengan handler async (ASGI) memakai jalur adispatch().
+    # cache_query_params: parameter query yang dibaca view (lihat catalog_page_cache_key).
+    cache_query_params = CATALOG_PAGE_QUERY_PARAMS
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        key = catalog_page_cache_key(request, params=self.cache_query_params)
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        cached = self.cached_response(key)
+        if cached is not None:
+            return cached
+        return self.store_response(key, super().dispatch(request, *args, **kwargs))
+
+    async def adispatch(self, request, *args, **kwargs):
+        # User dimuat lewat auser(): request.user malas memicu query sinkron
+        user = await request.auser() if request.method in ('GET', 'HEAD') else None
+        key = catalog_page_cache_key(request, user, self.cache_query_params)
+        if key is None:
+            return await super().dispatch(request, *args, **kwargs)
+
+        cached = self.cached_response(key)
+        if cached is not None:
+            return cached
+        return self.store_response(key, await super().dispatch(request, *args, **kwargs))
+
+    def cached_response(self, key):
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    def store_response(self, key, response):
+        if response.status_code == 200 and not response.streaming:
+            timeout = getattr(settings, 'CATALOG_PAGE_CACHE_TIMEOUT', 60 * 15)
+
+            def store(rendered):
+                cache.set(key, (rendered.content, rendered['Content-Type']), timeout)
+
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+        return response
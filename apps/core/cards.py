@@ -0,0 +1,61 @@
+# Cache fragmen HTML kartu destinasi (daftar, kategori, kecamatan, homepage).
+# Kunci per kartu = template + id + card_version + view_count, sehingga:
+# - menyimpan destinasi (Destination.save) atau mengganti nama/menghapus
+#   kategori/kecamatannya menaikkan card_version, hanya kartu itu yang dirender ulang;
+# - flush tayangan (UPDATE view_count tanpa signal) otomatis memakai kunci baru.
+# Satu halaman kartu = satu cache.get_many; kartu yang belum ada dirender lalu
+# disimpan dengan satu cache.set_many.
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .models import Destination
+
+
+def card_cache_timeout():
+    return getattr(settings, 'CATALOG_CARD_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def card_cache_key(template_name, destination):
+    return (
+        f'catalog:card:{template_name}:{destination.pk}:'
+        f'{destination.card_version}:{destination.view_count}'
+    )
+
+
+def bump_card_versions(queryset):
+    # Kartu destinasi di queryset dirender ulang pada request berikutnya
+    return queryset.update(card_version=F('card_version') + 1)
+
+
+def render_cards(destinations, template_name):
+    # Daftar HTML kartu (urutan sama dengan destinations)
+    destinations = list(destinations)
+    if not destinations:
+        return []
+    keys = [card_cache_key(template_name, destination) for destination in destinations]
+    cached = cache.get_many(keys)
+    missing = {}
+    template = None
+    for key, destination in zip(keys, destinations):
+        if key not in cached:
+            template = template or get_template(template_name)
+            missing[key] = template.render({'destination': destination})
+    if missing:
+        cache.set_many(missing, card_cache_timeout())
+        cached.update(missing)
+    return [mark_safe(cached[key]) for key in keys]
+
+
+def invalidate_related_cards(sender, instance, raw=False, using='default', **kwargs):
+    # Nama kategori/kecamatan tampil di kartu: naikkan versi destinasinya.
+    # Saat dihapus, id destinasi dicatat lebih dulu di pre_delete (signals.py).
+    if raw:
+        return
+    ids = getattr(instance, '_search_destination_ids', None)
+    if ids is not None:
+        bump_card_versions(Destination.objects.using(using).filter(pk__in=ids))
+    else:
+        bump_card_versions(instance.destinations.using(using).all())
@@ -0,0 +1,229 @@
+# Buffer penghitung tayangan (write-behind) untuk halaman detail destinasi.
+# Setiap kunjungan hanya menambah angka di memori proses; angka-angka itu
+# ditulis ke database secara berkala dalam satu statement UPDATE ... CASE,
+# sehingga halaman populer tidak lagi antre di write lock SQLite.
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from . import analytics
+from .db import is_lock_error, retry_on_lock
+from .instrumentation import background_queries
+from .models import Destination
+from .stats import record_views
+
+logger = logging.getLogger(__name__)
+
+# Batas jumlah id per statement UPDATE (aman untuk limit variabel SQLite)
+FLUSH_CHUNK_SIZE = 300
+
+# Jeda minimum timer flush (detik) agar tidak berputar cepat
+MIN_TIMER_SLEEP = 0.1
+
+
+class ViewCountBuffer:
+    # Akumulator tayangan per destinasi yang di-flush per interval atau per N hit.
+    # Interval dijaga thread timer (daemon), bukan hanya saat hit berikutnya
+    # datang, sehingga jika proses mati mendadak yang hilang paling banyak
+    # satu interval hitungan.
+
+    def __init__(self, flush_interval=None, flush_threshold=None, flush_timer=None):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = Counter()
+        # Tayangan per (pk, periode, awal bucket) untuk analitik berbasis waktu
+        self._buckets = Counter()
+        self._hits = 0
+        self._last_flush = time.monotonic()
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        # Flush latar untuk view async: satu thread, dibuat saat pertama dipakai
+        self._executor = None
+        self._flush_scheduled = False
+        # Thread timer flush: dibuat saat hit pertama (per proses, aman setelah fork)
+        self._flush_timer = flush_timer
+        self._timer_pid = None
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 10)
+
+    @property
+    def flush_threshold(self):
+        if self._flush_threshold is not None:
+            return self._flush_threshold
+        return getattr(settings, 'VIEW_COUNT_FLUSH_THRESHOLD', 100)
+
+    @property
+    def flush_timer(self):
+        if self._flush_timer is not None:
+            return self._flush_timer
+        return getattr(settings, 'VIEW_COUNT_FLUSH_TIMER', True)
+
+    def increment(self, pk, amount=1, background=False):
+        # Tambah tayangan ke buffer, kembalikan selisih yang belum tertulis
+        # untuk pk ini (termasuk hit sekarang) agar halaman bisa menampilkan
+        # total terkini tanpa membaca ulang baris dari database.
+        # background=True (view async): flush yang jatuh tempo dijalankan di
+        # thread latar, request tidak menunggu (fire-and-forget).
+        bucket = None
+        if analytics.analytics_enabled():
+            granularity = analytics.recording_granularity()
+            bucket = (pk, granularity, analytics.bucket_start(timezone.now(), granularity))
+        with self._lock:
+            self._pending[pk] += amount
+            if bucket is not None:
+                self._buckets[bucket] += amount
+            self._hits += amount
+            delta = self._pending[pk]
+            due = (
+                self._hits >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            start_timer = self.flush_timer and self._timer_pid != os.getpid()
+            if start_timer:
+                self._timer_pid = os.getpid()
+        if start_timer:
+            threading.Thread(target=self._run_timer, name='view-count-timer', daemon=True).start()
+        if due and background:
+            self.flush_in_background()
+        elif due:
+            self._flush_or_postpone()
+        return delta
+
+    def _flush_or_postpone(self):
+        try:
+            self.flush()
+        except OperationalError as exc:
+            # Database masih terkunci setelah retry: hitungan sudah kembali
+            # ke buffer dan ditulis di flush berikutnya, halaman tetap tampil
+            if not is_lock_error(exc):
+                raise
+            logger.warning('View count flush postponed: %s', exc)
+
+    def flush_in_background(self):
+        # Jadwalkan satu flush di thread latar; abaikan jika sudah ada yang antre
+        with self._lock:
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='view-count-flush')
+        self._executor.submit(self._background_flush)
+
+    def _background_flush(self):
+        with self._lock:
+            self._flush_scheduled = False
+        try:
+            self._flush_or_postpone()
+        except Exception:
+            logger.exception('Background view count flush failed')
+        finally:
+            # Koneksi milik thread latar mengikuti CONN_MAX_AGE seperti request
+            close_old_connections()
+
+    def _run_timer(self):
+        # Tidur sampai interval sejak flush terakhir habis, lalu flush walau tidak ada hit baru
+        while True:
+            with self._lock:
+                remaining = self.flush_interval - (time.monotonic() - self._last_flush)
+            time.sleep(max(remaining, MIN_TIMER_SLEEP))
+            try:
+                self.flush_if_due()
+            except Exception:
+                logger.exception('Timed view count flush failed')
+            finally:
+                close_old_connections()
+
+    def flush_if_due(self):
+        # Flush jika ada hitungan dan interval sudah lewat; True jika flush dijalankan
+        with self._lock:
+            due = bool(self._pending) and time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self._flush_or_postpone()
+        return due
+
+    def pending(self, pk):
+        # Jumlah tayangan pk yang masih menunggu di buffer
+        with self._lock:
+            return self._pending.get(pk, 0)
+
+    def flush(self):
+        # Tulis seluruh isi buffer ke database, kembalikan jumlah baris terdampak.
+        # Buffer ditukar dulu di bawah lock supaya increment lain tidak menunggu IO.
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                buckets = self._buckets
+                self._pending = Counter()
+                self._buckets = Counter()
+                self._hits = 0
+                self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+            try:
+                # Flush yang jatuh tempo saat request tidak dihitung ke anggaran query view itu
+                with background_queries():
+                    return self._write(batch, buckets)
+            except Exception:
+                # Kembalikan hitungan ke buffer agar dicoba lagi di flush berikutnya
+                with self._lock:
+                    self._pending.update(batch)
+                    self._buckets.update(buckets)
+                    self._hits += sum(batch.values())
+                raise
+
+    @retry_on_lock
+    def _write(self, batch, buckets=None):
+        updated = 0
+        items = list(batch.items())
+        with transaction.atomic():
+            for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                chunk = items[start:start + FLUSH_CHUNK_SIZE]
+                increment = Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in chunk],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                updated += Destination.objects.filter(
+                    pk__in=[pk for pk, _ in chunk]
+                ).update(view_count=F('view_count') + increment)
+            # Total tayangan & top-N di statistik katalog ikut diperbarui
+            record_views(batch)
+            # Bucket analitik: satu upsert per chunk untuk semua (destinasi, jam)
+            if buckets:
+                analytics.upsert_buckets(buckets)
+        return updated
+
+    def clear(self):
+        # Buang isi buffer tanpa menulis (dipakai di test)
+        with self._lock:
+            self._pending.clear()
+            self._buckets.clear()
+            self._hits = 0
+            self._last_flush = time.monotonic()
+
+
+view_counter = ViewCountBuffer()
+
+
+def _flush_on_exit():
+    # Flush terakhir saat proses berhenti normal
+    try:
+        view_counter.flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_on_exit)
@@ -0,0 +1,64 @@
+# Profil SQLite untuk production: pragma per koneksi (WAL, synchronous,
+# mmap, cache, busy_timeout) dan retry dengan backoff untuk penulisan yang
+# gagal karena "database is locked". Dengan WAL pembaca tidak lagi menunggu
+# penulis; penulis tetap satu per satu, jadi yang kalah antre dicoba ulang.
+import logging
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+# Pesan error SQLite untuk lock yang masih bisa dicoba ulang
+LOCK_ERRORS = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def sqlite_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', {})
+
+
+def apply_pragmas(dbapi_connection, pragmas=None):
+    # Jalankan PRAGMA langsung di koneksi sqlite3 (tidak lewat cursor Django,
+    # jadi tidak ikut terhitung di instrumentasi query per request)
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    for name, value in pragmas.items():
+        dbapi_connection.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_connection(sender, connection, **kwargs):
+    # Receiver connection_created: pragma hanya untuk backend SQLite
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection)
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and any(message in str(exc).lower() for message in LOCK_ERRORS)
+
+
+def retry_on_lock(func=None, *, using='default', attempts=None, delay=None, max_delay=None):
+    # Decorator: ulangi fungsi tulis saat database terkunci, dengan backoff
+    # eksponensial + jitter. Di dalam transaksi luar tidak di-retry, karena
+    # transaksi itu sudah gagal dan harus diulang oleh pemanggilnya.
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tries = attempts or getattr(settings, 'DB_WRITE_RETRIES', 5)
+            wait = delay if delay is not None else getattr(settings, 'DB_WRITE_RETRY_DELAY', 0.05)
+            ceiling = max_delay if max_delay is not None else getattr(settings, 'DB_WRITE_RETRY_MAX_DELAY', 1.0)
+            for attempt in range(1, tries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_error(exc) or attempt == tries or connections[using].in_atomic_block:
+                        raise
+                    pause = min(ceiling, wait * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                    logger.warning('%s: %s, retry %d/%d in %.3fs', func.__qualname__, exc, attempt, tries - 1, pause)
+                    time.sleep(pause)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
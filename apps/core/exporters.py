@@ -0,0 +1,385 @@
+# Ekspor situs publik ke file HTML statis untuk CDN/nginx.
+# Setiap halaman publik (home, about, daftar destinasi, kategori, kecamatan,
+# detail destinasi) dirender lewat stack request Django yang sama (Client
+# dengan middleware) di process pool, lalu ditulis sebagai <path>/index.html.
+#
+# Ekspor inkremental: setiap halaman punya tanda tangan dari baris yang
+# ditampilkannya (card_version destinasi, galeri, destinasi di sel sekitarnya,
+# baris kategori/kecamatan, jumlah hasil). Tanda tangan disimpan di .export-state.json; ekspor
+# berikutnya hanya merender halaman yang tanda tangannya berubah dan
+# menghapus halaman yang sudah tidak ada. Jumlah tayangan tidak ikut tanda
+# tangan (berubah terus), jadi hanya diperbarui saat halamannya dirender
+# ulang atau dengan --full. Perubahan template juga perlu --full.
+#
+# Halaman berikutnya (?page=N) ditulis ke <path>/page/N/index.html. Contoh nginx:
+#   location / { try_files $uri/page/$arg_page/index.html $uri/index.html $uri =404; }
+# Pencarian (?q=), filter ?category= dan Surprise Me tetap butuh Django.
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from math import ceil
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .geo import neighbours
+from .maps import NEARBY_PRECISIONS
+from .models import Category, Destination, DestinationGallery, District
+from .stats import get_stats
+from .views import STATIC_EXPORT_KEY, CategoryDetailView, DestinationListView, DistrictDetailView
+
+STATE_FILE = '.export-state.json'
+STATE_VERSION = 1
+
+# Batas URL per file sitemap (protokol sitemap); lebih dari itu memakai sitemap index
+SITEMAP_LIMIT = 50000
+
+# Media yang tidak perlu disalin (indeks internal gambar turunan)
+SKIPPED_MEDIA = ('derivatives/index/',)
+
+# URL yang pasti tidak ada, untuk merender 404.html
+NOT_FOUND_URL = '/__static-export-404__/'
+
+# Sel tanda tangan destinasi terdekat: sel ini beserta tetangganya mencakup
+# pencarian pada presisi ini dan yang lebih halus. Wilayah jarang yang
+# diperluas ke sel lebih kasar baru diperbarui saat detailnya berubah atau --full.
+NEARBY_SIGNATURE_PRECISION = NEARBY_PRECISIONS[1]
+
+
+@dataclass
+class Page:
+    url: str
+    path: str
+    signature: str
+    status: int = 200
+    sitemap: bool = True
+
+
+@dataclass
+class ExportStats:
+    pages: int = 0
+    rendered: int = 0
+    removed: int = 0
+    bytes_written: int = 0
+    assets_copied: int = 0
+    failed: list = field(default_factory=list)
+    warnings: list = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def unchanged(self):
+        return self.pages - self.rendered - len(self.failed)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def pages_per_second(self):
+        return self.rendered / self.elapsed if self.elapsed else 0.0
+
+
+def _signature(*parts):
+    return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def page_path(url_path, number=1):
+    # '/destinations/' -> 'destinations/index.html', halaman 3 -> 'destinations/page/3/index.html'
+    parts = [url_path.strip('/')] if url_path.strip('/') else []
+    if number > 1:
+        parts += ['page', str(number)]
+    return '/'.join(parts + ['index.html'])
+
+
+def listing_pages(url_path, members, page_size, context):
+    # Halaman berpaginasi (offset ?page=N) dari daftar anggota berurutan.
+    # Jumlah hasil & jumlah halaman tampil di setiap halaman, jadi ikut tanda tangan.
+    count = len(members)
+    for number in range(1, max(1, ceil(count / page_size)) + 1):
+        chunk = members[(number - 1) * page_size:number * page_size]
+        yield Page(
+            url=url_path if number == 1 else f'{url_path}?page={number}',
+            path=page_path(url_path, number),
+            signature=_signature(count, context, chunk),
+            sitemap=number == 1,
+        )
+
+
+def collect_pages():
+    # Semua halaman publik beserta tanda tangannya (beberapa query besar,
+    # tanpa query per baris)
+    categories = list(Category.objects.order_by('pk').values_list('id', 'slug', 'name', 'icon', 'description'))
+    districts = list(District.objects.order_by('pk').values_list('id', 'slug', 'name', 'description', 'thumbnail'))
+    category_nav = [row[:4] for row in categories]
+
+    galleries = {}
+    gallery_rows = DestinationGallery.objects.order_by('destination_id', 'pk').values_list(
+        'destination_id', 'pk', 'image', 'caption'
+    )
+    for destination_id, *row in gallery_rows.iterator():
+        galleries.setdefault(destination_id, []).append(row)
+
+    # Urutan sama dengan view daftar: terbaru dulu
+    rows = list(
+        Destination.objects.order_by('-created_at', '-id')
+        .values_list('id', 'slug', 'card_version', 'category_id', 'district_id', 'geohash')
+        .iterator()
+    )
+
+    stats = get_stats()
+    highlighted = [
+        (entry['id'], entry.get('card_version'))
+        for entry in stats.top_destinations[:3] + stats.recent_destinations[:3]
+    ]
+    pages = [
+        Page(reverse('base:home'), page_path(reverse('base:home')), _signature(
+            stats.destination_count, stats.district_count, highlighted, category_nav,
+        )),
+        Page(reverse('base:about'), page_path(reverse('base:about')), _signature('about')),
+        Page(reverse('core:category_list'), page_path(reverse('core:category_list')), _signature(categories)),
+        Page(NOT_FOUND_URL, '404.html', _signature('404'), status=404, sitemap=False),
+    ]
+
+    members, by_category, by_district, by_cell = [], {}, {}, {}
+    for pk, slug, version, category_id, district_id, geohash in rows:
+        member = (pk, slug, version)
+        members.append(member)
+        by_category.setdefault(category_id, []).append(member)
+        by_district.setdefault(district_id, []).append(member)
+        if geohash:
+            by_cell.setdefault(geohash[:NEARBY_SIGNATURE_PRECISION], []).append((pk, version, geohash))
+    pages += listing_pages(reverse('core:destination_list'), members, DestinationListView.paginate_by, category_nav)
+    for category in categories:
+        url = reverse('core:category_detail', args=[category[1]])
+        pages += listing_pages(url, by_category.get(category[0], []), CategoryDetailView.paginate_by, category)
+    for district in districts:
+        url = reverse('core:district_detail', args=[district[1]])
+        pages += listing_pages(url, by_district.get(district[0], []), DistrictDetailView.paginate_by, district)
+
+    # Destinasi terdekat di halaman detail: isi blok 3x3 sel di sekitarnya
+    blocks = {}
+    for pk, slug, version, _, _, geohash in rows:
+        cell = geohash[:NEARBY_SIGNATURE_PRECISION]
+        if cell and cell not in blocks:
+            blocks[cell] = _signature([by_cell.get(neighbour, []) for neighbour in neighbours(cell)])
+        url = reverse('core:destination_detail', args=[slug])
+        pages.append(Page(url, page_path(url), _signature(version, galleries.get(pk, []), blocks.get(cell))))
+    return pages
+
+
+def _init_worker():
+    # Proses pool: Django siap, log metrik per request tidak membanjiri output
+    django.setup()
+    logging.getLogger('apps.core.instrumentation').setLevel(logging.WARNING)
+
+
+def render_pages(output_dir, host, pages):
+    # Render [(url, path, status)] dan tulis ke output_dir.
+    # Kembalikan [(url, status, bytes)]; bytes None jika status tidak sesuai.
+    client = Client(HTTP_HOST=host, **{STATIC_EXPORT_KEY: True})
+    results = []
+    # Tautan halaman memakai ?page=N, jadi paginasi cursor dimatikan saat ekspor
+    with override_settings(CATALOG_CURSOR_PAGINATION=False):
+        for url, path, status in pages:
+            try:
+                response = client.get(url)
+            except Exception:
+                # Error view dicatat sebagai halaman gagal, ekspor tetap jalan
+                results.append((url, 500, None))
+                continue
+            if response.status_code != status:
+                results.append((url, response.status_code, None))
+                continue
+            target = os.path.join(output_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(f'{target}.tmp', 'wb') as handle:
+                handle.write(response.content)
+            os.replace(f'{target}.tmp', target)
+            results.append((url, status, len(response.content)))
+    return results
+
+
+def sync_tree(source, target, skip=()):
+    # Salin file yang belum ada/berbeda (ukuran atau mtime) dari source ke target
+    copied = 0
+    for root, _, files in os.walk(source):
+        for name in files:
+            source_path = os.path.join(root, name)
+            relative = os.path.relpath(source_path, source).replace(os.sep, '/')
+            if relative.startswith(skip):
+                continue
+            target_path = os.path.join(target, relative)
+            source_stat = os.stat(source_path)
+            try:
+                target_stat = os.stat(target_path)
+            except FileNotFoundError:
+                target_stat = None
+            if (
+                target_stat is not None
+                and target_stat.st_size == source_stat.st_size
+                and int(target_stat.st_mtime) == int(source_stat.st_mtime)
+            ):
+                continue
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.copy2(source_path, target_path)
+            copied += 1
+    return copied
+
+
+class StaticSiteExporter:
+    # Render halaman publik ke output_dir, salin aset, tulis sitemap.
+
+    def __init__(self, output_dir, host='localhost', base_url=None, workers=1, chunk_size=50,
+                 full=False, assets=True):
+        self.output_dir = str(output_dir)
+        self.host = host
+        self.base_url = (base_url or f'http://{host}').rstrip('/')
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.full = full
+        self.assets = assets
+        self.stats = ExportStats()
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        previous = {} if self.full else self.load_state().get('pages', {})
+        pages = collect_pages()
+        self.stats.pages = len(pages)
+
+        todo = [
+            page for page in pages
+            if previous.get(page.url, {}).get('signature') != page.signature
+            or not os.path.exists(os.path.join(self.output_dir, page.path))
+        ]
+        current = {page.url for page in pages}
+        self.remove_pages(entry['path'] for url, entry in previous.items() if url not in current)
+
+        rendered = {}
+        for url, status, size in self.render(todo):
+            if size is None:
+                self.stats.failed.append((url, status))
+            else:
+                rendered[url] = size
+                self.stats.bytes_written += size
+        self.stats.rendered = len(rendered)
+
+        # Halaman yang gagal tidak dicatat, jadi dicoba lagi pada ekspor berikutnya
+        now = timezone.now().isoformat()
+        failed = {url for url, _ in self.stats.failed}
+        state = {}
+        for page in pages:
+            if page.url in rendered:
+                state[page.url] = {'path': page.path, 'signature': page.signature, 'lastmod': now}
+            elif page.url in previous and page.url not in failed:
+                state[page.url] = previous[page.url]
+
+        if self.assets:
+            self.copy_assets()
+        self.write_sitemap(pages, state)
+        self.save_state(state)
+        return self.stats
+
+    def render(self, pages):
+        jobs = [(page.url, page.path, page.status) for page in pages]
+        chunks = [jobs[start:start + self.chunk_size] for start in range(0, len(jobs), self.chunk_size)]
+        if self.workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield from render_pages(self.output_dir, self.host, chunk)
+            return
+        # Koneksi database tidak boleh diwariskan ke proses anak
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(render_pages, self.output_dir, self.host, chunk) for chunk in chunks]
+            for future in futures:
+                yield from future.result()
+
+    def remove_pages(self, paths):
+        for path in paths:
+            target = os.path.join(self.output_dir, path)
+            if os.path.exists(target):
+                os.remove(target)
+                self.stats.removed += 1
+            # Hapus folder yang jadi kosong (mis. destinations/<slug lama>/)
+            directory = os.path.dirname(target)
+            while directory != self.output_dir and os.path.isdir(directory) and not os.listdir(directory):
+                os.rmdir(directory)
+                directory = os.path.dirname(directory)
+
+    def copy_assets(self):
+        # Statis ber-hash (collectstatic dengan storage manifest, profil prod) & media
+        static_root = str(settings.STATIC_ROOT) if settings.STATIC_ROOT else None
+        if not static_root or not os.path.isdir(static_root):
+            self.stats.warnings.append('STATIC_ROOT not found; run collectstatic before exporting.')
+        else:
+            if not os.path.exists(os.path.join(static_root, 'staticfiles.json')):
+                self.stats.warnings.append(
+                    'Static files are not hashed (no staticfiles.json); export with DJANGO_PROFILE=prod '
+                    'after collectstatic for cache-busting URLs.'
+                )
+            self.stats.assets_copied += self.copy_tree(static_root, settings.STATIC_URL)
+        if os.path.isdir(settings.MEDIA_ROOT):
+            self.stats.assets_copied += self.copy_tree(str(settings.MEDIA_ROOT), settings.MEDIA_URL, SKIPPED_MEDIA)
+
+    def copy_tree(self, source, url, skip=()):
+        parsed = urlparse(url)
+        if parsed.netloc:
+            # Aset sudah dilayani dari host lain (CDN)
+            return 0
+        return sync_tree(source, os.path.join(self.output_dir, parsed.path.strip('/')), skip)
+
+    def write_sitemap(self, pages, state):
+        entries = [
+            (self.base_url + page.url, state.get(page.url, {}).get('lastmod', '')[:10])
+            for page in pages if page.sitemap
+        ]
+        for name in os.listdir(self.output_dir):
+            if name.startswith('sitemap') and name.endswith('.xml'):
+                os.remove(os.path.join(self.output_dir, name))
+        chunks = [entries[start:start + SITEMAP_LIMIT] for start in range(0, len(entries), SITEMAP_LIMIT)] or [[]]
+        if len(chunks) == 1:
+            self._write_urlset('sitemap.xml', chunks[0])
+            return
+        names = []
+        for number, chunk in enumerate(chunks, 1):
+            names.append(f'sitemap-{number}.xml')
+            self._write_urlset(names[-1], chunk)
+        with open(os.path.join(self.output_dir, 'sitemap.xml'), 'w', encoding='utf-8') as handle:
+            handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            handle.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for name in names:
+                handle.write(f'<sitemap><loc>{escape(f"{self.base_url}/{name}")}</loc></sitemap>\n')
+            handle.write('</sitemapindex>\n')
+
+    def _write_urlset(self, name, entries):
+        with open(os.path.join(self.output_dir, name), 'w', encoding='utf-8') as handle:
+            handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            handle.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for loc, lastmod in entries:
+                lastmod = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+                handle.write(f'<url><loc>{escape(loc)}</loc>{lastmod}</url>\n')
+            handle.write('</urlset>\n')
+
+    def load_state(self):
+        try:
+            with open(os.path.join(self.output_dir, STATE_FILE), encoding='utf-8') as handle:
+                state = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return state if state.get('version') == STATE_VERSION else {}
+
+    def save_state(self, pages):
+        target = os.path.join(self.output_dir, STATE_FILE)
+        with open(f'{target}.tmp', 'w', encoding='utf-8') as handle:
+            json.dump({'version': STATE_VERSION, 'exported_at': timezone.now().isoformat(), 'pages': pages}, handle)
+        os.replace(f'{target}.tmp', target)
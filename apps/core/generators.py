@@ -0,0 +1,297 @@
+# Generator katalog sintetis untuk uji beban (daftar, pencarian, paginasi).
+# Semua nilai diturunkan dari random.Random(seed) secara berurutan sehingga
+# katalog yang sama bisa dibuat ulang; destinasi & galeri ditulis dengan
+# bulk_create per batch (satu transaksi per batch) tanpa memuat seluruh
+# katalog ke memori, jadi 1 juta baris pun tetap ringan.
+import io
+import random
+import time
+from dataclasses import dataclass, field
+from urllib.parse import quote
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image
+
+from . import search
+from .cache import bump_catalog_version
+from .geo import coordinate_fields
+from .maps import request_snapshot_refresh
+from .models import Category, Destination, DestinationGallery, District
+from .slugs import SlugAllocator, allocate_slugs, base_slug
+from .stats import rebuild_stats
+
+# Kecamatan di Lombok Barat; jika diminta lebih banyak, nama diberi nomor
+DISTRICT_NAMES = (
+    'Batulayar', 'Gunungsari', 'Lingsar', 'Narmada', 'Lembar',
+    'Sekotong', 'Gerung', 'Kediri', 'Kuripan', 'Labuapi',
+)
+
+# (nama, ikon Material) kategori
+CATEGORY_NAMES = (
+    ('Pantai', 'waves'), ('Air Terjun', 'water'), ('Gili & Pulau', 'sailing'),
+    ('Wisata Religi', 'temple_hindu'), ('Desa Wisata', 'holiday_village'),
+    ('Hutan & Alam', 'forest'), ('Kuliner', 'restaurant'), ('Sejarah & Budaya', 'museum'),
+    ('Bukit & Gunung', 'landscape'), ('Taman Rekreasi', 'pool'),
+    ('Kerajinan', 'storefront'), ('Ekowisata', 'eco'),
+)
+
+NAME_PREFIXES = (
+    'Pantai', 'Gili', 'Air Terjun', 'Bukit', 'Desa Wisata', 'Pura', 'Taman',
+    'Hutan', 'Danau', 'Pasar Seni', 'Goa', 'Telaga', 'Makam', 'Kolam',
+)
+
+NAME_WORDS = (
+    'Senggigi', 'Nanggu', 'Sudak', 'Kedis', 'Asahan', 'Layar', 'Gede', 'Mangsit',
+    'Kerandangan', 'Nambung', 'Mekaki', 'Cemare', 'Sesaot', 'Pusuk', 'Suranadi',
+    'Lingsar', 'Narmada', 'Timponan', 'Segenter', 'Kekait', 'Banyumulek', 'Sesela',
+    'Mekarsari', 'Kebon Ayu', 'Karang Bayan', 'Bangko', 'Elak', 'Sasak', 'Batu Bolong',
+    'Indah', 'Permai', 'Sari', 'Asri', 'Biru', 'Putih', 'Lestari', 'Jaya', 'Baru',
+    'Timur', 'Barat', 'Utara', 'Selatan', 'Tengah', 'Atas', 'Bawah', 'Lama',
+)
+
+DESCRIPTION_WORDS = (
+    'pantai', 'pasir', 'putih', 'air', 'laut', 'jernih', 'ombak', 'tenang', 'matahari',
+    'terbenam', 'pemandangan', 'indah', 'wisatawan', 'lokal', 'mancanegara', 'desa',
+    'adat', 'budaya', 'sasak', 'tradisional', 'hutan', 'lebat', 'sejuk', 'udara',
+    'segar', 'air terjun', 'kolam', 'alami', 'jalan', 'setapak', 'perahu', 'nelayan',
+    'snorkeling', 'terumbu', 'karang', 'ikan', 'warna-warni', 'kuliner', 'khas',
+    'ayam taliwang', 'plecing', 'kangkung', 'pura', 'bersejarah', 'upacara', 'keluarga',
+    'akhir pekan', 'fasilitas', 'parkir', 'gazebo', 'warung', 'penginapan', 'dekat',
+    'kota', 'mataram', 'lombok', 'barat', 'bukit', 'hijau', 'sawah', 'terasering',
+)
+
+# Wilayah Lombok Barat untuk koordinat di URL embed Google Maps
+LAT_RANGE = (-8.80, -8.35)
+LNG_RANGE = (115.85, 116.25)
+
+# Gambar placeholder yang dipakai bergiliran (file kecil, warna solid)
+PLACEHOLDER_COUNT = 8
+PLACEHOLDER_SIZE = (16, 12)
+PRIMARY_IMAGE = 'destinations/primary/synthetic-{}.png'
+GALLERY_IMAGE = 'destinations/gallery/synthetic-{}.png'
+
+# Jumlah slug per query pengecekan bentrok (batas variabel SQLite)
+SLUG_CHECK_CHUNK_SIZE = 900
+
+# Batas atas tayangan per destinasi (ekor distribusi Pareto)
+MAX_VIEWS = 10_000_000
+
+
+def numbered_names(names, count):
+    # count nama pertama; setelah daftar habis, ulangi dengan nomor ("Lembar 2")
+    return [
+        names[i % len(names)] if i < len(names) else f'{names[i % len(names)]} {i // len(names) + 1}'
+        for i in range(count)
+    ]
+
+
+@dataclass
+class GenerateStats:
+    created: dict = field(default_factory=lambda: {'district': 0, 'category': 0, 'destination': 0, 'gallery': 0})
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        rows = self.created['destination'] + self.created['gallery']
+        return rows / self.elapsed if self.elapsed else 0.0
+
+
+class CatalogGenerator:
+    # Membuat kecamatan, kategori, destinasi & galeri sintetis.
+    # Kecamatan/kategori dengan nama yang sama dipakai ulang, bukan diduplikasi.
+
+    def __init__(self, seed=0, batch_size=5000, gallery=2, images=False):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.gallery = gallery
+        self.images = images
+        self.stats = GenerateStats()
+        self.slugs = SlugAllocator(Destination)
+        self.ordinal = 0
+
+    def run(self, destinations, districts=len(DISTRICT_NAMES), categories=len(CATEGORY_NAMES)):
+        if self.images:
+            self.write_placeholders()
+        self.district_ids = self._ensure_districts(districts)
+        self.category_ids = self._ensure_categories(categories)
+        # Nomor urut slug hanya bergantung pada seed & posisi (bukan isi tabel);
+        # bentrok dengan run sebelumnya dialokasikan ulang di _assign_slugs
+        self.ordinal = 0
+        rebuild = False
+        for start in range(0, destinations, self.batch_size):
+            ids = self._write_batch(min(self.batch_size, destinations - start))
+            if None in ids:
+                # Backend tidak mengembalikan pk dari bulk insert
+                rebuild = True
+            else:
+                search.index_destinations(ids)
+        # bulk_create tidak memicu signal: perbarui cache, statistik, snapshot peta & indeks sekali di akhir
+        if rebuild:
+            search.rebuild_index()
+        bump_catalog_version()
+        rebuild_stats()
+        request_snapshot_refresh()
+        return self.stats
+
+    def _ensure_districts(self, count):
+        names = numbered_names(DISTRICT_NAMES, count)
+        existing = dict(District.objects.filter(name__in=names).values_list('name', 'id'))
+        # Deskripsi dibuat untuk semua nama agar urutan acak tidak bergantung isi database
+        descriptions = [self.paragraph(20, 60) for _ in names]
+        missing = [
+            District(name=name, description=description)
+            for name, description in zip(names, descriptions) if name not in existing
+        ]
+        for obj in District.objects.bulk_create(allocate_slugs(missing)):
+            existing[obj.name] = obj.pk
+        self.stats.created['district'] += len(missing)
+        return [existing[name] for name in names]
+
+    def _ensure_categories(self, count):
+        names = numbered_names([name for name, _ in CATEGORY_NAMES], count)
+        icons = {name: CATEGORY_NAMES[i % len(CATEGORY_NAMES)][1] for i, name in enumerate(names)}
+        existing = {}
+        for name, pk in Category.objects.filter(name__in=names).order_by('id').values_list('name', 'id'):
+            existing.setdefault(name, pk)
+        descriptions = [self.paragraph(10, 30) for _ in names]
+        missing = [
+            Category(name=name, icon=icons[name], description=description)
+            for name, description in zip(names, descriptions) if name not in existing
+        ]
+        for obj in Category.objects.bulk_create(allocate_slugs(missing)):
+            existing[obj.name] = obj.pk
+        self.stats.created['category'] += len(missing)
+        return [existing[name] for name in names]
+
+    def _write_batch(self, size):
+        objects = [self.destination() for _ in range(size)]
+        with transaction.atomic():
+            self._assign_slugs(objects)
+            objects = Destination.objects.bulk_create(objects)
+            # Galeri butuh pk hasil bulk insert (RETURNING); tanpa itu dilewati
+            gallery = [
+                DestinationGallery(
+                    destination_id=obj.pk,
+                    image=GALLERY_IMAGE.format(self.rng.randrange(PLACEHOLDER_COUNT)),
+                    caption=self.sentence(3, 8) if self.rng.random() < 0.5 else None,
+                )
+                for obj in objects if obj.pk is not None
+                for _ in range(self.rng.randint(0, 2 * self.gallery))
+            ]
+            DestinationGallery.objects.bulk_create(gallery, batch_size=self.batch_size)
+        self.stats.created['destination'] += len(objects)
+        self.stats.created['gallery'] += len(gallery)
+        return [obj.pk for obj in objects]
+
+    def _assign_slugs(self, objects):
+        # Nama sintetis sering berulang, dan alokator prefix akan memindai semua
+        # slug "pantai-sari-*" yang sudah ada. Slug dibuat langsung dari nama +
+        # nomor urut, lalu hanya bentrokan persis (mis. run ulang dengan seed yang
+        # sama) yang dialokasikan ulang.
+        for obj in objects:
+            self.ordinal += 1
+            base = base_slug(Destination, obj.name, 'slug')
+            obj.slug = f'{base}-{self.ordinal}'
+        slugs = [obj.slug for obj in objects]
+        taken = set()
+        for start in range(0, len(slugs), SLUG_CHECK_CHUNK_SIZE):
+            taken.update(
+                Destination.objects.filter(slug__in=slugs[start:start + SLUG_CHECK_CHUNK_SIZE])
+                .values_list('slug', flat=True)
+            )
+        clashes = [obj for obj in objects if obj.slug in taken]
+        if clashes:
+            self.slugs.assign(clashes, [obj.slug for obj in clashes])
+
+    def import_records(self, count):
+        # Baris destinasi format import_catalog (kecamatan/kategori berupa nama),
+        # untuk mengukur importer dengan data yang sama dengan generator
+        self.district_ids = self.category_ids = []
+        districts = list(DISTRICT_NAMES)
+        categories = [name for name, _ in CATEGORY_NAMES]
+        for _ in range(count):
+            obj = self.destination()
+            yield {
+                'model': 'destination',
+                'name': obj.name,
+                'description': obj.description,
+                'additional_info': obj.additional_info,
+                'district': self.rng.choice(districts),
+                'category': self.rng.choice(categories),
+                'maps_embed_url': obj.maps_embed_url,
+                'main_image': obj.main_image.name,
+                'view_count': obj.view_count,
+            }
+
+    # --- Data acak ---
+
+    def destination(self):
+        rng = self.rng
+        name = f'{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_WORDS)}'
+        if rng.random() < 0.6:
+            name = f'{name} {rng.choice(NAME_WORDS)}'
+        # Panjang deskripsi log-normal: median ~100 kata, sesekali sangat panjang
+        words = max(20, min(600, int(rng.lognormvariate(4.6, 0.5))))
+        maps_embed_url = self.maps_embed_url(name)
+        return Destination(
+            name=name,
+            description=self.paragraph(words, words),
+            additional_info=self.additional_info() if rng.random() < 0.5 else None,
+            maps_embed_url=maps_embed_url,
+            **coordinate_fields(maps_embed_url),
+            main_image=PRIMARY_IMAGE.format(rng.randrange(PLACEHOLDER_COUNT)),
+            district_id=rng.choice(self.district_ids) if self.district_ids and rng.random() < 0.95 else None,
+            category_id=rng.choice(self.category_ids) if self.category_ids and rng.random() < 0.95 else None,
+            # Pareto (alpha 1.16, "80/20"): sebagian kecil destinasi menyerap sebagian besar tayangan
+            view_count=min(MAX_VIEWS, int((rng.paretovariate(1.16) - 1) * 50)),
+        )
+
+    def sentence(self, low, high):
+        words = self.rng.choices(DESCRIPTION_WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize()
+
+    def paragraph(self, low, high):
+        # Satu panggilan choices() untuk semua kata, lalu dipotong jadi kalimat
+        words = self.rng.choices(DESCRIPTION_WORDS, k=self.rng.randint(low, high))
+        sentences = []
+        position = 0
+        while position < len(words):
+            length = self.rng.randint(8, 16)
+            sentences.append(' '.join(words[position:position + length]).capitalize() + '.')
+            position += length
+        return ' '.join(sentences)
+
+    def additional_info(self):
+        opening = self.rng.randint(6, 9)
+        closing = self.rng.randint(16, 22)
+        price = self.rng.choice((0, 5000, 10000, 15000, 25000, 50000))
+        ticket = 'Gratis' if not price else f'Rp {price:,}'.replace(',', '.')
+        return f'Jam buka: {opening:02d}.00 - {closing:02d}.00\nTiket masuk: {ticket}'
+
+    def maps_embed_url(self, name):
+        lat = self.rng.uniform(*LAT_RANGE)
+        lng = self.rng.uniform(*LNG_RANGE)
+        return (
+            'https://www.google.com/maps/embed?pb=!1m18!1m12!1m3!1d3946.0'
+            f'!2d{lng:.6f}!3d{lat:.6f}!2m3!1f0!2f0!3f0!3m2!1i1024!2i768!4f13.1'
+            f'!3m3!1m2!1s0x0%3A0x0!2s{quote(name[:40])}!5e0!3m2!1sid!2sid'
+        )
+
+    def write_placeholders(self):
+        # File gambar kecil untuk semua path placeholder (dilewati jika sudah ada)
+        colors = random.Random(PLACEHOLDER_COUNT)
+        for n in range(PLACEHOLDER_COUNT):
+            color = tuple(colors.randrange(256) for _ in range(3))
+            for template in (PRIMARY_IMAGE, GALLERY_IMAGE):
+                path = template.format(n)
+                if default_storage.exists(path):
+                    continue
+                buffer = io.BytesIO()
+                Image.new('RGB', PLACEHOLDER_SIZE, color).save(buffer, format='PNG')
+                default_storage.save(path, ContentFile(buffer.getvalue()))
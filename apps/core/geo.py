@@ -0,0 +1,131 @@
+# Koordinat destinasi & indeks grid geohash (tanpa query database).
+# - parse_coordinates: ambil lintang/bujur dari URL Google Maps (embed
+#   "!2d<lng>!3d<lat>", tautan "@lat,lng", atau parameter q/ll/center);
+# - geohash: sel grid bersarang, awalan yang sama = sel yang sama, sehingga
+#   pencarian sekitar cukup rentang index pada kolom geohash (lihat maps.py).
+import math
+import re
+from urllib.parse import unquote
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Presisi geohash yang disimpan (~4,8 m x 4,8 m); sel lebih kasar = awalannya
+GEOHASH_PRECISION = 9
+
+EARTH_RADIUS_KM = 6371.0088
+
+_NUMBER = r'(-?\d{1,3}(?:\.\d+)?)'
+# Urutan prioritas: titik pusat embed, lalu @lat,lng, lalu parameter query
+COORDINATE_PATTERNS = (
+    (re.compile(rf'!3d{_NUMBER}!4d{_NUMBER}'), 'lat_lng'),
+    (re.compile(rf'!2d{_NUMBER}!3d{_NUMBER}'), 'lng_lat'),
+    (re.compile(rf'@{_NUMBER},{_NUMBER}'), 'lat_lng'),
+    (re.compile(rf'[?&](?:q|ll|center|query)=(?:loc:)?{_NUMBER},\s*{_NUMBER}'), 'lat_lng'),
+)
+
+
+def parse_coordinates(url):
+    # (lat, lng) dari URL Google Maps, None jika tidak ada/di luar jangkauan
+    if not url:
+        return None
+    url = unquote(url)
+    for pattern, order in COORDINATE_PATTERNS:
+        match = pattern.search(url)
+        if not match:
+            continue
+        first, second = float(match.group(1)), float(match.group(2))
+        lat, lng = (first, second) if order == 'lat_lng' else (second, first)
+        if -90 <= lat <= 90 and -180 <= lng <= 180:
+            return lat, lng
+    return None
+
+
+def encode(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        # Bit genap membagi bujur, bit ganjil membagi lintang
+        interval, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            interval[0] = mid
+        else:
+            bits *= 2
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def bounds(geohash):
+    # (lat_min, lat_max, lng_min, lng_max) sel geohash
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            interval[0 if (value >> shift) & 1 else 1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def cell_size(precision):
+    # (tinggi, lebar) sel dalam derajat
+    lng_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def neighbours(geohash):
+    # Sel itu sendiri + 8 sel di sekelilingnya (presisi sama)
+    lat_min, lat_max, lng_min, lng_max = bounds(geohash)
+    height, width = lat_max - lat_min, lng_max - lng_min
+    lat_center, lng_center = (lat_min + lat_max) / 2, (lng_min + lng_max) / 2
+    cells = []
+    for dy in (-1, 0, 1):
+        lat = lat_center + dy * height
+        if not -90 < lat < 90:
+            continue
+        for dx in (-1, 0, 1):
+            lng = (lng_center + dx * width + 180) % 360 - 180
+            cell = encode(lat, lng, len(geohash))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def covered_radius_km(lat, precision):
+    # Jarak minimum dari titik di sel pusat ke tepi blok 3x3: setiap titik
+    # yang lebih dekat dari ini pasti ada di salah satu dari 9 sel
+    height, width = cell_size(precision)
+    widest = math.radians(min(90.0, abs(lat) + 2 * height))
+    vertical = EARTH_RADIUS_KM * math.radians(height)
+    horizontal = EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(widest) * math.sin(math.radians(min(90.0, width)))))
+    return min(vertical, horizontal)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def coordinate_fields(url):
+    # Nilai latitude/longitude/geohash Destination dari maps_embed_url
+    point = parse_coordinates(url)
+    if point is None:
+        return {'latitude': None, 'longitude': None, 'geohash': ''}
+    lat, lng = point
+    return {'latitude': lat, 'longitude': lng, 'geohash': encode(lat, lng)}
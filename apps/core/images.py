@@ -0,0 +1,130 @@
+# Pipeline gambar turunan (derivative) untuk srcset responsif.
+# Setiap gambar sumber diubah ukurannya ke beberapa lebar tetap dalam format
+# WebP dan JPEG, disimpan di MEDIA_ROOT/derivatives/<hash konten>/, lalu
+# dicatat di file indeks per sumber agar tidak perlu membaca ulang sumber.
+import hashlib
+import io
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+DERIVATIVE_ROOT = 'derivatives'
+
+# Format keluaran: (ekstensi, format Pillow)
+FORMATS = (
+    ('webp', 'WEBP'),
+    ('jpg', 'JPEG'),
+)
+
+# Lama cache untuk sumber yang gagal diproses (file hilang/rusak)
+MISSING_TIMEOUT = 60 * 5
+
+
+def get_widths():
+    return tuple(sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (160, 320, 640, 1024, 1600))))
+
+
+def _source_key(name):
+    return hashlib.sha1(name.encode()).hexdigest()
+
+
+def _cache_key(name):
+    return f'imgderiv:{_source_key(name)}'
+
+
+def _index_path(name):
+    key = _source_key(name)
+    return f'{DERIVATIVE_ROOT}/index/{key[:2]}/{key}.json'
+
+
+def _target_widths(source_width):
+    # Lebar yang dibuat: semua lebar standar di bawah lebar sumber,
+    # ditambah lebar sumber itu sendiri (dibatasi lebar standar terbesar)
+    widths = [width for width in get_widths() if width < source_width]
+    widths.append(min(source_width, get_widths()[-1]))
+    return sorted(set(widths))
+
+
+def generate_derivatives(name, force=False):
+    # Buat semua turunan untuk file sumber 'name', kembalikan manifest:
+    # {'hash': ..., 'widths': [...], 'files': {ext: {width: path}}}
+    index_path = _index_path(name)
+    if not force and default_storage.exists(index_path):
+        with default_storage.open(index_path) as index_file:
+            return json.loads(index_file.read())
+
+    with default_storage.open(name) as source_file:
+        content = source_file.read()
+    digest = hashlib.sha256(content).hexdigest()[:16]
+
+    with Image.open(io.BytesIO(content)) as source:
+        source = ImageOps.exif_transpose(source)
+        widths = _target_widths(source.width)
+        files = {}
+        for ext, pil_format in FORMATS:
+            files[ext] = {}
+            for width in widths:
+                path = f'{DERIVATIVE_ROOT}/{digest[:2]}/{digest}/{width}w.{ext}'
+                if force or not default_storage.exists(path):
+                    height = max(1, round(source.height * width / source.width))
+                    resized = source.resize((width, height), Image.Resampling.LANCZOS)
+                    if pil_format == 'JPEG' and resized.mode != 'RGB':
+                        resized = resized.convert('RGB')
+                    elif resized.mode not in ('RGB', 'RGBA'):
+                        resized = resized.convert('RGBA')
+                    buffer = io.BytesIO()
+                    resized.save(buffer, pil_format, quality=80, optimize=True)
+                    if default_storage.exists(path):
+                        default_storage.delete(path)
+                    default_storage.save(path, ContentFile(buffer.getvalue()))
+                files[ext][str(width)] = path
+
+    manifest = {'hash': digest, 'widths': widths, 'files': files}
+    if default_storage.exists(index_path):
+        default_storage.delete(index_path)
+    default_storage.save(index_path, ContentFile(json.dumps(manifest).encode()))
+    cache.set(_cache_key(name), manifest, None)
+    return manifest
+
+
+def get_derivatives(field_file):
+    # Manifest turunan untuk FieldFile, dibuat malas (lazy) saat pertama diminta.
+    # Kembalikan None jika sumber tidak ada atau bukan gambar yang valid.
+    if not field_file:
+        return None
+    name = field_file.name
+    manifest = cache.get(_cache_key(name))
+    if manifest is not None:
+        return manifest or None
+    try:
+        manifest = generate_derivatives(name)
+    except (FileNotFoundError, UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        # DecompressionBombError bukan turunan OSError: gambar raksasa dianggap tidak valid
+        cache.set(_cache_key(name), {}, MISSING_TIMEOUT)
+        return None
+    cache.set(_cache_key(name), manifest, None)
+    return manifest
+
+
+def build_srcset(manifest, ext):
+    # String srcset ("url 320w, url 640w") untuk satu format
+    return ', '.join(
+        f'{default_storage.url(path)} {width}w'
+        for width, path in sorted(manifest['files'][ext].items(), key=lambda item: int(item[0]))
+    )
+
+
+def derivative_url(field_file, width, ext='jpg'):
+    # URL turunan terkecil yang lebarnya >= width; fallback ke file asli
+    manifest = get_derivatives(field_file)
+    if not manifest:
+        return field_file.url if field_file else ''
+    candidates = sorted(manifest['files'][ext].items(), key=lambda item: int(item[0]))
+    for candidate_width, path in candidates:
+        if int(candidate_width) >= width:
+            return default_storage.url(path)
+    return default_storage.url(candidates[-1][1])
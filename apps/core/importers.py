@@ -0,0 +1,392 @@
+# Importer katalog massal (kecamatan, kategori, destinasi).
+# Data dibaca secara streaming (JSON array, JSONL, CSV) sehingga memori
+# tidak bergantung pada ukuran file, divalidasi per batch, lalu ditulis
+# dengan bulk_create di dalam satu transaksi per batch.
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, transaction
+
+from . import search
+from .cache import bump_catalog_version
+from .db import retry_on_lock
+from .geo import coordinate_fields
+from .maps import request_snapshot_refresh
+from .models import Category, Destination, District, extract_maps_embed_url
+from .slugs import SlugAllocator
+from .stats import rebuild_stats
+
+# Ukuran potongan baca untuk parser JSON streaming
+READ_CHUNK_SIZE = 64 * 1024
+
+# Jumlah pesan error yang disimpan untuk laporan akhir
+MAX_REPORTED_ERRORS = 50
+
+# Alias nama model di kolom "model" (juga menerima format fixture "core.destination")
+MODEL_ALIASES = {
+    'district': 'district', 'districts': 'district',
+    'category': 'category', 'categories': 'category',
+    'destination': 'destination', 'destinations': 'destination',
+}
+
+# Kolom yang diterima per model
+MODEL_FIELDS = {
+    'district': ('name', 'slug', 'description', 'thumbnail'),
+    'category': ('name', 'slug', 'description', 'icon'),
+    'destination': (
+        'name', 'slug', 'description', 'district', 'category', 'maps_embed_url',
+        'additional_info', 'main_image', 'view_count',
+    ),
+}
+
+
+# --- Pembaca streaming ---
+
+def iter_json_array(stream):
+    # Baca elemen JSON array satu per satu tanpa memuat seluruh file
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+    while True:
+        # Lewati spasi dan pemisah
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                eof = True
+            buffer = buffer[position:] + chunk
+            position = 0
+        if position >= len(buffer):
+            if started:
+                raise ValueError('Unexpected end of JSON array')
+            return
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError('Expected a JSON array')
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Objek terpotong di batas chunk: baca lagi
+            chunk = stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
+        position = end
+
+
+def iter_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_csv(stream):
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if key}
+
+
+READERS = {
+    'json': iter_json_array,
+    'jsonl': iter_jsonl,
+    'csv': iter_csv,
+}
+
+
+def detect_format(path):
+    # Tebak format dari ekstensi file
+    lowered = str(path).lower()
+    for ext, name in (('.jsonl', 'jsonl'), ('.ndjson', 'jsonl'), ('.csv', 'csv'), ('.json', 'json')):
+        if lowered.endswith(ext):
+            return name
+    return None
+
+
+# --- Importer ---
+
+@dataclass
+class ImportStats:
+    created: dict = field(default_factory=lambda: {'district': 0, 'category': 0, 'destination': 0})
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    rows: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+class CatalogImporter:
+    # Menampung baris per model lalu menulisnya per batch.
+    # FK kecamatan/kategori pada destinasi di-resolve dari peta nama->id di memori.
+    # Id angka mengacu ke pk sumber (mis. "pk" fixture) jika file membawa
+    # kecamatan/kategori ber-pk; jika tidak, ke id yang sudah ada di database.
+
+    def __init__(self, batch_size=1000, default_model=None, create_missing=False, strict=False):
+        self.batch_size = batch_size
+        self.default_model = default_model
+        self.create_missing = create_missing
+        self.strict = strict
+        self.stats = ImportStats()
+        self.pending = {'district': [], 'category': [], 'destination': []}
+        self.created_destination_ids = []
+        self.slug_allocators = {
+            model: SlugAllocator(model) for model in (District, Category, Destination)
+        }
+        # Peta nama (huruf kecil) -> id dan himpunan id yang ada, dimuat sekali di awal
+        self.district_ids = {}
+        self.district_pks = set()
+        for name, pk in District.objects.values_list('name', 'id'):
+            self.district_ids[name.lower()] = pk
+            self.district_pks.add(pk)
+        self.category_ids = {}
+        self.category_pks = set()
+        for name, pk in Category.objects.order_by('id').values_list('name', 'id'):
+            self.category_ids.setdefault(name.lower(), pk)
+            self.category_pks.add(pk)
+        # Peta pk sumber -> pk baru per model, diisi saat kecamatan/kategori ditulis
+        self.source_pks = {'district': {}, 'category': {}}
+
+    def run(self, records):
+        for record in records:
+            self.stats.rows += 1
+            self.add(record)
+        self.flush()
+        if any(self.stats.created.values()):
+            # bulk_create tidak memicu signal: perbarui cache, statistik, snapshot peta & indeks sekali di akhir
+            bump_catalog_version()
+            rebuild_stats()
+            request_snapshot_refresh()
+            if None in self.created_destination_ids:
+                # Backend tidak mengembalikan pk dari bulk insert
+                search.rebuild_index()
+            else:
+                search.index_destinations(self.created_destination_ids)
+        return self.stats
+
+    def add(self, record):
+        model = self._model_of(record)
+        if model is None:
+            return self._reject(record, 'Unknown model; use --model or a "model" column')
+        source_pk = record.get('pk')
+        if 'fields' in record and isinstance(record['fields'], dict):
+            record = record['fields']
+        allowed = MODEL_FIELDS[model]
+        row = {key: record[key] for key in allowed if key in record}
+        if source_pk is not None:
+            row['pk'] = source_pk
+        self.pending[model].append(row)
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # Kecamatan & kategori ditulis dulu agar FK destinasi bisa di-resolve
+        for model in ('district', 'category', 'destination'):
+            rows = self.pending[model]
+            if rows:
+                self.pending[model] = []
+                self.writers[model](rows)
+
+    @property
+    def writers(self):
+        return {
+            'district': self._write_districts,
+            'category': self._write_categories,
+            'destination': self._write_destinations,
+        }
+
+    def _model_of(self, record):
+        name = record.get('model') or self.default_model
+        if not name:
+            return None
+        return MODEL_ALIASES.get(str(name).lower().split('.')[-1])
+
+    def _reject(self, row, message):
+        self.stats.skipped += 1
+        error = f"{row.get('name', '?')}: {message}"
+        if self.strict:
+            raise ValueError(error)
+        if len(self.stats.errors) < MAX_REPORTED_ERRORS:
+            self.stats.errors.append(error)
+
+    def _validate(self, pairs, exclude):
+        # Validasi field di memori (tanpa query per baris); baris yang gagal dibuang
+        valid = []
+        for obj, row in pairs:
+            try:
+                obj.clean_fields(exclude=exclude)
+                obj.clean()
+            except ValidationError as exc:
+                self._reject(row, '; '.join(exc.messages))
+                continue
+            valid.append(obj)
+        return valid
+
+    @staticmethod
+    def _text(value):
+        return '' if value is None else str(value).strip()
+
+    def _new_rows(self, rows, mapping):
+        # Buang baris yang namanya sudah ada di database atau di batch ini
+        seen = set()
+        for row in rows:
+            key = self._text(row.get('name')).lower()
+            if key in mapping or key in seen:
+                self.stats.skipped += 1
+                continue
+            seen.add(key)
+            yield row
+
+    def _write_districts(self, rows):
+        pairs = [
+            (District(
+                name=self._text(row.get('name')),
+                slug=self._text(row.get('slug')),
+                description=row.get('description') or None,
+                thumbnail=self._text(row.get('thumbnail')) or None,
+            ), row)
+            for row in self._new_rows(rows, self.district_ids)
+        ]
+        objects = self._validate(pairs, exclude=['slug'])
+        self._bulk_create(District, objects, 'district')
+        names = [obj.name for obj in objects]
+        for name, pk in District.objects.filter(name__in=names).values_list('name', 'id'):
+            self.district_ids[name.lower()] = pk
+            self.district_pks.add(pk)
+        self._map_source_pks(rows, 'district', self.district_ids)
+
+    def _write_categories(self, rows):
+        pairs = [
+            (Category(
+                name=self._text(row.get('name')),
+                slug=self._text(row.get('slug')),
+                description=row.get('description') or None,
+                icon=self._text(row.get('icon')) or 'category',
+            ), row)
+            for row in self._new_rows(rows, self.category_ids)
+        ]
+        objects = self._validate(pairs, exclude=['slug'])
+        self._bulk_create(Category, objects, 'category')
+        names = [obj.name for obj in objects]
+        for name, pk in Category.objects.filter(name__in=names).order_by('id').values_list('name', 'id'):
+            self.category_ids.setdefault(name.lower(), pk)
+            self.category_pks.add(pk)
+        self._map_source_pks(rows, 'category', self.category_ids)
+
+    def _map_source_pks(self, rows, model, mapping):
+        # Baris baru maupun yang sudah ada (nama sama) dipetakan ke pk di database
+        for row in rows:
+            if self._is_id(row.get('pk')):
+                pk = mapping.get(self._text(row.get('name')).lower())
+                if pk is not None:
+                    self.source_pks[model][int(row['pk'])] = pk
+
+    @staticmethod
+    def _is_id(value):
+        return isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit())
+
+    def _create_missing(self, rows, column, mapping, model):
+        # Buat kecamatan/kategori yang belum ada sekaligus untuk satu batch
+        missing = {}
+        for row in rows:
+            value = row.get(column)
+            if value in (None, '') or self._is_id(value):
+                continue
+            name = str(value).strip()
+            if name.lower() not in mapping:
+                missing.setdefault(name.lower(), {'name': name})
+        if missing:
+            self.writers[model](list(missing.values()))
+
+    def _resolve(self, value, mapping, pks, sources):
+        # FK bisa berupa nama (string) atau id (angka); False jika tidak dikenal.
+        # Id dipetakan lewat pk sumber bila ada, selain itu dicek ke himpunan id
+        # yang ada agar tidak gagal IntegrityError saat commit batch.
+        if value in (None, ''):
+            return None
+        if self._is_id(value):
+            pk = int(value)
+            if sources:
+                return sources.get(pk, False)
+            return pk if pk in pks else False
+        return mapping.get(str(value).strip().lower(), False)
+
+    def _write_destinations(self, rows):
+        if self.create_missing:
+            self._create_missing(rows, 'district', self.district_ids, 'district')
+            self._create_missing(rows, 'category', self.category_ids, 'category')
+        pairs = []
+        for row in rows:
+            district_id = self._resolve(row.get('district'), self.district_ids, self.district_pks, self.source_pks['district'])
+            if district_id is False:
+                self._reject(row, f"Unknown district {row.get('district')!r}")
+                continue
+            category_id = self._resolve(row.get('category'), self.category_ids, self.category_pks, self.source_pks['category'])
+            if category_id is False:
+                self._reject(row, f"Unknown category {row.get('category')!r}")
+                continue
+            try:
+                view_count = int(row.get('view_count') or 0)
+            except (TypeError, ValueError):
+                self._reject(row, 'Invalid view_count')
+                continue
+            maps_embed_url = extract_maps_embed_url(self._text(row.get('maps_embed_url')))
+            pairs.append((Destination(
+                name=self._text(row.get('name')),
+                slug=self._text(row.get('slug')),
+                description=self._text(row.get('description')),
+                district_id=district_id,
+                category_id=category_id,
+                maps_embed_url=maps_embed_url,
+                **coordinate_fields(maps_embed_url),
+                additional_info=row.get('additional_info') or None,
+                main_image=self._text(row.get('main_image')),
+                view_count=view_count,
+            ), row))
+        objects = self._validate(pairs, exclude=['slug', 'district', 'category', 'manager'])
+        self._bulk_create(Destination, objects, 'destination')
+
+    @retry_on_lock
+    def _insert(self, model, objects, values):
+        # Satu transaksi per batch; diulang utuh jika database terkunci
+        allocator = self.slug_allocators[model]
+        try:
+            with transaction.atomic():
+                allocator.assign_sequential(objects, values)
+                model.objects.bulk_create(objects, batch_size=self.batch_size)
+        except OperationalError:
+            allocator.release(getattr(obj, allocator.field) for obj in objects)
+            for obj in objects:
+                obj.pk = None
+            raise
+
+    def _bulk_create(self, model, objects, key):
+        if not objects:
+            return
+        # Slug diisi manual dipakai sebagai dasar; tetap dibuat unik
+        values = [obj.slug or obj.name for obj in objects]
+        self._insert(model, objects, values)
+        if model is Destination:
+            self.created_destination_ids.extend(obj.pk for obj in objects)
+        self.stats.created[key] += len(objects)
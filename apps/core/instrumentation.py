@@ -0,0 +1,192 @@
+# Instrumentasi biaya per request tanpa DEBUG: jumlah query, total waktu SQL,
+# statement paling lambat, waktu view dan waktu render template.
+# Hasilnya dikirim sebagai header Server-Timing dan satu baris log JSON,
+# dan dibandingkan dengan anggaran query per nama URL (QUERY_BUDGETS).
+# Query pekerjaan latar (background_queries) dicatat terpisah di log.
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Panjang maksimum SQL paling lambat yang ditulis ke log
+SLOW_SQL_MAX_LENGTH = 300
+
+# Tambahan anggaran untuk pengguna login (baca sesi + baca user)
+AUTHENTICATED_QUERY_ALLOWANCE = 2
+
+
+# Query pekerjaan latar yang kebetulan berjalan di dalam request (mis. flush
+# buffer tayangan): dicatat terpisah dan tidak dihitung ke anggaran
+_background = ContextVar('background_queries', default=False)
+
+
+@contextmanager
+def background_queries():
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    # Dilempar saat QUERY_BUDGET_STRICT aktif (mis. saat test) dan anggaran terlampaui
+    pass
+
+
+class QueryRecorder:
+    # Wrapper untuk connection.execute_wrapper(): catat jumlah & durasi query
+
+    def __init__(self):
+        self.count = 0
+        self.background_count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if _background.get():
+                self.background_count += 1
+            else:
+                self.count += 1
+                self.duration += elapsed
+                if elapsed >= self.slowest_duration:
+                    self.slowest_duration = elapsed
+                    self.slowest_sql = sql
+
+    def record(self):
+        # Pasang wrapper di semua koneksi database thread ini
+        stack = ExitStack()
+        for connection in connections.all(initialized_only=False):
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+def url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return None
+    return f'{match.namespace}:{match.url_name}' if match.namespace else match.url_name
+
+
+def query_budget(name):
+    # Anggaran query untuk nama URL, atau None jika tidak dibatasi
+    if name is None:
+        return None
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(name)
+
+
+def server_timing(metrics):
+    # Nilai header Server-Timing (durasi dalam milidetik)
+    return ', '.join([
+        f'db;desc="{metrics["queries"]} queries";dur={metrics["db_ms"]:.2f}',
+        f'view;dur={metrics["view_ms"]:.2f}',
+        f'tpl;dur={metrics["template_ms"]:.2f}',
+        f'total;dur={metrics["total_ms"]:.2f}',
+    ])
+
+
+class QueryInstrumentationMiddleware:
+    # Middleware pengukur; aktif jika REQUEST_METRICS_ENABLED = True.
+    # Waktu render TemplateResponse diukur terpisah dari waktu view.
+    # Mendukung rantai async (ASGI): wrapper query dipasang di thread tempat
+    # ORM async request ini berjalan (thread-sensitive, satu per request).
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._template_started = None
+        request._template_duration = 0.0
+        started = time.perf_counter()
+        with recorder.record():
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        return self.finish(request, response, recorder, total, getattr(request, 'user', None))
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', True):
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._template_started = None
+        request._template_duration = 0.0
+        started = time.perf_counter()
+        stack = await sync_to_async(recorder.record)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        total = time.perf_counter() - started
+        # request.user malas akan memicu query sinkron di event loop
+        user = await request.auser() if hasattr(request, 'auser') else None
+        return self.finish(request, response, recorder, total, user)
+
+    def finish(self, request, response, recorder, total, user):
+        metrics = {
+            'method': request.method,
+            'path': request.path,
+            'url_name': url_name(request),
+            'status': response.status_code,
+            'queries': recorder.count,
+            'background_queries': recorder.background_count,
+            'db_ms': recorder.duration * 1000,
+            'slowest_ms': recorder.slowest_duration * 1000,
+            'slowest_sql': recorder.slowest_sql[:SLOW_SQL_MAX_LENGTH],
+            'view_ms': (total - request._template_duration) * 1000,
+            'template_ms': request._template_duration * 1000,
+            'total_ms': total * 1000,
+        }
+        if getattr(settings, 'REQUEST_METRICS_HEADER', True):
+            response['Server-Timing'] = server_timing(metrics)
+        logger.info('request_metrics %s', json.dumps(metrics, default=str, sort_keys=True))
+        self.check_budget(metrics, user)
+        return response
+
+    def process_template_response(self, request, response):
+        # Dipanggil tepat sebelum render; durasi dicatat lewat callback setelah render
+        request._template_started = time.perf_counter()
+
+        def finished(rendered):
+            request._template_duration = time.perf_counter() - request._template_started
+
+        response.add_post_render_callback(finished)
+        return response
+
+    def check_budget(self, metrics, user=None):
+        budget = query_budget(metrics['url_name'])
+        if budget is None:
+            return
+        if user is not None and user.is_authenticated:
+            budget += AUTHENTICATED_QUERY_ALLOWANCE
+        if metrics['queries'] <= budget:
+            return
+        message = (
+            f'Query budget exceeded for {metrics["url_name"]} ({metrics["path"]}): '
+            f'{metrics["queries"]} queries > {budget}'
+        )
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.cache import bump_catalog_version
+from apps.core.maps import GEOJSON_SNAPSHOT_NAME, backfill_coordinates, write_geojson_snapshot
+
+class Command(BaseCommand):
+    help = 'Fills destination latitude/longitude/geohash from their Google Maps embed URLs and rewrites the GeoJSON snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows read and updated per batch.')
+        parser.add_argument('--all', action='store_true', help='Re-parse every destination, not only those without coordinates.')
+        parser.add_argument('--no-snapshot', action='store_true', help='Skip rewriting the GeoJSON snapshot.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        stats = backfill_coordinates(batch_size=options['batch_size'], only_missing=not options['all'])
+        # UPDATE mentah (executemany) melewati signal: cache destinasi terdekat ikut versi katalog
+        bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(f'Scanned: {stats.scanned} destinations ({stats.rows_per_second:.0f}/s)')
+        self.stdout.write(f'Located: {stats.located}')
+        if stats.missing:
+            self.stdout.write(self.style.WARNING(f'Without coordinates: {stats.missing}'))
+        if not options['no_snapshot']:
+            features = write_geojson_snapshot()
+            self.stdout.write(f'GeoJSON snapshot: {features} features -> {GEOJSON_SNAPSHOT_NAME}')
@@ -0,0 +1,92 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from apps.core.cache import bump_catalog_version
+from apps.core.generators import CatalogGenerator
+from apps.core.models import Category, Destination
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measures JSON API latency against a synthetic catalog (rolled back afterwards).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Synthetic destinations to add before measuring.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+        parser.add_argument('--host', default='localhost', help='Host header used for the requests.')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 0 or options['requests'] < 1:
+            raise CommandError('--rows must be >= 0 and --requests must be positive.')
+        # Semua data sintetis dibuat dalam satu transaksi lalu di-rollback
+        try:
+            with transaction.atomic():
+                self.seed(options['rows'])
+                self.run(options['requests'], options['host'])
+                raise Rollback
+        except Rollback:
+            pass
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS('\n=== DONE ==='))
+
+    def seed(self, rows):
+        # Katalog sintetis dari generate_catalog (seed tetap agar hasil sebanding)
+        generator = CatalogGenerator(seed=0)
+        stats = generator.run(rows)
+        self.stdout.write(
+            f'Catalog: {Destination.objects.count()} destinations '
+            f'(seeded {rows} in {stats.elapsed:.2f}s)'
+        )
+        self.category = Category.objects.get(pk=generator.category_ids[0])
+
+    def measure(self, client, label, urls, etag=False):
+        # Latensi per request (ms); etag=True mengirim If-None-Match dari respons pertama
+        timings = []
+        headers = {}
+        for url in urls:
+            if etag and not headers:
+                headers['HTTP_IF_NONE_MATCH'] = client.get(url)['ETag']
+            started = time.perf_counter()
+            response = client.get(url, **headers)
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code not in (200, 304):
+                raise CommandError(f'{label}: {url} returned {response.status_code}')
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f'{label:<32} mean {statistics.mean(timings):7.2f} ms   '
+            f'p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms   '
+            f'(status {response.status_code})'
+        )
+
+    def run(self, count, host):
+        client = Client(HTTP_HOST=host)
+        list_url = reverse('core:api_destination_list')
+
+        # Telusuri halaman demi halaman lewat cursor 'next'
+        deep_urls = []
+        url = list_url
+        while url and len(deep_urls) < count:
+            deep_urls.append(url)
+            url = client.get(url).json()['next']
+
+        slugs = list(Destination.objects.order_by('?').values_list('slug', flat=True)[:count])
+        detail_urls = [reverse('core:api_destination_detail', kwargs={'slug': slug}) for slug in slugs]
+        filtered_url = f'{list_url}?category={self.category.slug}&limit=100'
+
+        self.stdout.write('')
+        self.measure(client, 'list (first page)', [list_url] * count)
+        self.measure(client, f'list (walk {len(deep_urls)} pages)', deep_urls)
+        self.measure(client, 'list ?category, limit=100', [filtered_url] * count)
+        self.measure(client, 'detail (random)', detail_urls)
+        self.measure(client, 'categories', [reverse('core:api_category_list')] * count)
+        self.measure(client, 'districts', [reverse('core:api_district_list')] * count)
+        self.measure(client, 'list revalidation (304)', [list_url] * count, etag=True)
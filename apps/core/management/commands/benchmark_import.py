@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.core.generators import CatalogGenerator
+from apps.core.importers import CatalogImporter, iter_jsonl
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures import_catalog throughput: writes synthetic destinations to a temporary JSONL file, imports it '
+        'into the configured database inside a transaction that is rolled back, and checks a time target.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Destinations to import.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert (as in import_catalog).')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic rows.')
+        parser.add_argument('--target-seconds', type=float, default=60.0, help='Fail if the import takes longer (0 = report only).')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--rows and --batch-size must be positive.')
+
+        # File ditulis di luar pengukuran; yang diukur baca JSONL + validasi + insert
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8', delete=False) as handle:
+            for record in CatalogGenerator(seed=options['seed']).import_records(options['rows']):
+                handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+        try:
+            with open(handle.name, encoding='utf-8') as stream:
+                importer = CatalogImporter(batch_size=options['batch_size'], create_missing=True)
+                # Database tidak berubah: semua batch dibatalkan di akhir
+                try:
+                    with transaction.atomic():
+                        stats = importer.run(iter_jsonl(stream))
+                        raise Rollback
+                except Rollback:
+                    pass
+        finally:
+            os.unlink(handle.name)
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(f"Imported: {stats.created['destination']} destinations (skipped {stats.skipped})")
+        self.stdout.write(f'Time: {stats.elapsed:.2f}s ({stats.rows_per_second:,.0f} rows/s)')
+        target = options['target_seconds']
+        if target and stats.elapsed > target:
+            raise CommandError(f"{stats.rows} rows took {stats.elapsed:.2f}s, over the {target:g}s target")
+        if target:
+            self.stdout.write(self.style.SUCCESS(f'Within the {target:g}s target'))
@@ -0,0 +1,68 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.core import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs benchmark_site twice in separate processes, under WSGI (sync views, thread workers) and '
+        'ASGI (async views, asyncio workers), and compares throughput and p95 per route.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Measured requests per route.')
+        parser.add_argument('--concurrency', type=int, default=64, help='Concurrent workers per route.')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per route before measuring.')
+        parser.add_argument('--samples', type=int, default=20, help='Distinct slugs used for detail routes.')
+        parser.add_argument('--route', action='append', default=[], help='Only run routes containing this text (repeatable).')
+        parser.add_argument('--wsgi-url', help='Benchmark a running WSGI server (e.g. gunicorn) instead of in-process.')
+        parser.add_argument('--asgi-url', help='Benchmark a running ASGI server (e.g. uvicorn) instead of in-process.')
+        parser.add_argument('--output', help='Write both reports and the comparison as JSON.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['warmup'] < 0 or options['samples'] < 1:
+            raise CommandError('--requests, --concurrency and --samples must be positive, --warmup >= 0.')
+        reports = {}
+        for interface in ('wsgi', 'asgi'):
+            self.stdout.write(f'Running {interface.upper()} benchmark...')
+            reports[interface] = self.run_benchmark(interface, options)
+
+        rows = benchmarks.compare_interfaces(reports['wsgi']['routes'], reports['asgi']['routes'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump({'wsgi': reports['wsgi'], 'asgi': reports['asgi'], 'comparison': rows}, handle, indent=2)
+
+        def number(value, width=9):
+            return f'{value:{width}.2f}' if value is not None else ' ' * (width - 1) + '-'
+
+        self.stdout.write(
+            f'\nconcurrency {options["concurrency"]}, {options["requests"]} requests per route\n'
+            f'{"route":<40} {"WSGI r/s":>9} {"ASGI r/s":>9} {"ratio":>6} {"WSGI p95":>9} {"ASGI p95":>9}'
+        )
+        for name, wsgi_rps, asgi_rps, ratio, wsgi_p95, asgi_p95 in rows:
+            self.stdout.write(
+                f'{name:<40} {number(wsgi_rps)} {number(asgi_rps)} {number(ratio, 6)} '
+                f'{number(wsgi_p95)} {number(asgi_p95)}'
+            )
+        self.stdout.write(self.style.SUCCESS('\n=== DONE ==='))
+
+    def run_benchmark(self, interface, options):
+        # Proses terpisah: urls.py memilih view sync/async saat import (ASYNC_VIEWS)
+        arguments = [
+            '--interface', interface,
+            '--requests', str(options['requests']),
+            '--concurrency', str(options['concurrency']),
+            '--warmup', str(options['warmup']),
+            '--samples', str(options['samples']),
+        ]
+        for route in options['route']:
+            arguments += ['--route', route]
+        if options[f'{interface}_url']:
+            arguments += ['--base-url', options[f'{interface}_url']]
+        env = dict(os.environ, DJANGO_ASYNC_VIEWS='True' if interface == 'asgi' else 'False')
+        try:
+            return benchmarks.run_site_benchmark(arguments, env)
+        except RuntimeError as exc:
+            raise CommandError(f'{interface.upper()} benchmark failed:\n{exc}')
@@ -0,0 +1,90 @@
+import json
+import os
+import secrets
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core import benchmarks
+
+# Route yang diukur per profil: overhead middleware/framework (about dari
+# cache halaman), render template (home) dan halaman dengan query (list, detail)
+DEFAULT_ROUTES = ('base:about', 'base:home', 'core:destination_list', 'core:destination_detail')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares settings profiles (dev / prod / bench): process startup, django.setup() and first-request '
+        'time, plus per-request latency of selected routes, each profile in its own process.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', action='append', choices=settings.SETTINGS_PROFILES, default=[],
+            help='Profile to include (repeatable, default: all).',
+        )
+        parser.add_argument('--startup-runs', type=int, default=5, help='Fresh processes per profile for startup timing.')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per route.')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per route before measuring.')
+        parser.add_argument('--route', action='append', default=[], help='Route to measure (repeatable, default: %s).' % ', '.join(DEFAULT_ROUTES))
+        parser.add_argument('--output', help='Write the comparison as JSON.')
+
+    def handle(self, *args, **options):
+        if options['startup_runs'] < 1 or options['requests'] < 1 or options['warmup'] < 0:
+            raise CommandError('--startup-runs and --requests must be positive, --warmup >= 0.')
+        profiles = options['profile'] or list(settings.SETTINGS_PROFILES)
+        if 'prod' in profiles and not (Path(settings.STATIC_ROOT) / 'staticfiles.json').exists():
+            # Profil prod memakai manifest file statis ber-hash dari collectstatic
+            message = 'prod profile needs collected static files: run DJANGO_PROFILE=prod manage.py collectstatic'
+            if options['profile']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(f'Skipping prod: {message}'))
+            profiles.remove('prod')
+        routes = options['route'] or list(DEFAULT_ROUTES)
+
+        results = {}
+        for profile in profiles:
+            self.stdout.write(f'Profile {profile}...')
+            env = self.profile_env(profile)
+            arguments = ['--requests', str(options['requests']), '--warmup', str(options['warmup'])]
+            for route in routes:
+                arguments += ['--route', route]
+            try:
+                startup = benchmarks.measure_startup(env, options['startup_runs'])
+                report = benchmarks.run_site_benchmark(arguments, env)
+            except RuntimeError as exc:
+                raise CommandError(f'Profile {profile} failed:\n{exc}')
+            results[profile] = {'startup': startup, 'routes': report['routes']}
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2)
+        self.write_tables(results)
+
+    def profile_env(self, profile):
+        # DJANGO_DEBUG dibuang agar default profil yang berlaku; prod diberi
+        # kunci & host lokal sementara jika belum diset (hanya untuk proses ini)
+        env = dict(os.environ, DJANGO_PROFILE=profile)
+        env.pop('DJANGO_DEBUG', None)
+        if profile == 'prod':
+            if env.get('DJANGO_SECRET_KEY', settings.DEV_SECRET_KEY) == settings.DEV_SECRET_KEY:
+                env['DJANGO_SECRET_KEY'] = secrets.token_urlsafe(64)
+            env.setdefault('DJANGO_ALLOWED_HOSTS', 'localhost')
+            env.setdefault('REQUEST_METRICS_LOG_LEVEL', 'WARNING')
+        return env
+
+    def write_tables(self, results):
+        profiles = list(results)
+        self.stdout.write(f'\n{"startup (median)":<32}' + ''.join(f'{profile:>12}' for profile in profiles))
+        for key, label in (('process_ms', 'process total ms'), ('setup_ms', 'django.setup() ms'), ('first_request_ms', 'first request ms')):
+            self.stdout.write(f'{label:<32}' + ''.join(f'{results[profile]["startup"][key]:12.1f}' for profile in profiles))
+
+        self.stdout.write(f'\n{"per request (mean ms)":<32}' + ''.join(f'{profile:>12}' for profile in profiles))
+        names = [name for name in results[profiles[0]]['routes']]
+        for name in names:
+            row = ''
+            for profile in profiles:
+                mean = results[profile]['routes'].get(name, {}).get('mean_ms')
+                row += f'{mean:12.2f}' if mean is not None else f'{"-":>12}'
+            self.stdout.write(f'{name:<32}' + row)
+        self.stdout.write(self.style.SUCCESS('\n=== DONE ==='))
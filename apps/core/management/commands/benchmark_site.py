@@ -0,0 +1,120 @@
+import json
+import platform
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core import benchmarks
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks every public URL (base & core) in-process or against a running server and '
+        'reports p50/p95/p99, throughput and queries per request; can save and compare baselines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', help='Benchmark a running server (e.g. http://127.0.0.1:8000) instead of the test client.')
+        parser.add_argument(
+            '--interface', choices=('wsgi', 'asgi'), default='wsgi',
+            help='In-process handler: test client (WSGI, thread workers) or ASGIHandler (asyncio workers).',
+        )
+        parser.add_argument('--host', default='localhost', help='Host header for in-process requests.')
+        parser.add_argument('--requests', type=int, default=100, help='Measured requests per route.')
+        parser.add_argument('--concurrency', type=int, default=1, help='Parallel workers per route.')
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per route before measuring.')
+        parser.add_argument('--samples', type=int, default=20, help='Distinct slugs used for detail routes.')
+        parser.add_argument('--route', action='append', default=[], help='Only run routes containing this text (repeatable).')
+        parser.add_argument('--output', help='Write the JSON report here (use it later as --baseline).')
+        parser.add_argument('--baseline', help='Compare against a previously saved JSON report.')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p95 slowdown before flagging (0.2 = 20%%).')
+        parser.add_argument('--json', action='store_true', help='Print the JSON report instead of the table.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['warmup'] < 0 or options['samples'] < 1:
+            raise CommandError('--requests, --concurrency and --samples must be positive, --warmup >= 0.')
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = benchmarks.load_report(options['baseline'])
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Cannot read baseline: {exc}')
+
+        targets, skipped = benchmarks.build_targets(options['samples'])
+        if options['route']:
+            targets = {name: urls for name, urls in targets.items() if any(text in name for text in options['route'])}
+        if not targets:
+            raise CommandError('No routes to benchmark.')
+
+        if options['base_url']:
+            transport = benchmarks.HTTPTransport(options['base_url'])
+        elif options['interface'] == 'asgi':
+            if not settings.ASYNC_VIEWS:
+                self.stdout.write(self.style.WARNING(
+                    'ASYNC_VIEWS is off: sync views will run through the sync-to-async adapter '
+                    '(set DJANGO_ASYNC_VIEWS=True)'
+                ))
+            transport = benchmarks.ASGITransport(options['host'])
+        else:
+            transport = benchmarks.ClientTransport(options['host'])
+        results = benchmarks.run_suite(
+            transport, targets, options['requests'], options['concurrency'], options['warmup'],
+        )
+        report = {
+            'meta': {
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'mode': 'http' if options['base_url'] else 'in-process',
+                'interface': None if options['base_url'] else options['interface'],
+                'async_views': settings.ASYNC_VIEWS,
+                'profile': settings.SETTINGS_PROFILE,
+                'debug': settings.DEBUG,
+                'base_url': options['base_url'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'warmup': options['warmup'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'skipped': skipped,
+            },
+            'routes': results,
+        }
+        if baseline:
+            previous = baseline.get('meta', {})
+            for key in ('mode', 'interface', 'profile', 'concurrency', 'requests'):
+                if previous.get(key) != report['meta'][key]:
+                    self.stdout.write(self.style.WARNING(
+                        f'Baseline {key} differs ({previous.get(key)} vs {report["meta"][key]}); results may not be comparable'
+                    ))
+        regressions = benchmarks.compare(baseline['routes'], results, options['threshold']) if baseline else []
+        report['regressions'] = regressions
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_table(results, skipped)
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(f'REGRESSION {regression}'))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+
+    def write_table(self, results, skipped):
+        def ms(value):
+            return f'{value:8.2f}' if value is not None else '       -'
+
+        self.stdout.write(
+            f'\n{"route":<40} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"req/s":>8} {"queries":>8}  status'
+        )
+        for name, result in results.items():
+            queries = result['queries_per_request']
+            self.stdout.write(
+                f'{name:<40} {ms(result["p50_ms"])} {ms(result["p95_ms"])} {ms(result["p99_ms"])} '
+                f'{ms(result["throughput_rps"])} {ms(queries)}  '
+                + ', '.join(f'{status}x{count}' for status, count in sorted(result['status'].items()))
+            )
+        for name in skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {name}: no sample data for its URL parameters'))
+        self.stdout.write(self.style.SUCCESS('\n=== DONE ==='))
@@ -0,0 +1,17 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.core.maps import GEOJSON_SNAPSHOT_NAME, write_geojson_snapshot
+
+class Command(BaseCommand):
+    help = 'Writes the gzipped GeoJSON snapshot of all destinations with coordinates (for the map page).'
+
+    def handle(self, *args, **options):
+        features = write_geojson_snapshot()
+        path = os.path.join(settings.MEDIA_ROOT, GEOJSON_SNAPSHOT_NAME)
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(f'Features: {features}')
+        self.stdout.write(f'{GEOJSON_SNAPSHOT_NAME}: {os.path.getsize(path)} bytes')
+        self.stdout.write(f'{GEOJSON_SNAPSHOT_NAME}.gz: {os.path.getsize(path + ".gz")} bytes')
@@ -0,0 +1,62 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.exporters import StaticSiteExporter
+
+
+def default_host():
+    # Host pertama yang valid dari ALLOWED_HOSTS (tanpa wildcard)
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+class Command(BaseCommand):
+    help = (
+        'Renders every public page (home, about, destination, category and district pages) to static HTML '
+        'with a process pool, copies static and media assets and writes a sitemap. Re-runs only render pages '
+        'whose rows changed since the last export.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', required=True, help='Output directory (served by nginx or uploaded to a CDN).')
+        parser.add_argument('--base-url', help='Public site URL for sitemap entries (default: http://<host>).')
+        parser.add_argument('--host', help='Host header used for rendering (default: first ALLOWED_HOSTS entry).')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Render processes.')
+        parser.add_argument('--chunk-size', type=int, default=50, help='Pages per worker task.')
+        parser.add_argument('--full', action='store_true', help='Ignore the previous export state and render every page.')
+        parser.add_argument('--no-assets', action='store_true', help='Do not copy static and media files.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--workers and --chunk-size must be positive.')
+
+        exporter = StaticSiteExporter(
+            options['output'],
+            host=options['host'] or default_host(),
+            base_url=options['base_url'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            full=options['full'],
+            assets=not options['no_assets'],
+        )
+        stats = exporter.run()
+
+        for warning in stats.warnings:
+            self.stdout.write(self.style.WARNING(warning))
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(self.style.SUCCESS(
+            f'Pages: {stats.pages} (rendered {stats.rendered}, unchanged {stats.unchanged}, removed {stats.removed})'
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Written {stats.bytes_written / 1024 / 1024:.1f} MiB, assets copied: {stats.assets_copied}'
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished in {stats.elapsed:.2f}s ({stats.pages_per_second:,.0f} pages/s)'
+        ))
+        if stats.failed:
+            for url, status in stats.failed[:10]:
+                self.stdout.write(self.style.ERROR(f'Failed: {url} (status {status})'))
+            raise CommandError(f'{len(stats.failed)} page(s) failed to render.')
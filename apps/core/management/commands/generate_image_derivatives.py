@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from PIL import Image, UnidentifiedImageError
+from apps.core.images import generate_derivatives
+from apps.core.models import Destination, DestinationGallery, District
+
+class Command(BaseCommand):
+    help = 'Generates responsive WebP/JPEG derivatives for existing destination, gallery and district images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate derivatives that already exist.')
+
+    def handle(self, *args, **options):
+        sources = [
+            (Destination, 'main_image'),
+            (DestinationGallery, 'image'),
+            (District, 'thumbnail'),
+        ]
+        generated = 0
+        failed = 0
+
+        for model, field in sources:
+            names = (
+                model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .values_list(field, flat=True).distinct().iterator()
+            )
+            for name in names:
+                try:
+                    generate_derivatives(name, force=options['force'])
+                    generated += 1
+                except (
+                    FileNotFoundError, UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError
+                ) as exc:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f"Skipped {name}: {exc}"))
+
+        self.stdout.write(self.style.SUCCESS(f'Processed: {generated} images'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'Failed: {failed} images'))
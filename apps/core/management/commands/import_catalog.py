@@ -0,0 +1,49 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.importers import CatalogImporter, READERS, detect_format
+
+class Command(BaseCommand):
+    help = 'Stream-imports districts, categories and destinations from JSON, JSONL or CSV using bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, or "-" for stdin.')
+        parser.add_argument('--format', choices=sorted(READERS), help='Input format (default: from file extension).')
+        parser.add_argument('--model', choices=['district', 'category', 'destination'],
+                            help='Model for records without a "model" column.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert/transaction.')
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Create districts/categories referenced by name that do not exist yet.')
+        parser.add_argument('--strict', action='store_true', help='Abort on the first invalid row.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError('Cannot detect input format; pass --format.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        importer = CatalogImporter(
+            batch_size=options['batch_size'],
+            default_model=options['model'],
+            create_missing=options['create_missing'],
+            strict=options['strict'],
+        )
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        try:
+            stats = importer.run(READERS[fmt](stream))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in stats.errors:
+            self.stdout.write(self.style.WARNING(error))
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        for model, count in stats.created.items():
+            self.stdout.write(self.style.SUCCESS(f'Created {model}: {count}'))
+        self.stdout.write(f'Skipped: {stats.skipped}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Rows: {stats.rows} in {stats.elapsed:.2f}s ({stats.rows_per_second:,.0f} rows/s)'
+        ))
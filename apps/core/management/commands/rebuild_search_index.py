@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from apps.core.search import rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text (FTS5) search index for destinations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to rebuild.')
+
+    def handle(self, *args, **options):
+        total = rebuild_index(using=options['database'])
+        if total is None:
+            self.stdout.write(self.style.WARNING(
+                'FTS5 is not available on this database; search falls back to icontains.'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} destinations'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from apps.core.stats import rebuild_stats
+
+class Command(BaseCommand):
+    help = 'Recomputes the CatalogStats read model (counts, total views, top and recent destinations).'
+
+    def handle(self, *args, **kwargs):
+        stats = rebuild_stats()
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(f'Destinations: {stats.destination_count}')
+        self.stdout.write(f'Categories: {stats.category_count}')
+        self.stdout.write(f'Districts: {stats.district_count}')
+        self.stdout.write(f'Users: {stats.user_count}')
+        self.stdout.write(f'Total Views: {stats.total_views}')
+        for entry in stats.top_destinations:
+            self.stdout.write(f"  {entry['name']}: {entry['view_count']} views")
@@ -1,73 +1,217 @@
-from django.core.management.base import BaseCommand
+import json
+import random
+import sys
+from collections import defaultdict
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.core.cache import bump_catalog_version
+from apps.core.importers import READERS, detect_format
 from apps.core.models import Destination
+from apps.core.stats import rebuild_stats
+
+# Realistic view distribution based on popularity (total = 2000)
+VIEWS_DATA = {
+    # HERO / MOST POPULAR (Higher views)
+    "Pantai Senggigi": 185,           # #1 Most iconic
+    "Gili Nanggu": 142,               # #2 Famous island
+    "Taman Narmada": 128,             # #3 Historic heritage
+    "Pura Lingsar": 115,              # #4 Famous temple
+    "Pura Batu Bolong": 102,          # #5 Sunset spot
+    "Hutan Wisata Sesaot": 95,        # #6 Popular forest
+
+    # POPULAR (Medium-high views)
+    "Gili Sudak": 78,
+    "Gili Kedis": 72,
+    "Makam Batulayar": 68,
+    "Pantai Kerandangan": 65,
+    "Desa Wisata Banyumulek": 62,
+    "Gili Gede": 58,
+
+    # MODERATE (Medium views)
+    "Gili Asahan": 52,
+    "Gili Layar": 48,
+    "Air Terjun Timponan": 45,
+    "Pura Suranadi": 42,
+    "Kolam Renang Suranadi": 40,
+    "Hutan Pusuk (Monkey Forest)": 38,
+    "Pantai Mangsit": 36,
+    "Pemandian Aik Nyet": 34,
+
+    # EMERGING (Lower-medium views)
+    "Desa Wisata Kebon Ayu": 32,
+    "Ekowisata Mangrove Lembar": 30,
+    "Pasar Seni Sesela": 28,
+    "Masjid Kuno Wetu Telu Karang Bayan": 26,
+    "Pantai Mekaki": 25,
+    "Bunut Ngengkang": 24,
+
+    # HIDDEN GEMS (Lower views - remote/new)
+    "Bangko-Bangko (Desert Point)": 22,
+    "Air Terjun Segenter": 20,
+    "Desa Wisata Mekarsari": 18,
+    "Air Terjun Kekait (Tibu Ijo)": 17,
+    "Pantai Nambung": 16,
+    "Pantai Elak-Elak": 15,
+    "Cafless Waterpark": 14,
+    "Gunung Sasak": 13,
+    "Makam Keramat Lembar": 12,
+    "Pantai Cemare": 11,
+}
+
+# Jumlah nama per query IN (batas variabel SQLite)
+LOOKUP_CHUNK_SIZE = 900
+
+# Baris per statement UPDATE ... CASE pada bulk_update
+UPDATE_BATCH_SIZE = 500
+
+# Jumlah nama tidak ditemukan yang ditampilkan
+MAX_REPORTED_MISSING = 50
+
+
+def read_mapping(stream, fmt):
+    # {nama: tayangan} dari objek JSON {"nama": n}, atau dari baris
+    # JSON/JSONL/CSV dengan kolom name dan views (atau view_count)
+    if fmt == 'json':
+        data = json.load(stream)
+        rows = data.items() if isinstance(data, dict) else ((row.get('name'), _views(row)) for row in data)
+    else:
+        rows = ((row.get('name'), _views(row)) for row in READERS[fmt](stream))
+    mapping = {}
+    for name, views in rows:
+        if not name:
+            raise CommandError('Every row needs a "name".')
+        try:
+            views = int(views)
+        except (TypeError, ValueError):
+            raise CommandError(f'Invalid view count for "{name}": {views!r}')
+        if views < 0:
+            raise CommandError(f'Negative view count for "{name}".')
+        mapping[name] = views
+    return mapping
+
+
+def _views(row):
+    return row.get('views', row.get('view_count'))
+
+
+def zipf_counts(total, size, exponent=1.0):
+    # Bagi 'total' tayangan ke 'size' peringkat menurut hukum Zipf
+    # (peringkat r mendapat bobot 1/r^exponent); jumlahnya tepat 'total'
+    if size == 0:
+        return []
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    factor = total / sum(weights)
+    counts = [int(weight * factor) for weight in weights]
+    for rank in range(total - sum(counts)):
+        counts[rank % size] += 1
+    return counts
+
+
+def write_counts(counts):
+    # Tulis semua pasangan (pk, tayangan) dalam satu transaksi. Nilai yang
+    # dipakai banyak destinasi (ekor distribusi sintetis) ditulis dengan
+    # UPDATE ... IN per nilai; sisanya dengan satu bulk_update (UPDATE ... CASE).
+    groups = defaultdict(list)
+    for pk, views in counts:
+        groups[views].append(pk)
+    singles = []
+    with transaction.atomic():
+        for views, pks in groups.items():
+            if len(pks) == 1:
+                singles.append(Destination(pk=pks[0], view_count=views))
+                continue
+            for start in range(0, len(pks), LOOKUP_CHUNK_SIZE):
+                Destination.objects.filter(pk__in=pks[start:start + LOOKUP_CHUNK_SIZE]).update(view_count=views)
+        Destination.objects.bulk_update(singles, ['view_count'], batch_size=UPDATE_BATCH_SIZE)
+
 
 class Command(BaseCommand):
-    help = 'Resets destination views with realistic distribution totaling 2000.'
-
-    def handle(self, *args, **kwargs):
-        # Realistic view distribution based on popularity (total = 2000)
-        views_data = {
-            # HERO / MOST POPULAR (Higher views)
-            "Pantai Senggigi": 185,           # #1 Most iconic
-            "Gili Nanggu": 142,               # #2 Famous island
-            "Taman Narmada": 128,             # #3 Historic heritage
-            "Pura Lingsar": 115,              # #4 Famous temple
-            "Pura Batu Bolong": 102,          # #5 Sunset spot
-            "Hutan Wisata Sesaot": 95,        # #6 Popular forest
-            
-            # POPULAR (Medium-high views)
-            "Gili Sudak": 78,
-            "Gili Kedis": 72,
-            "Makam Batulayar": 68,
-            "Pantai Kerandangan": 65,
-            "Desa Wisata Banyumulek": 62,
-            "Gili Gede": 58,
-            
-            # MODERATE (Medium views)
-            "Gili Asahan": 52,
-            "Gili Layar": 48,
-            "Air Terjun Timponan": 45,
-            "Pura Suranadi": 42,
-            "Kolam Renang Suranadi": 40,
-            "Hutan Pusuk (Monkey Forest)": 38,
-            "Pantai Mangsit": 36,
-            "Pemandian Aik Nyet": 34,
-            
-            # EMERGING (Lower-medium views)
-            "Desa Wisata Kebon Ayu": 32,
-            "Ekowisata Mangrove Lembar": 30,
-            "Pasar Seni Sesela": 28,
-            "Masjid Kuno Wetu Telu Karang Bayan": 26,
-            "Pantai Mekaki": 25,
-            "Bunut Ngengkang": 24,
-            
-            # HIDDEN GEMS (Lower views - remote/new)
-            "Bangko-Bangko (Desert Point)": 22,
-            "Air Terjun Segenter": 20,
-            "Desa Wisata Mekarsari": 18,
-            "Air Terjun Kekait (Tibu Ijo)": 17,
-            "Pantai Nambung": 16,
-            "Pantai Elak-Elak": 15,
-            "Cafless Waterpark": 14,
-            "Gunung Sasak": 13,
-            "Makam Keramat Lembar": 12,
-            "Pantai Cemare": 11,
-        }
-        
-        updated = 0
-        total = 0
-        
-        for name, views in views_data.items():
-            try:
-                dest = Destination.objects.get(name=name)
-                dest.view_count = views
-                dest.save()
-                total += views
-                self.stdout.write(f"{name}: {views} views")
-                updated += 1
-            except Destination.DoesNotExist:
-                self.stdout.write(self.style.WARNING(f"Not found: {name}"))
-        
+    help = (
+        'Sets destination view counts from the built-in table, a JSON/JSONL/CSV file or stdin, '
+        'or spreads a synthetic Zipf distribution over the whole catalog (--scale).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='Mapping file, or "-" for stdin (default: built-in table).')
+        parser.add_argument('--format', choices=sorted(READERS), help='Input format (default: from file extension).')
+        parser.add_argument('--scale', type=int, metavar='TOTAL',
+                            help='Distribute TOTAL views over every destination (mapped names rank first).')
+        parser.add_argument('--exponent', type=float, default=1.0, help='Zipf exponent for --scale.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for ranking unmapped destinations.')
+        parser.add_argument('--dry-run', action='store_true', help='Show what would change without writing.')
+
+    def handle(self, *args, **options):
+        mapping = self.load(options)
+        if options['scale'] is not None:
+            if options['scale'] < 0:
+                raise CommandError('--scale must not be negative.')
+            counts, missing = self.synthetic(mapping, options['scale'], options['exponent'], options['seed'])
+            if options['path'] is None:
+                # Tabel bawaan hanya menentukan peringkat; katalog sintetis tidak memuatnya
+                missing = []
+        else:
+            counts, missing = self.resolve(mapping)
+
+        for name in missing[:MAX_REPORTED_MISSING]:
+            self.stdout.write(self.style.WARNING(f"Not found: {name}"))
+        if len(missing) > MAX_REPORTED_MISSING:
+            self.stdout.write(self.style.WARNING(f"... and {len(missing) - MAX_REPORTED_MISSING} more not found"))
+        if options['verbosity'] >= 2:
+            for pk, views in counts:
+                self.stdout.write(f"{pk}: {views} views")
+
+        if not options['dry_run']:
+            # bulk_update melewati signal, jadi statistik katalog dan versi
+            # cache diperbarui manual
+            write_counts(counts)
+            rebuild_stats()
+            bump_catalog_version()
+
         self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
-        self.stdout.write(self.style.SUCCESS(f'Updated: {updated} destinations'))
-        self.stdout.write(self.style.SUCCESS(f'Total Views: {total}'))
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: nothing was written.'))
+        self.stdout.write(self.style.SUCCESS(f'Updated: {len(counts)} destinations'))
+        self.stdout.write(self.style.SUCCESS(f'Total Views: {sum(views for _, views in counts)}'))
+
+    def load(self, options):
+        path = options['path']
+        if path is None:
+            return dict(VIEWS_DATA)
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError('Cannot detect input format; pass --format.')
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        try:
+            return read_mapping(stream, fmt)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    def resolve(self, mapping):
+        # Semua nama dicari dengan query IN (per chunk), tanpa get() per baris.
+        # Nama destinasi tidak unik: semua destinasi bernama sama ikut diubah.
+        names = list(mapping)
+        counts = []
+        found = set()
+        for start in range(0, len(names), LOOKUP_CHUNK_SIZE):
+            rows = Destination.objects.filter(name__in=names[start:start + LOOKUP_CHUNK_SIZE]).values_list('pk', 'name')
+            for pk, name in rows:
+                counts.append((pk, mapping[name]))
+                found.add(name)
+        return counts, [name for name in names if name not in found]
+
+    def synthetic(self, mapping, total, exponent, seed):
+        # Peringkat: nama dari mapping (urut tayangan terbanyak), lalu sisa
+        # katalog dalam urutan acak ber-seed; tayangan dibagi menurut Zipf
+        rows = list(Destination.objects.order_by('pk').values_list('pk', 'name'))
+        order = {name: rank for rank, name in enumerate(sorted(mapping, key=mapping.get, reverse=True))}
+        ranked = [row for row in rows if row[1] in order]
+        ranked.sort(key=lambda row: order[row[1]])
+        rest = [row for row in rows if row[1] not in order]
+        random.Random(seed).shuffle(rest)
+        ranked += rest
+        counts = [(pk, views) for (pk, _), views in zip(ranked, zipf_counts(total, len(ranked), exponent))]
+        found = {name for _, name in rows}
+        return counts, [name for name in mapping if name not in found]
@@ -0,0 +1,36 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.core import analytics
+from apps.core.models import Destination
+
+class Command(BaseCommand):
+    help = 'Merges old hourly view buckets into daily buckets and prunes buckets past the retention window.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hourly-days', type=int, help='Keep hourly buckets this many days (default: VIEW_ANALYTICS_HOURLY_DAYS).')
+        parser.add_argument('--retention-days', type=int, help='Delete buckets older than this (default: VIEW_ANALYTICS_RETENTION_DAYS).')
+        parser.add_argument('--report-days', type=int, default=7, help='Print the top destinations of the last N days afterwards (0 to skip).')
+
+    def handle(self, *args, **options):
+        for name in ('hourly_days', 'retention_days'):
+            if options[name] is not None and options[name] < 0:
+                raise CommandError(f'--{name.replace("_", "-")} must not be negative.')
+
+        merged, pruned = analytics.rollup(
+            hourly_days=options['hourly_days'],
+            retention_days=options['retention_days'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(self.style.SUCCESS(f'Hourly buckets merged: {merged}'))
+        self.stdout.write(self.style.SUCCESS(f'Buckets pruned: {pruned}'))
+
+        days = options['report_days']
+        if days > 0:
+            end = timezone.now()
+            top = analytics.top_destinations(end - timedelta(days=days), end, limit=10)
+            names = dict(Destination.objects.filter(pk__in=[pk for pk, _ in top]).values_list('pk', 'name'))
+            self.stdout.write(f'\nTop destinations, last {days} days:')
+            for pk, views in top:
+                self.stdout.write(f'{names.get(pk, pk)}: {views} views')
@@ -0,0 +1,114 @@
+import multiprocessing
+import random
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from apps.core.benchmarks import percentile
+from apps.core.counters import ViewCountBuffer
+from apps.core.models import Destination
+
+
+def _reader(pks, seconds, results):
+    # Proses pembaca: query daftar destinasi berulang, catat latensi
+    django.setup()
+    rng = random.Random()
+    timings, errors = [], []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pk = rng.choice(pks)
+        started = time.perf_counter()
+        try:
+            list(Destination.objects.filter(pk__gte=pk).order_by('pk').values_list('name', 'view_count')[:20])
+        except OperationalError as exc:
+            errors.append(str(exc))
+            continue
+        timings.append((time.perf_counter() - started) * 1000)
+    connections.close_all()
+    results.put(('read', timings, errors))
+
+
+def _writer(pks, seconds, flush_every, results):
+    # Proses penulis: jalur tulis sebenarnya (buffer tayangan -> UPDATE,
+    # statistik, bucket analitik), termasuk retry saat database terkunci
+    django.setup()
+    rng = random.Random()
+    buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=10 ** 9, flush_timer=False)
+    timings, errors = [], []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for _ in range(flush_every):
+            buffer.increment(rng.choice(pks))
+        started = time.perf_counter()
+        try:
+            buffer.flush()
+        except OperationalError as exc:
+            errors.append(str(exc))
+            buffer.clear()
+            continue
+        timings.append((time.perf_counter() - started) * 1000)
+    connections.close_all()
+    results.put(('write', timings, errors))
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs concurrent reader and view-count writer processes against the configured database and '
+        'reports read/flush latency and lock errors (checks the WAL/busy_timeout/retry profile).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='Reader processes (destination list queries).')
+        parser.add_argument('--writers', type=int, default=4, help='Writer processes (view-count buffer flushes).')
+        parser.add_argument('--seconds', type=float, default=10.0, help='Test duration.')
+        parser.add_argument('--flush-every', type=int, default=20, help='Views per writer flush.')
+
+    def handle(self, *args, **options):
+        if options['readers'] < 0 or options['writers'] < 0 or options['seconds'] <= 0 or options['flush_every'] < 1:
+            raise CommandError('Process counts must be >= 0, --seconds and --flush-every positive.')
+        pks = list(Destination.objects.order_by('pk').values_list('pk', flat=True)[:1000])
+        if not pks:
+            raise CommandError('No destinations; run generate_catalog first.')
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                self.stdout.write(f'SQLite journal_mode: {cursor.fetchone()[0]}')
+        # Koneksi induk ditutup agar tidak diwariskan ke proses anak
+        connections.close_all()
+
+        # Proses terpisah (bukan thread) agar latensi tidak tercampur antrean GIL
+        results = multiprocessing.Queue()
+        seconds = options['seconds']
+        processes = [
+            multiprocessing.Process(target=_reader, args=(pks, seconds, results))
+            for _ in range(options['readers'])
+        ] + [
+            multiprocessing.Process(target=_writer, args=(pks, seconds, options['flush_every'], results))
+            for _ in range(options['writers'])
+        ]
+        for process in processes:
+            process.start()
+        collected = {'read': ([], []), 'write': ([], [])}
+        for _ in processes:
+            kind, timings, errors = results.get()
+            collected[kind][0].extend(timings)
+            collected[kind][1].extend(errors)
+        for process in processes:
+            process.join()
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        for kind, label in (('read', 'Reads'), ('write', 'Flushes')):
+            timings, errors = collected[kind]
+            timings.sort()
+            if timings:
+                self.stdout.write(
+                    f'{label}: {len(timings)} ({len(timings) / seconds:,.0f}/s)   '
+                    f'p50 {statistics.median(timings):.2f} ms   p99 {percentile(timings, 99):.2f} ms   '
+                    f'max {timings[-1]:.2f} ms'
+                )
+            if errors:
+                self.stdout.write(self.style.ERROR(f'{label} errors: {len(errors)} (first: {errors[0]})'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{label} errors: 0'))
@@ -0,0 +1,38 @@
+import sqlite3
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.core.cache import cache
+from apps.core.cache import bump_catalog_version
+from apps.core.stats import STATS_CACHE_KEY
+
+class Command(BaseCommand):
+    help = 'Copies the primary SQLite database into every read replica (online backup API).'
+
+    def handle(self, *args, **options):
+        replicas = list(getattr(settings, 'DATABASE_REPLICAS', []))
+        if not replicas:
+            raise CommandError('No replicas configured; set DJANGO_DB_REPLICAS.')
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('Replication for this backend is handled by the database server.')
+        primary.ensure_connection()
+
+        for alias in replicas:
+            # Tutup koneksi replika proses ini agar file bisa ditimpa bersih
+            connections[alias].close()
+            started = time.perf_counter()
+            target = sqlite3.connect(settings.DATABASES[alias]['NAME'])
+            try:
+                # Backup online: konsisten walau primary sedang ditulis
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f'{alias}: copied in {time.perf_counter() - started:.2f}s')
+
+        # Cache halaman & statistik yang mungkin dibangun dari replika lama ikut dibuang
+        bump_catalog_version()
+        cache.delete(STATS_CACHE_KEY)
+        self.stdout.write(self.style.SUCCESS(f'\n=== DONE ==='))
+        self.stdout.write(self.style.SUCCESS(f'Replicas synced: {len(replicas)}'))
@@ -0,0 +1,268 @@
+# Fitur peta katalog: destinasi terdekat & snapshot GeoJSON.
+#
+# Destinasi terdekat memakai indeks grid geohash (geo.py), bukan jarak ke
+# setiap baris: kandidat diambil dari sel destinasi + 8 sel tetangganya
+# (rentang awalan pada index dest_geohash_idx), lalu diurutkan dengan
+# haversine. Jika kandidat kurang atau yang terjauh melewati radius yang
+# dijamin blok 3x3, pencarian diulang pada sel yang lebih kasar. Hasil (id +
+# jarak) di-cache per versi katalog.
+#
+# Snapshot GeoJSON semua destinasi berkoordinat ditulis ke
+# MEDIA_ROOT/geo/destinations.geojson beserta varian .gz, sehingga dilayani
+# serve_media (atau nginx gzip_static) dengan ETag/Range tanpa query.
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Q
+from django.urls import reverse
+
+from .cache import get_catalog_version
+from .geo import GEOHASH_PRECISION, coordinate_fields, covered_radius_km, haversine_km, neighbours
+from .models import Destination
+
+logger = logging.getLogger(__name__)
+
+# Presisi sel pencarian, dari halus ke kasar (~1,2 km, ~4,9 km, ~39 km, ~156 km)
+NEARBY_PRECISIONS = (6, 5, 4, 3)
+
+# Snapshot tidak dibaca dari database saat dilayani, jadi bisa basi: signal
+# simpan/hapus Destination, Category & District (signals.py) serta akhir
+# import/generate memanggil request_snapshot_refresh(), yang menulis ulang
+# snapshot di thread latar setelah commit (GEOJSON_SNAPSHOT_AUTO_REFRESH).
+# Perubahan lewat UPDATE mentah (backfill) ditulis ulang oleh commandnya.
+GEOJSON_SNAPSHOT_NAME = 'geo/destinations.geojson'
+
+COORDINATE_FIELDS = ('latitude', 'longitude', 'geohash')
+
+
+def nearby_limit():
+    return getattr(settings, 'NEARBY_DESTINATIONS_LIMIT', 4)
+
+
+def cells_filter(cells):
+    # Rentang index untuk setiap awalan sel (tanpa LIKE, yang di SQLite tidak memakai index)
+    query = Q()
+    for cell in cells:
+        upper = cell + 'z' * (GEOHASH_PRECISION - len(cell))
+        query |= Q(geohash__gte=cell, geohash__lte=upper)
+    return query
+
+
+def find_nearby(destination, limit):
+    # [(id, jarak km)] destinasi terdekat, urut dari yang paling dekat
+    if not destination.geohash:
+        return []
+    lat, lng = destination.latitude, destination.longitude
+    ranked = []
+    for precision in NEARBY_PRECISIONS:
+        # Tanpa ORDER BY (urutan default membuat SQLite memindai index created_at)
+        rows = (
+            Destination.objects.filter(cells_filter(neighbours(destination.geohash[:precision])))
+            .exclude(pk=destination.pk)
+            .order_by()
+            .values_list('pk', 'latitude', 'longitude')
+        )
+        ranked = sorted((haversine_km(lat, lng, row_lat, row_lng), pk) for pk, row_lat, row_lng in rows)
+        if len(ranked) >= limit and ranked[limit - 1][0] <= covered_radius_km(lat, precision):
+            break
+    return [(pk, round(distance, 3)) for distance, pk in ranked[:limit]]
+
+
+def nearby_destinations(destination, limit=None):
+    # Instance destinasi terdekat (dengan atribut distance_km) untuk halaman detail
+    limit = limit or nearby_limit()
+    if not destination.geohash or limit <= 0:
+        return []
+    key = f'geo:nearby:{get_catalog_version()}:{destination.pk}:{limit}'
+    entries = cache.get(key)
+    if entries is None:
+        entries = find_nearby(destination, limit)
+        cache.set(key, entries, getattr(settings, 'CATALOG_PAGE_CACHE_TIMEOUT', 60 * 15))
+    if not entries:
+        return []
+    objects = Destination.objects.select_related('district', 'category').in_bulk([pk for pk, _ in entries])
+    result = []
+    for pk, distance in entries:
+        if pk in objects:
+            objects[pk].distance_km = distance
+            result.append(objects[pk])
+    return result
+
+
+# --- Backfill ---
+
+@dataclass
+class BackfillStats:
+    scanned: int = 0
+    located: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: float = None
+
+    @property
+    def missing(self):
+        return self.scanned - self.located
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.scanned / self.elapsed if self.elapsed else 0.0
+
+
+def _update_sql(connection):
+    quote = connection.ops.quote_name
+    columns = ', '.join(f'{quote(name)} = %s' for name in COORDINATE_FIELDS)
+    return f'UPDATE {quote(Destination._meta.db_table)} SET {columns} WHERE {quote(Destination._meta.pk.column)} = %s'
+
+
+def backfill_coordinates(batch_size=1000, only_missing=True, using='default'):
+    # Isi latitude/longitude/geohash dari maps_embed_url, per batch id.
+    # UPDATE executemany tanpa instance model (bulk_update menyusun CASE WHEN
+    # per baris dan jauh lebih lambat); card_version & signal tidak tersentuh.
+    stats = BackfillStats()
+    queryset = Destination.objects.using(using).order_by('pk')
+    if only_missing:
+        queryset = queryset.filter(latitude__isnull=True)
+    connection = connections[using]
+    sql = _update_sql(connection)
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).values_list('pk', 'maps_embed_url')[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        params = []
+        for pk, url in rows:
+            values = coordinate_fields(url)
+            params.append([values[name] for name in COORDINATE_FIELDS] + [pk])
+            stats.located += bool(values['geohash'])
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+        stats.scanned += len(rows)
+    stats.finished = time.perf_counter()
+    return stats
+
+
+# --- Snapshot GeoJSON ---
+
+def geojson_features():
+    # Satu query JOIN, dialirkan per potongan (tanpa instance model)
+    url_template = reverse('core:destination_detail', args=['__slug__'])
+    storage = Destination._meta.get_field('main_image').storage
+    rows = (
+        Destination.objects.exclude(geohash='').order_by('pk')
+        .values_list('pk', 'slug', 'name', 'latitude', 'longitude', 'main_image', 'category__name', 'district__name')
+    )
+    for pk, slug, name, lat, lng, image, category, district in rows.iterator(chunk_size=2000):
+        yield {
+            'type': 'Feature',
+            'id': pk,
+            'geometry': {'type': 'Point', 'coordinates': [round(lng, 6), round(lat, 6)]},
+            'properties': {
+                'name': name,
+                'url': url_template.replace('__slug__', slug),
+                'image': storage.url(image) if image else None,
+                'category': category,
+                'district': district,
+            },
+        }
+
+
+def _write_temp(path, data):
+    # File sementara bernama unik di direktori tujuan: proses lain yang
+    # menulis snapshot bersamaan tidak berbagi file .tmp yang sama
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), prefix=f'.{os.path.basename(path)}.', suffix='.tmp', delete=False
+    ) as handle:
+        temp_path = handle.name
+        try:
+            handle.write(data)
+        except BaseException:
+            handle.close()
+            os.unlink(temp_path)
+            raise
+    # NamedTemporaryFile membuat file 0600; media harus terbaca web server
+    os.chmod(temp_path, settings.FILE_UPLOAD_PERMISSIONS or 0o644)
+    return temp_path
+
+
+def _write_atomic(files):
+    # Tulis semua file ke temp dulu, baru ganti berurutan lewat os.replace:
+    # jeda antar versi hanya selisih rename, bukan selisih waktu kompresi
+    temp_paths = []
+    try:
+        for path, data in files:
+            temp_paths.append(_write_temp(path, data))
+    except BaseException:
+        for temp_path in temp_paths:
+            os.unlink(temp_path)
+        raise
+    for temp_path, (path, _) in zip(temp_paths, files):
+        os.replace(temp_path, path)
+
+
+def write_geojson_snapshot(name=GEOJSON_SNAPSHOT_NAME):
+    # Tulis <name> dan <name>.gz di MEDIA_ROOT; kembalikan jumlah fitur
+    features = list(geojson_features())
+    data = json.dumps(
+        {'type': 'FeatureCollection', 'features': features},
+        ensure_ascii=False, separators=(',', ':'),
+    ).encode()
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # File biasa diganti lebih dulu, lalu .gz; mtime=0: isi .gz hanya bergantung pada data
+    _write_atomic([
+        (path, data),
+        (f'{path}.gz', gzip.compress(data, compresslevel=9, mtime=0)),
+    ])
+    return len(features)
+
+
+class SnapshotRefresher:
+    # Tulis ulang snapshot di thread latar; perubahan beruntun digabung jadi satu
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._executor = None
+
+    def schedule(self):
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='geojson-snapshot')
+        self._executor.submit(self._refresh)
+
+    def _refresh(self):
+        # Tanda dilepas sebelum menulis: perubahan selama penulisan menjadwalkan ulang
+        with self._lock:
+            self._scheduled = False
+        try:
+            write_geojson_snapshot()
+        except Exception:
+            logger.exception('GeoJSON snapshot refresh failed')
+        finally:
+            close_old_connections()
+
+
+snapshot_refresher = SnapshotRefresher()
+
+
+def request_snapshot_refresh(using='default'):
+    # Dipanggil setelah perubahan katalog; snapshot ditulis setelah transaksi commit
+    if getattr(settings, 'GEOJSON_SNAPSHOT_AUTO_REFRESH', False):
+        transaction.on_commit(snapshot_refresher.schedule, using=using)
@@ -0,0 +1,188 @@
+# Penyajian file upload (MEDIA_ROOT) untuk production, setara WhiteNoise
+# untuk file statis:
+# - FileResponse penuh memakai wsgi.file_wrapper (sendfile di gunicorn/uwsgi);
+# - ETag/Last-Modified dari stat file, dijawab 304 untuk If-None-Match /
+#   If-Modified-Since;
+# - Range satu rentang byte (206/416), If-Range dihormati;
+# - varian .br/.gz di samping file dipakai jika klien menerimanya;
+# - nama ber-hash konten (upload lewat HashedMediaStorage dan turunan gambar
+#   di derivatives/<hash>/) dilayani dengan Cache-Control immutable.
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .images import DERIVATIVE_ROOT
+from .storage import HASHED_NAME_RE
+
+# Varian terkompresi yang dicari, urut prioritas: (Content-Encoding, akhiran)
+ENCODINGS = (
+    ('br', '.br'),
+    ('gzip', '.gz'),
+)
+
+# Turunan gambar: derivatives/<2 hex>/<hash 16 hex>/<lebar>w.<ext>
+DERIVATIVE_RE = re.compile(rf'^{DERIVATIVE_ROOT}/[0-9a-f]{{2}}/[0-9a-f]{{16}}/')
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+CHUNK_SIZE = 64 * 1024
+
+
+def is_immutable(path):
+    return bool(HASHED_NAME_RE.search(path) or DERIVATIVE_RE.match(path))
+
+
+def cache_control(path):
+    if is_immutable(path):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={getattr(settings, "MEDIA_CACHE_MAX_AGE", 60 * 60)}'
+
+
+def _stat_file(full_path):
+    try:
+        info = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return info if stat.S_ISREG(info.st_mode) else None
+
+
+def _etag(info, encoding=None):
+    # Validator murah dari stat (ukuran + mtime); berbeda per varian encoding
+    suffix = f'-{encoding}' if encoding else ''
+    return f'"{info.st_size:x}-{info.st_mtime_ns:x}{suffix}"'
+
+
+def _select_variant(request, full_path):
+    # Varian terkompresi pertama yang diterima klien dan ada di disk
+    accepted = request.headers.get('Accept-Encoding', '')
+    variants = False
+    for encoding, suffix in ENCODINGS:
+        info = _stat_file(full_path + suffix)
+        if info is None:
+            continue
+        variants = True
+        if re.search(rf'\b{encoding}\b', accepted):
+            return full_path + suffix, info, encoding, True
+    return full_path, None, None, variants
+
+
+def parse_range(header, size):
+    # (start, end) inklusif untuk satu rentang "bytes=a-b", None jika header
+    # tidak dikenali (kirim file penuh), atau ValueError jika di luar file
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            raise ValueError(header)
+    else:
+        # "bytes=-N": N byte terakhir
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        start, end = max(0, size - length), size - 1
+    return start, end
+
+
+def _range_allowed(request, etag, info):
+    # If-Range: rentang hanya dipakai jika file tidak berubah sejak itu
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    modified = parse_http_date_safe(if_range)
+    return modified is not None and int(info.st_mtime) <= modified
+
+
+def _iter_range(handle, start, length):
+    try:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def serve_media(request, path):
+    # View untuk MEDIA_URL<path>; hanya GET/HEAD
+    if request.method not in ('GET', 'HEAD'):
+        response = HttpResponse(status=405)
+        response['Allow'] = 'GET, HEAD'
+        return response
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Not found')
+    info = _stat_file(full_path)
+    if info is None:
+        raise Http404('Not found')
+
+    served_path, variant_info, encoding, has_variants = _select_variant(request, full_path)
+    if variant_info is not None:
+        info = variant_info
+    etag = _etag(info, encoding)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(info.st_mtime),
+        'Cache-Control': cache_control(path),
+    }
+    if has_variants:
+        headers['Vary'] = 'Accept-Encoding'
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(info.st_mtime))
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    size = info.st_size
+    byte_range = None
+    # Rentang hanya untuk file asli; varian terkompresi selalu dikirim utuh
+    if encoding is None and request.headers.get('Range') and _range_allowed(request, etag, info):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+    handle = open(served_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(handle, content_type=content_type)
+        response['Content-Length'] = str(size)
+        # FileResponse menambah nama file (bisa nama varian .br/.gz); tidak perlu
+        response.headers.pop('Content-Disposition', None)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_range(handle, start, end - start + 1), status=206, content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    if encoding is None:
+        response['Accept-Ranges'] = 'bytes'
+    else:
+        response['Content-Encoding'] = encoding
+    for header, value in headers.items():
+        response[header] = value
+    return response
@@ -0,0 +1,43 @@
+# Tabel virtual FTS5 untuk pencarian destinasi (hanya SQLite).
+
+from django.db import OperationalError, migrations
+
+FTS_TABLE = 'core_destination_fts'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, description, additional_info, district, category, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite tanpa FTS5: pencarian memakai fallback icontains
+        return
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, description, additional_info, district, category) "
+        "SELECT d.id, d.name, d.description, COALESCE(d.additional_info, ''), "
+        "COALESCE(di.name, ''), COALESCE(c.name, '') "
+        "FROM core_destination d "
+        "LEFT JOIN core_district di ON di.id = d.district_id "
+        "LEFT JOIN core_category c ON c.id = d.category_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_alter_destination_maps_embed_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_destination_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['created_at', 'id'], name='dest_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='dest_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['district', 'created_at', 'id'], name='dest_dist_created_idx'),
+        ),
+    ]
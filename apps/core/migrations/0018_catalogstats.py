@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_destination_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destination_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Destinasi')),
+                ('category_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Kategori')),
+                ('district_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Kecamatan')),
+                ('user_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Pengguna')),
+                ('total_views', models.BigIntegerField(default=0, verbose_name='Total Tayangan')),
+                ('top_destinations', models.JSONField(blank=True, default=list, verbose_name='Destinasi Terpopuler')),
+                ('recent_destinations', models.JSONField(blank=True, default=list, verbose_name='Destinasi Terbaru')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Diperbarui Pada')),
+            ],
+            options={
+                'verbose_name': 'Statistik Katalog',
+                'verbose_name_plural': 'Statistik Katalog',
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Isi baris CatalogStats sekali saat migrasi, agar request pertama tidak
+# menanggung hitung ulang penuh (7+ query) di dalam request.
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import F, Sum
+
+
+def populate_catalog_stats(apps, schema_editor):
+    CatalogStats = apps.get_model('core', 'CatalogStats')
+    Destination = apps.get_model('core', 'Destination')
+    Category = apps.get_model('core', 'Category')
+    District = apps.get_model('core', 'District')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+    def entries(ordering, limit):
+        rows = Destination.objects.order_by(*ordering).values(
+            'id', 'name', 'slug', 'main_image', 'view_count', 'created_at', 'category_id', 'district_id',
+            category_name=F('category__name'), district_name=F('district__name'),
+        )[:limit]
+        return [dict(row, created_at=row['created_at'].isoformat()) for row in rows]
+
+    CatalogStats.objects.update_or_create(pk=1, defaults={
+        'destination_count': Destination.objects.count(),
+        'category_count': Category.objects.count(),
+        'district_count': District.objects.count(),
+        'user_count': User.objects.count(),
+        'total_views': Destination.objects.aggregate(total=Sum('view_count'))['total'] or 0,
+        'top_destinations': entries(('-view_count', '-id'), getattr(settings, 'CATALOG_STATS_TOP_SIZE', 5)),
+        'recent_destinations': entries(('-created_at', '-id'), getattr(settings, 'CATALOG_STATS_RECENT_SIZE', 5)),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_catalogstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_catalog_stats, migrations.RunPython.noop),
+    ]
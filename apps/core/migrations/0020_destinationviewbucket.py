@@ -0,0 +1,33 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_populate_catalogstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DestinationViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Per Jam'), ('day', 'Per Hari')], max_length=4, verbose_name='Periode')),
+                ('bucket_start', models.DateTimeField(verbose_name='Awal Periode')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Tayangan')),
+                ('destination', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='core.destination', verbose_name='Destinasi')),
+            ],
+            options={
+                'verbose_name': 'Bucket Tayangan',
+                'verbose_name_plural': 'Bucket Tayangan',
+                'indexes': [
+                    models.Index(fields=['bucket_start', 'destination', 'views'], name='view_bucket_range_idx'),
+                    models.Index(fields=['granularity', 'bucket_start'], name='view_bucket_rollup_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('destination', 'granularity', 'bucket_start'), name='view_bucket_unique'),
+                ],
+            },
+        ),
+    ]
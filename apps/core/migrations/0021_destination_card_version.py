@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_destinationviewbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destination',
+            name='card_version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Versi Kartu'),
+        ),
+    ]
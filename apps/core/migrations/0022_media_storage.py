@@ -0,0 +1,27 @@
+import apps.core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_destination_card_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='destination',
+            name='main_image',
+            field=models.ImageField(storage=apps.core.storage.media_storage, upload_to='destinations/primary/', verbose_name='Foto Utama (Hero)'),
+        ),
+        migrations.AlterField(
+            model_name='destinationgallery',
+            name='image',
+            field=models.ImageField(storage=apps.core.storage.media_storage, upload_to='destinations/gallery/'),
+        ),
+        migrations.AlterField(
+            model_name='district',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, storage=apps.core.storage.media_storage, upload_to='districts/', verbose_name='Gambar Thumbnail'),
+        ),
+    ]
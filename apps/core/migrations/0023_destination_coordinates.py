@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_media_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destination',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Lintang'),
+        ),
+        migrations.AddField(
+            model_name='destination',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bujur'),
+        ),
+        migrations.AddField(
+            model_name='destination',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['geohash'], name='dest_geohash_idx'),
+        ),
+    ]
@@ -1,6 +1,19 @@
+import re
+
 from django.db import models
-from django.utils.text import slugify
 from django.conf import settings
+from .geo import coordinate_fields
+from .slugs import save_with_unique_slug
+from .storage import media_storage
+
+
+def extract_maps_embed_url(value):
+    # Jika admin menempel kode <iframe> Google Maps, ambil konten src="..."
+    if value and '<iframe' in value:
+        match = re.search(r'src="([^"]+)"', value)
+        if match:
+            return match.group(1)
+    return value
 
 
 # --- 1. Model Kecamatan (Entitas Baru) ---
@@ -9,12 +22,11 @@ class District(models.Model):
     name = models.CharField(max_length=100, unique=True, verbose_name="Nama Kecamatan")
     slug = models.SlugField(max_length=150, unique=True, blank=True)
     description = models.TextField(blank=True, null=True, verbose_name="Deskripsi")
-    thumbnail = models.ImageField(upload_to='districts/', blank=True, null=True, verbose_name="Gambar Thumbnail")
+    thumbnail = models.ImageField(upload_to='districts/', storage=media_storage, blank=True, null=True, verbose_name="Gambar Thumbnail")
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        # Slug otomatis dari nama, unik walau nama berbeda menghasilkan slug sama
+        save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -41,17 +53,8 @@ class Category(models.Model):
     
     def save(self, *args, **kwargs):
         self.full_clean()  # Validasi sebelum simpan
-        # Override save untuk buat slug otomatis
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            # Cek duplikasi slug
-            while Category.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        # Override save untuk buat slug otomatis (satu query per alokasi)
+        save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
     
     def __str__(self):
         # Representasi string model
@@ -81,10 +84,15 @@ class Destination(models.Model):
     )
 
     maps_embed_url = models.CharField(max_length=300, blank=True, default='', verbose_name="URL Google Maps")
+    # Koordinat diambil dari maps_embed_url saat save (lihat geo.py);
+    # geohash = sel grid untuk pencarian destinasi terdekat
+    latitude = models.FloatField(null=True, blank=True, editable=False, verbose_name="Lintang")
+    longitude = models.FloatField(null=True, blank=True, editable=False, verbose_name="Bujur")
+    geohash = models.CharField(max_length=12, blank=True, default='', editable=False, verbose_name="Geohash")
     additional_info = models.TextField(blank=True, null=True, verbose_name="Info Tambahan")
     
     # Aset foto
-    main_image = models.ImageField(upload_to='destinations/primary/', verbose_name="Foto Utama (Hero)")
+    main_image = models.ImageField(upload_to='destinations/primary/', storage=media_storage, verbose_name="Foto Utama (Hero)")
     
 
     
@@ -113,29 +121,28 @@ class Destination(models.Model):
     # Penghitung tayangan (Integer sederhana)
     view_count = models.IntegerField(default=0, verbose_name="Total Dilihat")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Dibuat Pada")
+    # Versi fragmen kartu (cache HTML), dinaikkan setiap destinasi atau
+    # kategori/kecamatannya disimpan (lihat cards.py)
+    card_version = models.PositiveIntegerField(default=1, editable=False, verbose_name="Versi Kartu")
 
     def save(self, *args, **kwargs):
         self.full_clean()
         
-        # 1. Buat Slug otomatis
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Destination.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-            
-        # 2. Konversi Link Google Maps ke Embed URL
-        if self.maps_embed_url and '<iframe' in self.maps_embed_url:
-            import re
-            # Ambil konten src="..."
-            match = re.search(r'src="([^"]+)"', self.maps_embed_url)
-            if match:
-                self.maps_embed_url = match.group(1)
-                
-        super().save(*args, **kwargs)
+        # 1. Konversi Link Google Maps ke Embed URL, lalu ambil koordinatnya
+        self.maps_embed_url = extract_maps_embed_url(self.maps_embed_url)
+        for field, value in coordinate_fields(self.maps_embed_url).items():
+            setattr(self, field, value)
+
+        # 2. Naikkan versi kartu di database (F, bukan nilai instance) agar
+        #    instance lama yang disimpan ulang tidak memakai versi yang sudah ada
+        bump_card = not self._state.adding
+        if bump_card:
+            self.card_version = models.F('card_version') + 1
+
+        # 3. Buat Slug otomatis (satu query per alokasi, retry jika bentrok)
+        save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
+        if bump_card:
+            self.refresh_from_db(using=self._state.db, fields=['card_version'])
 
     def __str__(self):
         # Representasi string nama destinasi
@@ -145,13 +152,21 @@ class Destination(models.Model):
         verbose_name_plural = "Destinasi"
         verbose_name = "Destinasi"
         ordering = ['-created_at']
+        # Index untuk paginasi cursor (created_at, id), global & per kategori/kecamatan
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='dest_created_id_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='dest_cat_created_idx'),
+            models.Index(fields=['district', 'created_at', 'id'], name='dest_dist_created_idx'),
+            # Pencarian sekitar: rentang awalan geohash (maps.py)
+            models.Index(fields=['geohash'], name='dest_geohash_idx'),
+        ]
 
 
 # --- 2. Galeri Destinasi (Entitas Baru) ---
 class DestinationGallery(models.Model):
     # Model menyimpan galeri foto tak terbatas untuk destinasi.
     destination = models.ForeignKey(Destination, related_name='images', on_delete=models.CASCADE)
-    image = models.ImageField(upload_to='destinations/gallery/')
+    image = models.ImageField(upload_to='destinations/gallery/', storage=media_storage)
     caption = models.CharField(max_length=200, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -160,3 +175,61 @@ class DestinationGallery(models.Model):
         verbose_name_plural = "Gambar Galeri"
 
 
+
+
+# --- 3. Statistik Katalog (Read Model) ---
+class CatalogStats(models.Model):
+    # Satu baris ringkasan katalog untuk dashboard admin & homepage.
+    # Dijaga secara inkremental oleh signal & buffer tayangan (lihat stats.py),
+    # dan bisa dibangun ulang penuh dengan command rebuild_stats.
+    destination_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah Destinasi")
+    category_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah Kategori")
+    district_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah Kecamatan")
+    user_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah Pengguna")
+    total_views = models.BigIntegerField(default=0, verbose_name="Total Tayangan")
+    # Daftar ringkas destinasi (id, nama, slug, gambar, tayangan, dll.)
+    top_destinations = models.JSONField(default=list, blank=True, verbose_name="Destinasi Terpopuler")
+    recent_destinations = models.JSONField(default=list, blank=True, verbose_name="Destinasi Terbaru")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Diperbarui Pada")
+
+    def __str__(self):
+        return f"Statistik katalog ({self.updated_at:%Y-%m-%d %H:%M})" if self.updated_at else "Statistik katalog"
+
+    class Meta:
+        verbose_name = "Statistik Katalog"
+        verbose_name_plural = "Statistik Katalog"
+
+
+# --- 4. Analitik Tayangan per Periode ---
+class DestinationViewBucket(models.Model):
+    # Jumlah tayangan satu destinasi dalam satu periode (per jam atau per hari).
+    # Baris di-upsert per batch dari buffer tayangan; bucket per jam yang sudah
+    # lama digabung ke bucket harian oleh command rollup_view_analytics.
+    HOUR = 'hour'
+    DAY = 'day'
+    GRANULARITY_CHOICES = [
+        (HOUR, 'Per Jam'),
+        (DAY, 'Per Hari'),
+    ]
+
+    destination = models.ForeignKey(Destination, related_name='view_buckets', on_delete=models.CASCADE, verbose_name="Destinasi")
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES, verbose_name="Periode")
+    bucket_start = models.DateTimeField(verbose_name="Awal Periode")
+    views = models.PositiveIntegerField(default=0, verbose_name="Tayangan")
+
+    def __str__(self):
+        return f"{self.destination_id} @ {self.bucket_start:%Y-%m-%d %H:%M} ({self.granularity}): {self.views}"
+
+    class Meta:
+        verbose_name = "Bucket Tayangan"
+        verbose_name_plural = "Bucket Tayangan"
+        constraints = [
+            models.UniqueConstraint(fields=['destination', 'granularity', 'bucket_start'], name='view_bucket_unique'),
+        ]
+        indexes = [
+            # Index covering untuk "top destinasi dalam rentang tanggal":
+            # filter bucket_start, group destination, sum views tanpa baca tabel
+            models.Index(fields=['bucket_start', 'destination', 'views'], name='view_bucket_range_idx'),
+            # Rollup: cari bucket per jam yang sudah melewati batas umur
+            models.Index(fields=['granularity', 'bucket_start'], name='view_bucket_rollup_idx'),
+        ]
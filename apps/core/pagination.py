@@ -0,0 +1,174 @@
+# Paginasi katalog destinasi: mode offset (default) atau mode cursor (keyset).
+# Mode cursor memakai kunci (created_at, id) sehingga halaman ke-1000 sama
+# murahnya dengan halaman pertama, tanpa COUNT(*) dan tanpa OFFSET scan.
+# Jumlah total hanya berupa estimasi yang di-cache per versi katalog.
+import hashlib
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from django.http import Http404
+
+from .cache import get_catalog_version
+
+CURSOR_SALT = 'core.pagination.cursor'
+
+
+def _position(row):
+    # Posisi (created_at, id) dari instance model atau baris values()
+    if isinstance(row, dict):
+        return row['created_at'], row['id']
+    return row.created_at, row.pk
+
+
+def encode_cursor(obj, direction):
+    # Token cursor opak (ditandatangani) dari posisi (created_at, id)
+    created_at, pk = _position(obj)
+    return signing.dumps([created_at.isoformat(), pk, direction], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    # Kembalikan (created_at, id, direction) atau None jika token tidak valid
+    try:
+        created_at, pk, direction = signing.loads(token, salt=CURSOR_SALT)
+        return datetime.fromisoformat(created_at), int(pk), direction
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+
+
+class CursorPage:
+    # Satu halaman hasil paginasi cursor; antarmukanya mirip Page Django
+    # (has_next, has_previous, has_other_pages) ditambah token cursor.
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def paginate_by_cursor(queryset, per_page, token=None):
+    # Ambil satu halaman berurutan (-created_at, -id) dimulai dari token cursor.
+    # Queryset boleh berupa values(), asalkan kolom created_at & id ikut dipilih.
+    position = decode_cursor(token) if token else None
+    if position is None:
+        rows = list(queryset.order_by('-created_at', '-id')[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        return CursorPage(rows, next_cursor=encode_cursor(rows[-1], 'n') if has_more else None)
+
+    created_at, pk, direction = position
+    if direction == 'p':
+        # Mundur: ambil baris yang lebih baru, urutan naik, lalu balik
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            .order_by('created_at', 'id')[:per_page + 1]
+        )
+        has_more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        if not rows:
+            return paginate_by_cursor(queryset, per_page)
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1], 'n'),
+            previous_cursor=encode_cursor(rows[0], 'p') if has_more else None,
+        )
+
+    rows = list(
+        queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        .order_by('-created_at', '-id')[:per_page + 1]
+    )
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not rows:
+        return CursorPage(rows)
+    return CursorPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1], 'n') if has_more else None,
+        previous_cursor=encode_cursor(rows[0], 'p'),
+    )
+
+
+def estimated_count(queryset):
+    # Jumlah baris dari cache (per versi katalog + query); COUNT hanya saat miss
+    query_hash = hashlib.md5(str(queryset.query).encode()).hexdigest()
+    key = f'catalog:count:{get_catalog_version()}:{query_hash}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, getattr(settings, 'CATALOG_COUNT_CACHE_TIMEOUT', 60 * 10))
+    return count
+
+
+class CatalogPaginationMixin:
+    # Paginasi bersama untuk daftar destinasi (list, kategori, kecamatan).
+    # Mode cursor aktif jika CATALOG_CURSOR_PAGINATION = True, kecuali
+    # use_cursor_pagination() dimatikan oleh view (mis. hasil pencarian
+    # yang diurutkan berdasarkan relevansi).
+
+    def use_cursor_pagination(self):
+        return getattr(settings, 'CATALOG_CURSOR_PAGINATION', False)
+
+    def paginate_catalog(self, queryset, page_size):
+        # Kembalikan (paginator, page, object_list, is_paginated) seperti ListView
+        if self.use_cursor_pagination():
+            page = paginate_by_cursor(queryset, page_size, self.request.GET.get('cursor'))
+            return (None, page, page.object_list, page.has_other_pages())
+
+        paginator = Paginator(queryset, page_size, allow_empty_first_page=True)
+        page_number = self.request.GET.get('page') or 1
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise Http404(f"Invalid page ({page_number}): {exc}")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_catalog(self, queryset, page_size):
+        # Versi async paginate_catalog() untuk view ASGI. COUNT lewat acount()
+        # dan baris halaman lewat async for; object_list sudah berupa list.
+        if self.use_cursor_pagination():
+            page = await sync_to_async(paginate_by_cursor)(queryset, page_size, self.request.GET.get('cursor'))
+            return (None, page, page.object_list, page.has_other_pages())
+
+        paginator = Paginator(queryset, page_size, allow_empty_first_page=True)
+        # count adalah cached_property: diisi dulu agar page() tidak COUNT sinkron
+        paginator.count = await queryset.acount()
+        page_number = self.request.GET.get('page') or 1
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise Http404(f"Invalid page ({page_number}): {exc}")
+        page.object_list = [obj async for obj in page.object_list]
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def paginate_queryset(self, queryset, page_size):
+        # Hook ListView
+        return self.paginate_catalog(queryset, page_size)
+
+    def get_result_count(self, queryset, paginator):
+        # Total hasil untuk ditampilkan: pasti (offset) atau estimasi (cursor)
+        if paginator is not None:
+            return paginator.count
+        return estimated_count(queryset)
@@ -0,0 +1,145 @@
+# Router database primary/replika.
+# Semua tulisan ke 'default' (primary). Bacaan ke replika hanya untuk view
+# publik yang ditandai @replica_reads (daftar destinasi, kategori, kecamatan,
+# homepage, surprise), dan hanya selama request itu. Setelah request tulis
+# (POST dari admin, dll.) browser diberi cookie singkat sehingga bacaan
+# berikutnya tetap ke primary (read-your-writes) sampai replika tersusul.
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PRIMARY = 'default'
+
+# App yang selalu dibaca dari primary (sesi & login tidak boleh tertinggal replika)
+PRIMARY_ONLY_APPS = ('admin', 'auth', 'contenttypes', 'sessions')
+
+# Model yang selalu dibaca dari primary: baris CatalogStats disimpan di cache
+# bersama (catalog:stats) yang juga dipakai admin, jadi tidak boleh diisi dari replika lama
+PRIMARY_ONLY_MODELS = ('core.catalogstats',)
+
+# Cookie penanda "baca dari primary sampai waktu ini" (epoch detik)
+STICKY_COOKIE = 'db_primary_until'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class RoutingState:
+    # Keputusan routing untuk satu request; disimpan di ContextVar
+    def __init__(self, replica=None):
+        self.replica = replica
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def replica_reads(view):
+    # Tandai view (fungsi atau class) boleh membaca dari replika
+    view.replica_reads = True
+    return view
+
+
+def _allows_replica(view_func):
+    view_class = getattr(view_func, 'view_class', None)
+    return getattr(view_func, 'replica_reads', False) or getattr(view_class, 'replica_reads', False)
+
+
+def _is_sticky(request):
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None or state.replica is None
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or model._meta.label_lower in PRIMARY_ONLY_MODELS
+        ):
+            return PRIMARY
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary & replika berisi data yang sama
+        databases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replika disalin dari primary (sync_replicas), tidak dimigrasi sendiri
+        return False if db in replica_aliases() else None
+
+
+class ReplicaRoutingMiddleware:
+    # Pasang RoutingState per request: replika dipilih sekali per request
+    # (bacaan konsisten), hanya untuk GET/HEAD ke view @replica_reads dan
+    # jika cookie read-your-writes tidak aktif.
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            request._db_routing = state
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.mark_sticky(request, response, state)
+
+    async def __acall__(self, request):
+        # ContextVar ikut tersalin ke thread ORM async (sync_to_async)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            request._db_routing = state
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.mark_sticky(request, response, state)
+
+    def mark_sticky(self, request, response, state):
+        if state.wrote and request.method not in SAFE_METHODS:
+            seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+            response.set_cookie(
+                STICKY_COOKIE, f'{time.time() + seconds:.0f}', max_age=seconds,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replicas = replica_aliases()
+        if (
+            replicas
+            and request.method in SAFE_METHODS
+            and _allows_replica(view_func)
+            and not _is_sticky(request)
+        ):
+            request._db_routing.replica = random.choice(replicas)
+        return None
@@ -0,0 +1,151 @@
+# Mesin sampling acak untuk fitur 'Surprise Me'.
+# Id destinasi (dan bobot popularitas) disimpan di memori proses per versi
+# katalog, lalu K id diambil secara acak dan di-probe ke database dalam satu
+# query IN. Biaya per request O(K), bukan ORDER BY RANDOM() atau memuat
+# seluruh tabel.
+import random
+import threading
+import time
+from array import array
+from itertools import accumulate
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .cache import get_catalog_version
+from .models import Destination
+
+# Field yang dikirim ke animasi surprise
+SAMPLE_FIELDS = ('name', 'district__name', 'main_image', 'slug')
+
+# Batas percobaan probe ulang jika id di cache sudah terhapus
+MAX_PROBE_ROUNDS = 3
+
+# Batas putaran pengambilan id unik dalam satu probe
+MAX_DRAW_ROUNDS = 10
+
+_lock = threading.Lock()
+_snapshot = {'version': None, 'built_at': 0.0, 'ids': array('q'), 'cum_weights': array('q')}
+
+
+def _cached_snapshot(version):
+    # Snapshot di memori jika masih sesuai versi katalog & TTL, selain itu None
+    ttl = getattr(settings, 'SURPRISE_ID_CACHE_TTL', 300)
+    with _lock:
+        if _snapshot['version'] == version and time.monotonic() - _snapshot['built_at'] < ttl:
+            return _snapshot['ids'], _snapshot['cum_weights']
+    return None
+
+
+def _build_snapshot(version):
+    rows = Destination.objects.order_by().values_list('id', 'view_count')
+    ids = array('q')
+    weights = []
+    for pk, views in rows.iterator(chunk_size=5000):
+        ids.append(pk)
+        # +1 supaya destinasi tanpa views tetap punya peluang
+        weights.append(max(views, 0) + 1)
+    cum_weights = array('q', accumulate(weights))
+
+    with _lock:
+        _snapshot.update(version=version, built_at=time.monotonic(), ids=ids, cum_weights=cum_weights)
+    return ids, cum_weights
+
+
+def _load_snapshot():
+    # Ambil array id + bobot kumulatif; dibangun ulang jika versi katalog
+    # berubah atau umur snapshot melewati TTL (bobot views ikut segar).
+    version = get_catalog_version()
+    return _cached_snapshot(version) or _build_snapshot(version)
+
+
+def reset_snapshot():
+    # Paksa pembangunan ulang snapshot pada request berikutnya
+    with _lock:
+        _snapshot.update(version=None, built_at=0.0, ids=array('q'), cum_weights=array('q'))
+
+
+def _draw_ids(ids, cum_weights, k, weighted, exclude):
+    # Ambil hingga k id unik secara acak, tanpa id di 'exclude'
+    available = len(ids) - len(exclude)
+    k = min(k, available)
+    if k <= 0:
+        return []
+    # Jika k mendekati ukuran katalog, sampling langsung dari seluruh pool
+    # lebih efisien daripada probing berulang (katalog kecil)
+    if k * 2 >= available:
+        if not weighted:
+            pool = [pk for pk in ids if pk not in exclude]
+            return random.sample(pool, k)
+        # Weighted sampling tanpa pengembalian (Efraimidis-Spirakis)
+        keyed = []
+        previous = 0
+        for pk, cum in zip(ids, cum_weights):
+            weight = cum - previous
+            previous = cum
+            if pk not in exclude:
+                keyed.append((random.random() ** (1.0 / weight), pk))
+        keyed.sort(reverse=True)
+        return [pk for _, pk in keyed[:k]]
+    picked = set()
+    # Batasi putaran; dengan bobot sangat timpang hasil boleh kurang dari k
+    for _ in range(MAX_DRAW_ROUNDS):
+        need = k - len(picked)
+        if need <= 0:
+            break
+        if weighted:
+            batch = random.choices(ids, cum_weights=cum_weights, k=need)
+        else:
+            batch = [ids[random.randrange(len(ids))] for _ in range(need)]
+        picked.update(pk for pk in batch if pk not in exclude)
+    return list(picked)[:k]
+
+
+def _probe_query(draw):
+    return Destination.objects.filter(pk__in=draw).order_by().values('pk', *SAMPLE_FIELDS)
+
+
+def _collect(rows, draw, results):
+    # Tambahkan baris hasil probe ke results dengan urutan sesuai draw
+    by_pk = {row.pop('pk'): row for row in rows}
+    results.extend(by_pk[pk] for pk in draw if pk in by_pk)
+
+
+def sample_destinations(k, weighted=False):
+    # Kembalikan hingga k destinasi acak sebagai dict (lihat SAMPLE_FIELDS).
+    # weighted=True: peluang terpilih sebanding dengan view_count.
+    ids, cum_weights = _load_snapshot()
+    results = []
+    seen = set()
+    for _ in range(MAX_PROBE_ROUNDS):
+        draw = _draw_ids(ids, cum_weights, k - len(results), weighted, seen)
+        if not draw:
+            break
+        seen.update(draw)
+        _collect(_probe_query(draw), draw, results)
+        if len(results) >= k:
+            break
+    random.shuffle(results)
+    return results
+
+
+async def asample_destinations(k, weighted=False):
+    # Versi async untuk view ASGI: snapshot di memori dipakai langsung,
+    # probe lewat ORM async; hanya pembangunan snapshot yang masuk thread.
+    version = get_catalog_version()
+    snapshot = _cached_snapshot(version)
+    if snapshot is None:
+        snapshot = await sync_to_async(_build_snapshot)(version)
+    ids, cum_weights = snapshot
+    results = []
+    seen = set()
+    for _ in range(MAX_PROBE_ROUNDS):
+        draw = _draw_ids(ids, cum_weights, k - len(results), weighted, seen)
+        if not draw:
+            break
+        seen.update(draw)
+        _collect([row async for row in _probe_query(draw)], draw, results)
+        if len(results) >= k:
+            break
+    random.shuffle(results)
+    return results
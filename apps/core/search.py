@@ -0,0 +1,162 @@
+# Indeks pencarian full-text destinasi berbasis SQLite FTS5.
+# Tabel virtual menyimpan salinan teks (nama, deskripsi, info tambahan,
+# nama kecamatan & kategori) dengan rowid = id destinasi. Hasil pencarian
+# diurutkan dengan BM25. Pada backend tanpa FTS5, pencarian kembali ke
+# filter icontains seperti sebelumnya.
+import re
+
+from django.db import OperationalError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'core_destination_fts'
+
+# Bobot BM25 per kolom: name, description, additional_info, district, category
+BM25_WEIGHTS = (10.0, 1.0, 1.0, 4.0, 4.0)
+
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, description, additional_info, district, category, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+_SELECT_DOCUMENTS_SQL = (
+    "SELECT d.id, d.name, d.description, COALESCE(d.additional_info, ''), "
+    "COALESCE(di.name, ''), COALESCE(c.name, '') "
+    "FROM core_destination d "
+    "LEFT JOIN core_district di ON di.id = d.district_id "
+    "LEFT JOIN core_category c ON c.id = d.category_id"
+)
+
+# Jumlah id per statement saat memperbarui indeks (batas variabel SQLite)
+INDEX_CHUNK_SIZE = 400
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Alias database yang sudah terbukti punya tabel FTS
+_available_aliases = set()
+
+
+def fts_available(using='default'):
+    # Cek apakah tabel FTS5 tersedia di database ini
+    if using in _available_aliases:
+        return True
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+        )
+        found = cursor.fetchone() is not None
+    if found:
+        _available_aliases.add(using)
+    return found
+
+
+def build_match_query(text):
+    # Ubah input pengguna jadi query MATCH FTS5: setiap kata jadi prefix
+    # ("sengg"*) dan semua kata wajib ada (AND implisit).
+    tokens = _TOKEN_RE.findall(text.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_destinations(queryset, text, using=None):
+    # Terapkan pencarian ke queryset Destination, urut berdasarkan relevansi.
+    # Tabel FTS dicek di database tempat queryset dibaca (bisa replika).
+    match = build_match_query(text)
+    if not match or not fts_available(using or queryset.db):
+        return queryset.filter(
+            Q(name__icontains=text) |
+            Q(description__icontains=text) |
+            Q(district__name__icontains=text)
+        )
+    # Filter MATCH lewat subquery rowid; peringkat BM25 lewat subquery yang
+    # dimaterialisasi sekali per query (LIMIT -1 mencegah SQLite meratakannya
+    # menjadi MATCH per baris). Queryset tetap bisa dirangkai dengan
+    # select_related, filter lain dan paginasi.
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    opts = queryset.model._meta
+    rank = RawSQL(
+        f'SELECT ranked.score FROM ('
+        f'SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s LIMIT -1'
+        f') ranked WHERE ranked.id = {opts.db_table}.{opts.pk.column}',
+        [match],
+    )
+    return (
+        queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
+        .annotate(search_rank=rank)
+        .order_by('search_rank')
+    )
+
+
+def _reindex(where='', params=(), using='default'):
+    # Tulis ulang dokumen FTS untuk destinasi yang cocok dengan klausa WHERE
+    if not fts_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        if where:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT d.id FROM core_destination d WHERE {where})",
+                params,
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, additional_info, district, category) "
+                f"{_SELECT_DOCUMENTS_SQL} WHERE {where}",
+                params,
+            )
+        else:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, additional_info, district, category) "
+                f"{_SELECT_DOCUMENTS_SQL}"
+            )
+
+
+def index_destinations(pks, using='default'):
+    # Perbarui dokumen indeks untuk daftar id destinasi
+    pks = list(pks)
+    for start in range(0, len(pks), INDEX_CHUNK_SIZE):
+        chunk = pks[start:start + INDEX_CHUNK_SIZE]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        _reindex(f'd.id IN ({placeholders})', chunk, using=using)
+
+
+def index_district(district_id, using='default'):
+    # Perbarui semua destinasi dalam satu kecamatan (mis. nama kecamatan berubah)
+    _reindex('d.district_id = %s', [district_id], using=using)
+
+
+def index_category(category_id, using='default'):
+    # Perbarui semua destinasi dalam satu kategori
+    _reindex('d.category_id = %s', [category_id], using=using)
+
+
+def remove_destinations(pks, using='default'):
+    # Hapus dokumen destinasi dari indeks
+    pks = list(pks)
+    if not pks or not fts_available(using):
+        return
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", pks)
+
+
+def rebuild_index(using='default'):
+    # Bangun ulang seluruh indeks dari tabel destinasi; buat tabel jika belum ada.
+    # Mengembalikan jumlah dokumen, atau None jika FTS5 tidak didukung.
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_FTS_SQL)
+    except OperationalError:
+        # SQLite dikompilasi tanpa FTS5
+        return None
+    _available_aliases.add(using)
+    _reindex(using=using)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
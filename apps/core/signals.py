@@ -0,0 +1,169 @@
+# Signal handler untuk menjaga cache katalog, indeks pencarian, gambar turunan dan statistik tetap sinkron.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from . import maps, search, stats
+from .cache import bump_catalog_version
+from .cards import invalidate_related_cards
+from .db import configure_connection
+from .images import get_derivatives
+from .models import Category, Destination, DestinationGallery, District
+
+CATALOG_MODELS = (Destination, Category, District, DestinationGallery)
+
+
+def invalidate_catalog_cache(sender, **kwargs):
+    # Setiap perubahan konten katalog menaikkan versi cache halaman publik
+    bump_catalog_version()
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'catalog_save_{model.__name__}')
+    post_delete.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'catalog_delete_{model.__name__}')
+
+
+# --- Sinkronisasi indeks pencarian ---
+
+def index_saved_destination(sender, instance, raw=False, using='default', **kwargs):
+    if not raw:
+        search.index_destinations([instance.pk], using=using)
+
+
+def unindex_deleted_destination(sender, instance, using='default', **kwargs):
+    search.remove_destinations([instance.pk], using=using)
+
+
+def index_saved_district(sender, instance, raw=False, using='default', **kwargs):
+    # Nama kecamatan ikut diindeks, jadi destinasinya perlu diperbarui
+    if not raw:
+        search.index_district(instance.pk, using=using)
+
+
+def index_saved_category(sender, instance, raw=False, using='default', **kwargs):
+    if not raw:
+        search.index_category(instance.pk, using=using)
+
+
+def remember_related_destinations(sender, instance, **kwargs):
+    # Catat destinasi terkait sebelum FK di-SET_NULL saat kecamatan/kategori dihapus
+    instance._search_destination_ids = list(instance.destinations.values_list('pk', flat=True))
+
+
+def reindex_related_destinations(sender, instance, using='default', **kwargs):
+    search.index_destinations(getattr(instance, '_search_destination_ids', []), using=using)
+
+
+post_save.connect(index_saved_destination, sender=Destination, dispatch_uid='search_save_destination')
+post_delete.connect(unindex_deleted_destination, sender=Destination, dispatch_uid='search_delete_destination')
+post_save.connect(index_saved_district, sender=District, dispatch_uid='search_save_district')
+post_save.connect(index_saved_category, sender=Category, dispatch_uid='search_save_category')
+for model in (District, Category):
+    pre_delete.connect(remember_related_destinations, sender=model, dispatch_uid=f'search_pre_delete_{model.__name__}')
+    post_delete.connect(reindex_related_destinations, sender=model, dispatch_uid=f'search_delete_{model.__name__}')
+
+
+# --- Fragmen kartu destinasi ---
+# Destination.save() menaikkan card_version sendiri; nama kategori/kecamatan
+# juga tampil di kartu, jadi perubahannya menaikkan versi destinasi terkait.
+
+for model in (District, Category):
+    post_save.connect(invalidate_related_cards, sender=model, dispatch_uid=f'cards_save_{model.__name__}')
+    post_delete.connect(invalidate_related_cards, sender=model, dispatch_uid=f'cards_delete_{model.__name__}')
+
+
+# --- Gambar turunan (srcset) ---
+
+def generate_image_derivatives(sender, instance, raw=False, **kwargs):
+    # Buat turunan gambar langsung saat disimpan (jika IMAGE_DERIVATIVES_EAGER)
+    if raw or not getattr(settings, 'IMAGE_DERIVATIVES_EAGER', False):
+        return
+    get_derivatives(getattr(instance, IMAGE_FIELDS[sender]))
+
+
+IMAGE_FIELDS = {
+    Destination: 'main_image',
+    DestinationGallery: 'image',
+    District: 'thumbnail',
+}
+
+for model in IMAGE_FIELDS:
+    post_save.connect(generate_image_derivatives, sender=model, dispatch_uid=f'images_save_{model.__name__}')
+
+
+# --- Statistik katalog (read model) ---
+
+def remember_view_count(sender, instance, raw=False, **kwargs):
+    # Simpan view_count lama agar selisih total tayangan bisa dihitung
+    if raw or instance._state.adding:
+        return
+    instance._stats_previous_views = (
+        sender.objects.filter(pk=instance.pk).values_list('view_count', flat=True).first()
+    )
+
+
+def update_stats_destination_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        stats.destination_saved(instance, created, getattr(instance, '_stats_previous_views', None))
+
+
+def update_stats_destination_deleted(sender, instance, **kwargs):
+    stats.destination_deleted(instance)
+
+
+STATS_COUNT_FIELDS = {
+    Category: 'category_count',
+    District: 'district_count',
+}
+
+
+def update_stats_related_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.adjust_count(STATS_COUNT_FIELDS[sender], 1)
+    else:
+        stats.related_changed(sender._meta.model_name, instance.pk, instance.name)
+
+
+def update_stats_related_deleted(sender, instance, **kwargs):
+    stats.adjust_count(STATS_COUNT_FIELDS[sender], -1)
+    stats.related_changed(sender._meta.model_name, instance.pk, None)
+
+
+def update_stats_user_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.adjust_count('user_count', 1)
+
+
+def update_stats_user_deleted(sender, instance, **kwargs):
+    stats.adjust_count('user_count', -1)
+
+
+pre_save.connect(remember_view_count, sender=Destination, dispatch_uid='stats_pre_save_destination')
+post_save.connect(update_stats_destination_saved, sender=Destination, dispatch_uid='stats_save_destination')
+post_delete.connect(update_stats_destination_deleted, sender=Destination, dispatch_uid='stats_delete_destination')
+for model in STATS_COUNT_FIELDS:
+    post_save.connect(update_stats_related_saved, sender=model, dispatch_uid=f'stats_save_{model.__name__}')
+    post_delete.connect(update_stats_related_deleted, sender=model, dispatch_uid=f'stats_delete_{model.__name__}')
+post_save.connect(update_stats_user_saved, sender=get_user_model(), dispatch_uid='stats_save_user')
+post_delete.connect(update_stats_user_deleted, sender=get_user_model(), dispatch_uid='stats_delete_user')
+
+
+
+# --- Snapshot GeoJSON ---
+# Nama, gambar, koordinat, kategori & kecamatan ikut di snapshot
+
+def refresh_geojson_snapshot(sender, raw=False, **kwargs):
+    if not raw:
+        maps.request_snapshot_refresh()
+
+
+for model in (Destination, Category, District):
+    post_save.connect(refresh_geojson_snapshot, sender=model, dispatch_uid=f'geojson_save_{model.__name__}')
+    post_delete.connect(refresh_geojson_snapshot, sender=model, dispatch_uid=f'geojson_delete_{model.__name__}')
+
+# --- Profil koneksi SQLite (WAL & pragma lain) ---
+
+connection_created.connect(configure_connection, dispatch_uid='sqlite_pragmas')
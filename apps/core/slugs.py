@@ -0,0 +1,187 @@
+# Alokasi slug unik dengan satu query per prefix.
+# Semua slug yang berawalan slug dasar diambil sekaligus, lalu sufiks
+# bebas berikutnya (-1, -2, ...) dipilih di memori. Bentrok karena race
+# condition ditangani dengan retry saat IntegrityError.
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Jumlah prefix per query saat alokasi batch (batas variabel SQLite)
+BATCH_PREFIX_CHUNK = 200
+
+# Jumlah slug per query cek bentrok persis (slug__in)
+EXACT_CHECK_CHUNK_SIZE = 900
+
+# Putaran cek bentrok persis sebelum kembali ke alokasi prefix
+EXACT_CHECK_ROUNDS = 3
+
+# Jumlah percobaan simpan ulang saat slug direbut proses lain
+SAVE_RETRIES = 3
+
+SUFFIX_RE = re.compile(r'-\d+$')
+
+
+def base_slug(model, value, field):
+    # Slug dasar dari teks sumber, dipotong agar sufiks masih muat
+    max_length = model._meta.get_field(field).max_length
+    base = slugify(value) or model._meta.model_name
+    # Sisakan ruang untuk sufiks "-<angka>" (hingga 6 digit)
+    limit = max_length - 7
+    if len(base) > limit:
+        base = base[:limit].rstrip('-')
+    return base
+
+
+def _next_free(base, taken, start=1):
+    # Slug pertama yang belum dipakai: base, base-1, base-2, ...
+    # 'start' melewati sufiks yang sudah diketahui terpakai (alokasi batch)
+    if base not in taken:
+        return base
+    counter = start
+    while f'{base}-{counter}' in taken:
+        counter += 1
+    return f'{base}-{counter}'
+
+
+def _taken_slugs(model, bases, field, exclude_pk=None):
+    # Ambil slug yang sudah ada untuk semua prefix dalam query sesedikit mungkin
+    bases = sorted(set(bases))
+    taken = set()
+    for start in range(0, len(bases), BATCH_PREFIX_CHUNK):
+        condition = Q()
+        for base in bases[start:start + BATCH_PREFIX_CHUNK]:
+            # Rentang [base, base + '.') mencakup "base" dan "base-..." karena
+            # '-' < '.'; berbeda dengan LIKE, rentang bisa memakai index unik slug
+            condition |= Q(**{f'{field}__gte': base, f'{field}__lt': f'{base}.'})
+        queryset = model._default_manager.filter(condition)
+        if exclude_pk is not None:
+            queryset = queryset.exclude(pk=exclude_pk)
+        taken.update(queryset.values_list(field, flat=True))
+    # Hanya slug berbentuk "base" atau "base-<angka>" yang relevan
+    wanted = set(bases)
+    return {slug for slug in taken if slug in wanted or SUFFIX_RE.sub('', slug) in wanted}
+
+
+def allocate_slug(model, value, field='slug', exclude_pk=None):
+    # Slug unik untuk satu objek, cukup satu query SELECT
+    base = base_slug(model, value, field)
+    return _next_free(base, _taken_slugs(model, [base], field, exclude_pk))
+
+
+class SlugAllocator:
+    # Alokator slug untuk banyak batch (mis. import massal). Prefix yang
+    # sudah dimuat dan slug yang sudah dibagikan diingat, sehingga prefix
+    # yang sama tidak di-query ulang di batch berikutnya.
+
+    def __init__(self, model, field='slug'):
+        self.model = model
+        self.field = field
+        self.loaded = set()
+        self.taken = set()
+        self.next_counter = {}
+
+    def reserve(self, slugs):
+        # Tandai slug yang diisi manual sebagai terpakai
+        self.taken.update(slugs)
+
+    def assign(self, objects, values):
+        # Isi slug tiap objek dari teks sumber di 'values' (urutan sama)
+        bases = [base_slug(self.model, value, self.field) for value in values]
+        new_bases = {base for base in bases if base not in self.loaded}
+        if new_bases:
+            self.taken.update(_taken_slugs(self.model, new_bases, self.field))
+            self.loaded.update(new_bases)
+        for obj, base in zip(objects, bases):
+            slug = _next_free(base, self.taken, self.next_counter.get(base, 1))
+            if slug != base:
+                self.next_counter[base] = int(slug.rsplit('-', 1)[1]) + 1
+            setattr(obj, self.field, slug)
+            self.taken.add(slug)
+        return objects
+
+    def assign_sequential(self, objects, values):
+        # Seperti assign(), tetapi tanpa memindai prefix (mahal pada tabel besar):
+        # slug diusulkan base, base-1, base-2, ... dari nomor urut di memori, lalu
+        # hanya bentrokan persis (satu query slug__in per putaran) yang diusulkan
+        # ulang. Sisa setelah EXACT_CHECK_ROUNDS memakai alokasi prefix.
+        pending = [(obj, base_slug(self.model, value, self.field)) for obj, value in zip(objects, values)]
+        for _ in range(EXACT_CHECK_ROUNDS):
+            proposed = [(obj, base, self._propose(base)) for obj, base in pending]
+            existing = self._existing([slug for _, _, slug in proposed])
+            pending = []
+            for obj, base, slug in proposed:
+                if slug in existing:
+                    pending.append((obj, base))
+                else:
+                    setattr(obj, self.field, slug)
+            if not pending:
+                return objects
+        self.assign([obj for obj, _ in pending], [base for _, base in pending])
+        return objects
+
+    def _propose(self, base):
+        # Slug berikutnya untuk base yang belum dipakai di import ini
+        counter = self.next_counter.get(base, 0)
+        slug = base if counter == 0 else f'{base}-{counter}'
+        while slug in self.taken:
+            counter += 1
+            slug = f'{base}-{counter}'
+        self.next_counter[base] = counter + 1
+        self.taken.add(slug)
+        return slug
+
+    def _existing(self, slugs):
+        existing = set()
+        for start in range(0, len(slugs), EXACT_CHECK_CHUNK_SIZE):
+            existing.update(
+                self.model._default_manager.filter(**{f'{self.field}__in': slugs[start:start + EXACT_CHECK_CHUNK_SIZE]})
+                .values_list(self.field, flat=True)
+            )
+        return existing
+
+    def release(self, slugs):
+        # Kembalikan slug dari batch yang gagal ditulis (mis. di-retry); nomor
+        # urut base ikut dimundurkan agar percobaan ulang mendapat slug yang sama
+        for slug in slugs:
+            self.taken.discard(slug)
+            if slug in self.next_counter:
+                base, counter = slug, 0
+            elif SUFFIX_RE.search(slug):
+                base, counter = slug.rsplit('-', 1)[0], int(slug.rsplit('-', 1)[1])
+            else:
+                continue
+            if base in self.next_counter:
+                self.next_counter[base] = min(self.next_counter[base], counter)
+
+
+def allocate_slugs(objects, source='name', field='slug'):
+    # Isi slug untuk sekumpulan objek yang belum disimpan (mis. sebelum
+    # bulk_create). Slug yang sudah terisi dibiarkan dan ikut dianggap terpakai.
+    objects = list(objects)
+    if not objects:
+        return objects
+    allocator = SlugAllocator(type(objects[0]), field)
+    allocator.reserve(getattr(obj, field) for obj in objects if getattr(obj, field))
+    pending = [obj for obj in objects if not getattr(obj, field)]
+    allocator.assign(pending, [getattr(obj, source) for obj in pending])
+    return objects
+
+
+def save_with_unique_slug(instance, value, save, *args, field='slug', **kwargs):
+    # Jalankan save() dengan slug otomatis; jika slug direbut proses lain di
+    # antara alokasi dan INSERT, alokasikan ulang dan coba lagi.
+    model = type(instance)
+    auto = not getattr(instance, field)
+    for attempt in range(SAVE_RETRIES):
+        if auto:
+            setattr(instance, field, allocate_slug(model, value, field, exclude_pk=instance.pk))
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            slug = getattr(instance, field)
+            collided = model._default_manager.filter(**{field: slug}).exclude(pk=instance.pk).exists()
+            if not auto or not collided or attempt == SAVE_RETRIES - 1:
+                raise
@@ -0,0 +1,234 @@
+# Read model statistik katalog (satu baris CatalogStats).
+# Dashboard admin dan homepage membaca baris ini (di-cache) alih-alih
+# menjalankan COUNT/SUM/top-N setiap request. Baris dijaga inkremental:
+# penghitung diubah dengan UPDATE ... F() dari signal, dan daftar top/terbaru
+# digabung di memori dengan data baris yang berubah saja. Perubahan massal
+# yang melewati signal (bulk_create/update) memanggil rebuild_stats().
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.utils.dateparse import parse_datetime
+
+from .db import retry_on_lock
+from .models import CatalogStats, Category, Destination, District
+
+STATS_PK = 1
+STATS_CACHE_KEY = 'catalog:stats'
+
+# Kolom ringkas destinasi yang disimpan di daftar top/terbaru
+ENTRY_FIELDS = (
+    'id', 'name', 'slug', 'main_image', 'view_count', 'created_at', 'category_id', 'district_id', 'card_version',
+)
+
+# Jumlah id per query saat menggabungkan hasil flush tayangan
+ENTRY_CHUNK_SIZE = 300
+
+
+def top_size():
+    return getattr(settings, 'CATALOG_STATS_TOP_SIZE', 5)
+
+
+def recent_size():
+    return getattr(settings, 'CATALOG_STATS_RECENT_SIZE', 5)
+
+
+def _entries(queryset, limit=None):
+    # Daftar ringkas (dict siap JSON) dari queryset destinasi
+    rows = queryset.values(*ENTRY_FIELDS, category_name=F('category__name'), district_name=F('district__name'))
+    if limit is not None:
+        rows = rows[:limit]
+    return [dict(row, created_at=row['created_at'].isoformat()) for row in rows]
+
+
+def _top_entries():
+    return _entries(Destination.objects.order_by('-view_count', '-id'), top_size())
+
+
+def _recent_entries():
+    return _entries(Destination.objects.order_by('-created_at', '-id'), recent_size())
+
+
+def _sort_top(entries):
+    return sorted(entries, key=lambda entry: (-entry['view_count'], -entry['id']))[:top_size()]
+
+
+def rebuild_stats():
+    # Hitung ulang seluruh statistik dari tabel sumber
+    fields = {
+        'destination_count': Destination.objects.count(),
+        'category_count': Category.objects.count(),
+        'district_count': District.objects.count(),
+        'user_count': get_user_model().objects.count(),
+        'total_views': Destination.objects.aggregate(total=Sum('view_count'))['total'] or 0,
+        'top_destinations': _top_entries(),
+        'recent_destinations': _recent_entries(),
+    }
+    stats, _ = CatalogStats.objects.update_or_create(pk=STATS_PK, defaults=fields)
+    cache.delete(STATS_CACHE_KEY)
+    return stats
+
+
+def get_stats():
+    # Baris statistik dari cache; satu SELECT saat miss, rebuild jika belum ada
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = CatalogStats.objects.filter(pk=STATS_PK).first() or rebuild_stats()
+        cache.set(STATS_CACHE_KEY, stats, getattr(settings, 'CATALOG_STATS_CACHE_TIMEOUT', 60 * 15))
+    return stats
+
+
+async def aget_stats():
+    # Versi async get_stats() untuk view ASGI. Cache LocMem tidak melakukan IO,
+    # jadi dibaca langsung; hanya SELECT (dan rebuild) yang lewat ORM async.
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = await CatalogStats.objects.filter(pk=STATS_PK).afirst()
+        if stats is None:
+            stats = await sync_to_async(rebuild_stats)()
+        cache.set(STATS_CACHE_KEY, stats, getattr(settings, 'CATALOG_STATS_CACHE_TIMEOUT', 60 * 15))
+    return stats
+
+
+@retry_on_lock
+def _update(**changes):
+    # UPDATE atomik pada baris statistik; bangun ulang jika baris belum ada.
+    # Di dalam transaksi pemanggil (mis. admin) retry diserahkan ke pemanggil.
+    if not changes:
+        return
+    updated = CatalogStats.objects.filter(pk=STATS_PK).update(**changes)
+    cache.delete(STATS_CACHE_KEY)
+    if not updated:
+        rebuild_stats()
+
+
+def _current_lists():
+    row = CatalogStats.objects.filter(pk=STATS_PK).values('top_destinations', 'recent_destinations').first()
+    if row is None:
+        return None, None
+    return row['top_destinations'], row['recent_destinations']
+
+
+def adjust_count(field, delta):
+    # Tambah/kurangi penghitung (destination_count, category_count, dll.)
+    _update(**{field: F(field) + delta})
+
+
+def destination_saved(instance, created, previous_views=None):
+    # Destinasi baru/diubah: perbarui penghitung dan sisipkan barisnya ke daftar
+    changes = {}
+    if created:
+        changes['destination_count'] = F('destination_count') + 1
+    delta = instance.view_count - (previous_views or 0)
+    if delta:
+        changes['total_views'] = F('total_views') + delta
+
+    top, recent = _current_lists()
+    if top is None:
+        rebuild_stats()
+        return
+    entry = _entries(Destination.objects.filter(pk=instance.pk))
+    if not entry:
+        _update(**changes)
+        return
+    entry = entry[0]
+    previous = next((item for item in top if item['id'] == entry['id']), None)
+    if previous is not None and entry['view_count'] < previous['view_count']:
+        # Tayangan berkurang (mis. direset): destinasi lain mungkin naik ke top
+        changes['top_destinations'] = _top_entries()
+    else:
+        changes['top_destinations'] = _sort_top([item for item in top if item['id'] != entry['id']] + [entry])
+    if created:
+        recent = [entry] + recent
+    else:
+        recent = [entry if item['id'] == entry['id'] else item for item in recent]
+    changes['recent_destinations'] = sorted(
+        recent, key=lambda item: (item['created_at'], item['id']), reverse=True
+    )[:recent_size()]
+    _update(**changes)
+
+
+def destination_deleted(instance):
+    # Destinasi dihapus: kurangi penghitung, isi ulang daftar yang memuatnya
+    changes = {
+        'destination_count': F('destination_count') - 1,
+        'total_views': F('total_views') - instance.view_count,
+    }
+    top, recent = _current_lists()
+    if top is not None:
+        if any(item['id'] == instance.pk for item in top):
+            changes['top_destinations'] = _top_entries()
+        if any(item['id'] == instance.pk for item in recent):
+            changes['recent_destinations'] = _recent_entries()
+    _update(**changes)
+
+
+def related_changed(field, pk, name):
+    # Nama kategori/kecamatan berubah (atau dihapus jika name None): perbarui
+    # nama di daftar tanpa query ke tabel destinasi. field = 'category'/'district'.
+    top, recent = _current_lists()
+    if top is None:
+        return
+    changes = {}
+    for key, entries in (('top_destinations', top), ('recent_destinations', recent)):
+        matches = [item for item in entries if item[f'{field}_id'] == pk]
+        for item in matches:
+            item[f'{field}_name'] = name
+            # Kunci fragmen kartu homepage ikut berubah (lihat cards.py)
+            item['card_version'] = item.get('card_version', 0) + 1
+            if name is None:
+                item[f'{field}_id'] = None
+        if matches:
+            changes[key] = entries
+    _update(**changes)
+
+
+def record_views(counts):
+    # Dipanggil buffer tayangan setelah flush: counts = {pk: tambahan tayangan}.
+    # Tayangan hanya bertambah, jadi top baru = gabungan top lama dengan
+    # destinasi yang baru saja bertambah tayangannya.
+    if not counts:
+        return
+    changes = {'total_views': F('total_views') + sum(counts.values())}
+    top, recent = _current_lists()
+    if top is None:
+        rebuild_stats()
+        return
+    pks = list(counts)
+    candidates = {item['id']: item for item in top}
+    for start in range(0, len(pks), ENTRY_CHUNK_SIZE):
+        chunk = pks[start:start + ENTRY_CHUNK_SIZE]
+        queryset = Destination.objects.filter(pk__in=chunk).order_by('-view_count', '-id')
+        for entry in _entries(queryset, top_size()):
+            candidates[entry['id']] = entry
+    changes['top_destinations'] = _sort_top(candidates.values())
+    if any(item['id'] in counts for item in recent):
+        for item in recent:
+            item['view_count'] += counts.get(item['id'], 0)
+        changes['recent_destinations'] = recent
+    _update(**changes)
+
+
+def destination_objects(entries):
+    # Ubah daftar ringkas jadi instance Destination (tanpa query) untuk template.
+    # category_name & district_name tersedia sebagai atribut biasa.
+    objects = []
+    for entry in entries:
+        obj = Destination(
+            id=entry['id'],
+            name=entry['name'],
+            slug=entry['slug'],
+            main_image=entry['main_image'],
+            view_count=entry['view_count'],
+            created_at=parse_datetime(entry['created_at']),
+            category_id=entry['category_id'],
+            district_id=entry['district_id'],
+            # Baris lama (sebelum card_version ada) tidak memiliki kolom ini
+            card_version=entry.get('card_version', 0),
+        )
+        obj._state.adding = False
+        obj.category_name = entry['category_name']
+        obj.district_name = entry['district_name']
+        objects.append(obj)
+    return objects
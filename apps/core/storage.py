@@ -0,0 +1,94 @@
+# Storage file untuk production.
+# - Statis: nama file ber-hash + kompresi WhiteNoise. Aset yang direferensikan
+#   template tapi tidak ada di static/ (mis. img/hero.jpg) tidak boleh membuat
+#   {% static %} error 500; URL-nya dikembalikan apa adanya (tanpa hash).
+# - Media (upload): hash konten disisipkan ke nama file, sehingga URL berubah
+#   setiap isi berubah dan bisa dilayani dengan Cache-Control immutable.
+import hashlib
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from whitenoise.storage import CompressedManifestStaticFilesStorage as BaseStorage
+
+# Panjang hash konten di nama file upload (foto.<hash>.jpg)
+MEDIA_HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(rf'\.[0-9a-f]{{{MEDIA_HASH_LENGTH}}}\.[^./]+$')
+
+# File upload yang baru ditulis di dalam blok delete_files_on_error()
+_saved_files = ContextVar('saved_media_files', default=None)
+
+
+class CompressedManifestStaticFilesStorage(BaseStorage):
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if content is not None:
+                raise
+            return name
+
+
+class HashedMediaStorage(FileSystemStorage):
+    # FileSystemStorage (MEDIA_ROOT) yang menamai upload menurut isinya.
+    # Isi yang sama menghasilkan nama yang sama, jadi file tidak ditulis ulang.
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            return name
+        name = super().save(name, content, max_length=max_length)
+        saved = _saved_files.get()
+        if saved is not None:
+            saved.append((self, name))
+        return name
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        root, ext = os.path.splitext(name)
+        if HASHED_NAME_RE.search(name):
+            # Nama sudah ber-hash (mis. disalin dari field lain): ganti hash-nya
+            root = os.path.splitext(root)[0]
+        return f'{root}.{digest.hexdigest()[:MEDIA_HASH_LENGTH]}{ext}'
+
+
+@contextmanager
+def delete_files_on_error():
+    # Upload yang baru ditulis selama blok dihapus lagi jika blok gagal (mis.
+    # transaksi admin di-rollback), agar tidak ada file yatim di MEDIA_ROOT.
+    # File yang sudah ada sebelumnya (isi sama) tidak disentuh.
+    saved = []
+    token = _saved_files.set(saved)
+    try:
+        yield
+    except BaseException:
+        for storage, name in saved:
+            storage.delete(name)
+        raise
+    finally:
+        _saved_files.reset(token)
+
+
+_media_storage = None
+
+
+def media_storage():
+    # Callable untuk storage= di ImageField: migrasi cukup mereferensikan
+    # fungsi ini, bukan menyerialisasi instance storage
+    global _media_storage
+    if _media_storage is None:
+        _media_storage = HashedMediaStorage()
+    return _media_storage
@@ -0,0 +1,11 @@
+from django import template
+
+from apps.core.cards import render_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def destination_cards(destinations, template_name):
+    # HTML kartu per destinasi dari cache fragmen (satu get_many per halaman)
+    return render_cards(destinations, template_name)
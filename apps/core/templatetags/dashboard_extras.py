@@ -1,20 +1,22 @@
 from django import template
-from apps.core.models import Destination, Category
-from django.contrib.auth.models import User
+from apps.core.stats import destination_objects, get_stats
 
 register = template.Library()
 
+# Semua angka dashboard dibaca dari satu baris CatalogStats (di-cache),
+# bukan COUNT/top-N terpisah setiap kali halaman admin dibuka.
+
 @register.simple_tag
 def get_destination_count():
-    return Destination.objects.count()
+    return get_stats().destination_count
 
 @register.simple_tag
 def get_category_count():
-    return Category.objects.count()
+    return get_stats().category_count
 
 @register.simple_tag
 def get_user_count():
-    return User.objects.count()
+    return get_stats().user_count
 
 import json
 from django.utils.safestring import mark_safe
@@ -22,15 +24,15 @@ from django.utils.safestring import mark_safe
 @register.simple_tag
 def get_top_destinations_json():
     # Get top 5 destinations by views
-    top_destinations = Destination.objects.order_by('-view_count')[:5]
+    top_destinations = get_stats().top_destinations[:5]
     
     data = {
-        'labels': [d.name for d in top_destinations],
-        'data': [d.view_count for d in top_destinations],
+        'labels': [d['name'] for d in top_destinations],
+        'data': [d['view_count'] for d in top_destinations],
     }
     return mark_safe(json.dumps(data))
 
 @register.simple_tag
 def get_recent_destinations():
     # Get 5 most recent destinations by creation date
-    return Destination.objects.order_by('-created_at')[:5]
+    return destination_objects(get_stats().recent_destinations[:5])
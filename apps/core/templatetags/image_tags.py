@@ -0,0 +1,46 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from apps.core.images import build_srcset, derivative_url, get_derivatives
+
+register = template.Library()
+
+# Default 'sizes' untuk kartu grid (1 kolom mobile, 2 tablet, 3 desktop)
+DEFAULT_SIZES = '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw'
+
+
+@register.simple_tag
+def responsive_image(field_file, alt='', sizes=DEFAULT_SIZES, **attrs):
+    # Render <picture> dengan srcset WebP + JPEG dari gambar turunan.
+    # Atribut tambahan (class, onerror, dll.) diteruskan ke <img>.
+    # Jika turunan belum/tidak bisa dibuat, fallback ke <img> file asli.
+    attrs.setdefault('loading', 'lazy')
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+    manifest = get_derivatives(field_file)
+    if not manifest:
+        return format_html(
+            '<img src="{}" alt="{}"{}>',
+            field_file.url if field_file else '', alt, extra
+        )
+    fallback = derivative_url(field_file, manifest['widths'][-1], 'jpg')
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}"{}>'
+        '</picture>',
+        build_srcset(manifest, 'webp'), sizes,
+        fallback, build_srcset(manifest, 'jpg'), sizes, alt, extra
+    )
+
+
+@register.simple_tag
+def image_srcset(field_file, ext='webp'):
+    # Hanya string srcset untuk satu format (untuk markup kustom)
+    manifest = get_derivatives(field_file)
+    return build_srcset(manifest, ext) if manifest else ''
+
+
+@register.simple_tag
+def image_url(field_file, width, ext='jpg'):
+    # URL turunan terkecil yang >= width (mis. thumbnail, background CSS)
+    return derivative_url(field_file, int(width), ext)
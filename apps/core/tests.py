@@ -5,16 +5,79 @@
 # - Views: List views, Detail views, kode respons
 # - URL routing: memastikan semua pola URL berfungsi
 
-from django.test import TestCase, Client
-from django.urls import reverse
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.contrib import admin
+from django.db.models import F
+from django.db.models.query import QuerySet
+from django.core.cache import cache
+from django.urls import resolve, reverse
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from .models import Category, Destination, District
+from .models import CatalogStats, Category, Destination, DestinationGallery, DestinationViewBucket, District
+from .counters import ViewCountBuffer, view_counter
+from .cache import get_catalog_version
+from .cards import card_cache_key, render_cards
+from .search import build_match_query, fts_available, search_destinations
+from .sampling import reset_snapshot, sample_destinations
+from .images import derivative_url, get_derivatives
+from .media import parse_range
+from .storage import HashedMediaStorage
+from .slugs import allocate_slug, allocate_slugs
+from .instrumentation import QueryBudgetExceeded
+from . import stats
+from . import analytics
+from .db import apply_pragmas, retry_on_lock
+from . import routers
+from . import importers
+from .importers import CatalogImporter, iter_csv, iter_json_array, iter_jsonl
+from .generators import CatalogGenerator
+from .geo import bounds, encode, haversine_km, neighbours, parse_coordinates
+from . import maps
+from . import benchmarks
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from unittest import mock
+from .pagination import paginate_by_cursor
+from urllib.parse import urlencode
+from django.template import Context, Template
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.utils.module_loading import import_string
+from datetime import datetime, timedelta
+from django.utils import timezone
+import gzip
+import random
+import json
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
 import tempfile
+import os
+import subprocess
+import sys
 from PIL import Image
 import io
 
 
+class TempMediaRootMixin:
+    # File unggahan & turunan test ditulis ke MEDIA_ROOT sementara, bukan media/ proyek.
+    # Aktif sebelum setUpTestData agar data kelas juga ikut tersimpan di sana.
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+
 class CategoryModelTest(TestCase):
     # Test cases untuk model Category.
     
@@ -67,7 +130,7 @@ class CategoryModelTest(TestCase):
         self.assertEqual(category.icon, "beach_access")
 
 
-class DestinationModelTest(TestCase):
+class DestinationModelTest(TempMediaRootMixin, TestCase):
     # Test cases untuk model Destination.
     
     @classmethod
@@ -191,7 +254,580 @@ class DestinationModelTest(TestCase):
     # test_district_choices removed as District is now a dynamic model, not a fixed choice field.
 
 
-class DestinationViewTest(TestCase):
+class SlugAllocatorTest(TestCase):
+    # Test cases untuk alokasi slug unik.
+    
+    def test_allocate_slug_single_query(self):
+        # Test slug bebas berikutnya ditemukan dengan satu query.
+        for _ in range(5):
+            Category.objects.create(name="Pantai")
+        with self.assertNumQueries(1):
+            slug = allocate_slug(Category, "Pantai")
+        self.assertEqual(slug, "pantai-5")
+    
+    def test_allocate_slug_ignores_longer_prefix_matches(self):
+        # Test slug lain dengan awalan sama tidak dianggap bentrok.
+        Category.objects.create(name="Pantai Indah")
+        self.assertEqual(allocate_slug(Category, "Pantai"), "pantai")
+    
+    def test_allocate_slug_fills_gaps(self):
+        # Test sufiks terkecil yang kosong dipakai lebih dulu.
+        Category.objects.create(name="Gili", slug="gili")
+        Category.objects.create(name="Gili", slug="gili-2")
+        self.assertEqual(allocate_slug(Category, "Gili"), "gili-1")
+    
+    def test_allocate_slugs_for_batch(self):
+        # Test alokasi batch untuk bulk_create tanpa bentrok.
+        Category.objects.create(name="Air Terjun")
+        categories = [Category(name="Air Terjun") for _ in range(3)] + [Category(name="Hutan")]
+        with self.assertNumQueries(1):
+            allocate_slugs(categories)
+        self.assertEqual(
+            [c.slug for c in categories],
+            ["air-terjun-1", "air-terjun-2", "air-terjun-3", "hutan"]
+        )
+    
+    def test_long_name_truncated_with_room_for_suffix(self):
+        # Test slug dari nama panjang tetap muat dengan sufiks.
+        name = "Pantai " * 30
+        first = Category.objects.create(name=name[:100])
+        second = Category.objects.create(name=name[:100])
+        self.assertLessEqual(len(second.slug), 100)
+        self.assertNotEqual(first.slug, second.slug)
+    
+    def test_district_slug_collision_handled(self):
+        # Test nama kecamatan berbeda dengan slug sama tetap unik.
+        first = District.objects.create(name="Batu Layar")
+        second = District.objects.create(name="Batu-Layar")
+        self.assertEqual(first.slug, "batu-layar")
+        self.assertEqual(second.slug, "batu-layar-1")
+
+
+class CatalogImportTest(TestCase):
+    # Test cases untuk importer katalog massal (import_catalog).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.district = District.objects.create(name="Batu Layar")
+        cls.category = Category.objects.create(name="Pantai", icon="waves")
+    
+    def test_json_array_streamed_in_small_chunks(self):
+        # Test parser JSON streaming tetap benar walau objek terpotong antar chunk.
+        data = '[ {"name": "A, [b]"}, {"name": "C", "n": [1, 2]} ,{"name": "D"} ]'
+        with mock.patch.object(importers, 'READ_CHUNK_SIZE', 3):
+            items = list(iter_json_array(io.StringIO(data)))
+        self.assertEqual([item['name'] for item in items], ['A, [b]', 'C', 'D'])
+    
+    def test_json_array_rejects_non_array(self):
+        # Test input bukan array ditolak.
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"name": "A"}')))
+    
+    def test_csv_destinations_resolve_foreign_keys_by_name(self):
+        # Test FK kecamatan & kategori di-resolve dari nama.
+        data = io.StringIO(
+            "name,description,district,category,main_image,view_count\n"
+            "Pantai Senggigi,Pasir putih,batu layar,Pantai,destinations/primary/a.jpg,12\n"
+            "Pantai Senggigi,Pasir putih lagi,Batu Layar,,destinations/primary/b.jpg,\n"
+        )
+        stats = CatalogImporter(default_model='destination').run(iter_csv(data))
+        self.assertEqual(stats.created['destination'], 2)
+        first, second = Destination.objects.order_by('id')
+        self.assertEqual(first.district, self.district)
+        self.assertEqual(first.category, self.category)
+        self.assertEqual(first.view_count, 12)
+        self.assertEqual([first.slug, second.slug], ['pantai-senggigi', 'pantai-senggigi-1'])
+    
+    def test_invalid_rows_are_skipped(self):
+        # Test baris tidak valid dibuang tanpa menggagalkan batch.
+        records = [
+            {'model': 'destination', 'name': 'Tanpa Deskripsi', 'main_image': 'x.jpg'},
+            {'model': 'destination', 'name': 'Kecamatan Asing', 'description': 'Test', 'district': 'Narmada', 'main_image': 'x.jpg'},
+            {'model': 'destination', 'name': 'Valid', 'description': 'Test', 'main_image': 'x.jpg'},
+        ]
+        stats = CatalogImporter().run(records)
+        self.assertEqual(stats.created['destination'], 1)
+        self.assertEqual(stats.skipped, 2)
+        self.assertEqual(len(stats.errors), 2)
+    
+    def test_unknown_numeric_foreign_keys_are_rejected(self):
+        # Test id kecamatan/kategori yang tidak ada ditolak per baris, bukan IntegrityError satu batch.
+        records = [
+            {'model': 'destination', 'name': 'Id Asing', 'description': 'Test', 'district': 999, 'main_image': 'x.jpg'},
+            {'model': 'destination', 'name': 'Kategori Asing', 'description': 'Test', 'category': '999', 'main_image': 'x.jpg'},
+            {'model': 'destination', 'name': 'Id Valid', 'description': 'Test', 'district': str(self.district.pk),
+             'category': self.category.pk, 'main_image': 'x.jpg'},
+        ]
+        stats = CatalogImporter().run(records)
+        self.assertEqual(stats.created['destination'], 1)
+        self.assertEqual(stats.errors, ["Id Asing: Unknown district 999", "Kategori Asing: Unknown category '999'"])
+        valid = Destination.objects.get(name='Id Valid')
+        self.assertEqual((valid.district, valid.category), (self.district, self.category))
+    
+    def test_fixture_round_trip_maps_source_pks(self):
+        # Test fixture bawaan: FK angka mengikuti pk di fixture, bukan id database yang kebetulan sama.
+        path = os.path.join(settings.BASE_DIR, 'fixtures', 'initial_data.json')
+        with open(path, encoding='utf-8') as handle:
+            fixture = json.load(handle)
+        names = {(item['model'], item['pk']): item['fields']['name'] for item in fixture if 'name' in item['fields']}
+        expected = sorted(
+            (item['fields']['name'], names[('core.category', item['fields']['category'])],
+             names[('core.district', item['fields']['district'])])
+            for item in fixture if item['model'] == 'core.destination'
+        )
+        # Kecamatan yang sudah ada (nama sama, id berbeda) dipakai ulang
+        existing = District.objects.create(name="Narmada")
+        with open(path, encoding='utf-8', newline='') as handle:
+            stats = CatalogImporter().run(iter_json_array(handle))
+        self.assertEqual(stats.errors, [])
+        self.assertEqual(stats.created, {'district': 8, 'category': 5, 'destination': len(expected)})
+        imported = sorted(Destination.objects.values_list('name', 'category__name', 'district__name'))
+        self.assertEqual(imported, expected)
+        self.assertTrue(Destination.objects.filter(district=existing).exists())
+        self.assertFalse(Destination.objects.filter(category=self.category).exists())
+    
+    def test_create_missing_and_skip_existing(self):
+        # Test kecamatan/kategori baru dibuat sekali, yang sudah ada dilewati.
+        records = [
+            {'model': 'district', 'name': 'Batu Layar'},
+            {'model': 'core.category', 'fields': {'name': 'Bukit', 'icon': 'Land Scape'}},
+            {'model': 'destination', 'name': 'Air Terjun', 'description': 'Test', 'district': 'Narmada', 'category': 'Bukit', 'main_image': 'x.jpg'},
+            {'model': 'destination', 'name': 'Taman', 'description': 'Test', 'district': 'Narmada', 'main_image': 'x.jpg'},
+        ]
+        stats = CatalogImporter(create_missing=True, batch_size=2).run(records)
+        self.assertEqual(stats.created, {'district': 1, 'category': 1, 'destination': 2})
+        self.assertEqual(Category.objects.get(name='Bukit').icon, 'land_scape')
+        self.assertEqual(Destination.objects.filter(district__name='Narmada').count(), 2)
+    
+    def test_import_slugs_use_exact_clash_checks(self):
+        # Test slug import = base + nomor urut; bentrok dicek persis (slug__in), tanpa pindai prefix.
+        for _ in range(2):
+            Destination.objects.create(name="Pantai Senggigi", description="Lama", main_image="x.jpg")
+        records = [{'model': 'destination', 'name': 'Pantai Senggigi', 'description': 'Baru', 'main_image': 'x.jpg'}] * 2
+        with CaptureQueriesContext(connection) as ctx:
+            CatalogImporter().run(records)
+        new = Destination.objects.filter(description='Baru').order_by('id').values_list('slug', flat=True)
+        self.assertEqual(list(new), ['pantai-senggigi-2', 'pantai-senggigi-3'])
+        self.assertFalse([q for q in ctx.captured_queries if '"slug" >=' in q['sql']])
+    
+    def test_import_benchmark_command_rolls_back(self):
+        # Test benchmark_import melaporkan throughput tanpa mengubah database.
+        out = io.StringIO()
+        call_command('benchmark_import', rows=30, batch_size=10, target_seconds=0, stdout=out)
+        self.assertIn('Imported: 30 destinations', out.getvalue())
+        self.assertIn('rows/s', out.getvalue())
+        self.assertFalse(Destination.objects.exists())
+    
+    def test_import_updates_search_index(self):
+        # Test destinasi hasil import langsung bisa dicari.
+        CatalogImporter().run(iter_jsonl(io.StringIO(
+            '{"model": "destination", "name": "Gili Sudak", "description": "Pulau", "main_image": "x.jpg"}\n'
+        )))
+        self.assertEqual(
+            [d.name for d in search_destinations(Destination.objects.all(), 'sudak')],
+            ['Gili Sudak']
+        )
+    
+    def test_import_command_reports_throughput(self):
+        # Test command import_catalog melaporkan rows/s.
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write('{"name": "Bukit Malimbu", "description": "Test", "main_image": "x.jpg"}\n')
+        out = io.StringIO()
+        try:
+            call_command('import_catalog', handle.name, model='destination', stdout=out)
+        finally:
+            os.unlink(handle.name)
+        self.assertIn('rows/s', out.getvalue())
+        self.assertTrue(Destination.objects.filter(name='Bukit Malimbu').exists())
+
+
+class CatalogGeneratorTest(TestCase):
+    # Test cases untuk generator katalog sintetis (generate_catalog).
+    
+    def setUp(self):
+        cache.clear()
+    
+    def snapshot(self):
+        return list(Destination.objects.order_by('id').values_list('name', 'description', 'view_count', 'maps_embed_url'))
+    
+    def test_generates_catalog_with_bulk_inserts(self):
+        # Test jumlah baris, FK terisi, slug unik, dan statistik dibangun ulang.
+        with CaptureQueriesContext(connection) as ctx:
+            result = CatalogGenerator(seed=3, batch_size=20, gallery=2).run(50, districts=3, categories=4)
+        self.assertEqual(result.created['destination'], 50)
+        self.assertEqual(District.objects.count(), 3)
+        self.assertEqual(Category.objects.count(), 4)
+        self.assertEqual(DestinationGallery.objects.count(), result.created['gallery'])
+        self.assertEqual(Destination.objects.values('slug').distinct().count(), 50)
+        self.assertTrue(Destination.objects.filter(district__isnull=False, category__isnull=False).exists())
+        self.assertFalse(Destination.objects.filter(geohash='').exists())
+        self.assertEqual(stats.get_stats().destination_count, 50)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "core_destination"')]
+        self.assertEqual(len(inserts), 3)
+    
+    def test_same_seed_is_reproducible(self):
+        # Test seed yang sama menghasilkan data yang sama; kecamatan & kategori dipakai ulang.
+        CatalogGenerator(seed=7).run(15, districts=2, categories=2)
+        first = self.snapshot()
+        Destination.objects.all().delete()
+        CatalogGenerator(seed=7).run(15, districts=2, categories=2)
+        self.assertEqual(self.snapshot(), first)
+        self.assertEqual(District.objects.count(), 2)
+        CatalogGenerator(seed=8).run(15, districts=2, categories=2)
+        self.assertNotEqual(self.snapshot()[15:], first)
+    
+    def test_slugs_do_not_depend_on_existing_rows(self):
+        # Test nama & slug dari seed yang sama tidak bergantung pada id destinasi yang sudah ada.
+        CatalogGenerator(seed=5).run(10, districts=2, categories=2)
+        first = list(Destination.objects.order_by('id').values_list('name', 'slug'))
+        Destination.objects.all().delete()
+        other = Destination.objects.create(name="Tempat Lain", description="Bukan sintetis", main_image="destinations/primary/lain.jpg")
+        CatalogGenerator(seed=5).run(10, districts=2, categories=2)
+        self.assertEqual(list(Destination.objects.exclude(pk=other.pk).order_by('id').values_list('name', 'slug')), first)
+        # Run ulang tanpa menghapus: slug yang bentrok dialokasikan ulang
+        CatalogGenerator(seed=5).run(10, districts=2, categories=2)
+        self.assertEqual(Destination.objects.values('slug').distinct().count(), 21)
+    
+    def test_command_writes_placeholder_images(self):
+        # Test --images membuat file placeholder kecil di media storage.
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        out = io.StringIO()
+        with override_settings(MEDIA_ROOT=media_root):
+            call_command('generate_catalog', '--destinations', '5', '--images', stdout=out)
+            path = Destination.objects.first().main_image.path
+        self.assertIn('Created destination: 5', out.getvalue())
+        self.assertTrue(os.path.exists(path))
+
+
+class CardFragmentCacheTest(TestCase):
+    # Test cases untuk cache fragmen kartu destinasi (card_version per baris).
+    
+    TEMPLATE = 'partials/cards/_destination_list.html'
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.district = District.objects.create(name="Gunung Sari")
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Air Terjun {index}", description="Air terjun", district=cls.district,
+                main_image='destinations/primary/missing.jpg'
+            )
+            for index in range(3)
+        ]
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_page_of_cards_is_one_cache_round_trip(self):
+        # Test kartu ter-cache: satu get_many, tanpa render template lagi.
+        first = render_cards(self.destinations, self.TEMPLATE)
+        self.assertIn('Air Terjun 0', first[0])
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many, \
+                mock.patch('apps.core.cards.get_template') as get_template:
+            second = render_cards(self.destinations, self.TEMPLATE)
+        self.assertEqual(get_many.call_count, 1)
+        get_template.assert_not_called()
+        self.assertEqual(first, second)
+    
+    def test_save_bumps_card_version(self):
+        # Test save() menaikkan card_version sehingga kartu dirender ulang.
+        destination = Destination.objects.get(pk=self.destinations[0].pk)
+        render_cards([destination], self.TEMPLATE)
+        version = destination.card_version
+        destination.name = "Air Terjun Baru"
+        destination.save()
+        self.assertEqual(destination.card_version, version + 1)
+        self.assertIn('Air Terjun Baru', render_cards([destination], self.TEMPLATE)[0])
+    
+    def test_stale_instance_does_not_reuse_version(self):
+        # Test instance lama yang disimpan ulang tetap mendapat versi baru.
+        stale = Destination.objects.get(pk=self.destinations[0].pk)
+        fresh = Destination.objects.get(pk=self.destinations[0].pk)
+        fresh.save()
+        stale.save()
+        self.assertEqual(stale.card_version, fresh.card_version + 1)
+    
+    def test_view_count_changes_key(self):
+        # Test flush tayangan (UPDATE tanpa signal) menghasilkan kunci baru.
+        destination = Destination.objects.get(pk=self.destinations[0].pk)
+        key = card_cache_key(self.TEMPLATE, destination)
+        Destination.objects.filter(pk=destination.pk).update(view_count=F('view_count') + 5)
+        destination.refresh_from_db()
+        self.assertNotEqual(card_cache_key(self.TEMPLATE, destination), key)
+    
+    def test_district_rename_refreshes_cards(self):
+        # Test nama kecamatan baru tampil di kartu yang sudah ter-cache.
+        render_cards(Destination.objects.select_related('district'), self.TEMPLATE)
+        self.district.name = "Gunungsari"
+        self.district.save()
+        cards = render_cards(Destination.objects.select_related('district'), self.TEMPLATE)
+        self.assertTrue(all('Gunungsari' in card for card in cards))
+    
+    def test_list_page_renders_cached_cards(self):
+        # Test halaman daftar memakai fragmen kartu dari cache.
+        response = self.client.get(reverse('core:destination_list'))
+        self.assertContains(response, 'Air Terjun 2')
+        self.assertTrue(cache.get(card_cache_key(self.TEMPLATE, response.context['destination_list'][0])))
+
+
+class DestinationCoordinatesTest(TestCase):
+    # Test cases untuk koordinat dari URL Maps, indeks geohash & destinasi terdekat.
+    
+    @staticmethod
+    def embed_url(lat, lng):
+        return (
+            'https://www.google.com/maps/embed?pb=!1m18!1m12!1m3!1d3946.0'
+            f'!2d{lng:.6f}!3d{lat:.6f}!2m3!1f0!2f0!3f0!3m2!1i1024!2i768!4f13.1!5e0!3m2!1sid!2sid'
+        )
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.district = District.objects.create(name="Batu Layar")
+        rng = random.Random(11)
+        # Sebagian rapat di sekitar Senggigi, sebagian jarang (memaksa sel lebih kasar)
+        points = [(-8.49 + rng.uniform(-0.01, 0.01), 116.04 + rng.uniform(-0.01, 0.01)) for _ in range(20)]
+        points += [(rng.uniform(-8.9, -8.3), rng.uniform(115.8, 116.3)) for _ in range(10)]
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Titik {index}", description="Titik peta", district=cls.district,
+                maps_embed_url=cls.embed_url(lat, lng), main_image='destinations/primary/missing.jpg'
+            )
+            for index, (lat, lng) in enumerate(points)
+        ]
+    
+    def setUp(self):
+        cache.clear()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+    
+    def test_parse_coordinates_from_maps_urls(self):
+        # Test format embed (!2d lng !3d lat), tautan @lat,lng dan parameter q=.
+        self.assertEqual(parse_coordinates(self.embed_url(-8.5, 116.05)), (-8.5, 116.05))
+        self.assertEqual(
+            parse_coordinates('https://www.google.com/maps/place/Senggigi/@-8.4912,116.0421,15z'),
+            (-8.4912, 116.0421),
+        )
+        self.assertEqual(parse_coordinates('https://maps.google.com/?q=-8.73%2C115.92'), (-8.73, 115.92))
+        self.assertIsNone(parse_coordinates('https://www.google.com/maps/embed?pb=!1m18!2sSenggigi'))
+        self.assertIsNone(parse_coordinates('https://maps.google.com/?q=-98.1,115.9'))
+        self.assertIsNone(parse_coordinates(''))
+    
+    def test_geohash_encode_and_neighbours(self):
+        # Test nilai geohash standar dan 9 sel tetangga yang berbeda.
+        self.assertEqual(encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        lat_min, lat_max, lng_min, lng_max = bounds('u4pruyd')
+        self.assertTrue(lat_min <= 57.64911 <= lat_max and lng_min <= 10.40744 <= lng_max)
+        cells = neighbours('u4pruyd')
+        self.assertEqual(len(set(cells)), 9)
+        self.assertIn('u4pruyd', cells)
+    
+    def test_save_extracts_coordinates_from_iframe(self):
+        # Test save() mengisi latitude/longitude/geohash dan mengosongkannya jika URL tanpa koordinat.
+        destination = self.destinations[0]
+        destination.maps_embed_url = f'<iframe src="{self.embed_url(-8.6123, 116.1)}" width="600"></iframe>'
+        destination.save()
+        destination.refresh_from_db()
+        self.assertEqual((destination.latitude, destination.longitude), (-8.6123, 116.1))
+        self.assertEqual(destination.geohash, encode(-8.6123, 116.1))
+        destination.maps_embed_url = ''
+        destination.save()
+        self.assertIsNone(destination.latitude)
+        self.assertEqual(destination.geohash, '')
+        self.assertEqual(maps.nearby_destinations(destination), [])
+    
+    def test_nearby_matches_brute_force(self):
+        # Test hasil grid sama dengan mengurutkan jarak ke semua destinasi.
+        rows = list(Destination.objects.values_list('pk', 'latitude', 'longitude'))
+        for pk, lat, lng in rows:
+            expected = sorted((haversine_km(lat, lng, a, b), other) for other, a, b in rows if other != pk)[:4]
+            found = maps.find_nearby(Destination.objects.get(pk=pk), 4)
+            self.assertEqual([other for other, _ in found], [other for _, other in expected])
+    
+    def test_nearby_is_cached_per_catalog_version(self):
+        # Test hasil grid di-cache: permintaan berikutnya hanya satu query instance.
+        destination = Destination.objects.get(pk=self.destinations[0].pk)
+        first = maps.nearby_destinations(destination)
+        self.assertEqual(len(first), 4)
+        self.assertTrue(all(hasattr(item, 'distance_km') for item in first))
+        with self.assertNumQueries(1):
+            self.assertEqual(maps.nearby_destinations(destination), first)
+    
+    def test_detail_page_lists_nearby_destinations(self):
+        # Test halaman detail menampilkan destinasi terdekat.
+        destination = self.destinations[0]
+        response = self.client.get(reverse('core:destination_detail', args=[destination.slug]))
+        nearby = response.context['nearby_destinations']
+        self.assertEqual([item.pk for item in nearby], [pk for pk, _ in maps.find_nearby(destination, 4)])
+        self.assertContains(response, 'Nearby Destinations')
+        self.assertContains(response, nearby[0].name)
+    
+    def test_sparse_detail_page_stays_within_query_budget(self):
+        # Test destinasi terpencil (Sumbawa): pencarian melebar ke semua presisi, tetap dalam anggaran strict.
+        remote = Destination.objects.create(
+            name="Titik Sumbawa", description="Jauh dari Lombok", district=self.district,
+            maps_embed_url=self.embed_url(-8.5, 117.4), main_image='destinations/primary/missing.jpg'
+        )
+        url = reverse('core:destination_detail', args=[remote.slug])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['nearby_destinations']), 4)
+        self.assertEqual(len(ctx.captured_queries), 2 + len(maps.NEARBY_PRECISIONS) + 1)
+        self.assertLessEqual(len(ctx.captured_queries), settings.QUERY_BUDGETS['core:destination_detail'])
+    
+    def test_backfill_command_and_geojson_snapshot(self):
+        # Test backfill_coordinates mengisi baris lama lalu menulis snapshot GeoJSON (.gz).
+        Destination.objects.update(latitude=None, longitude=None, geohash='')
+        Destination.objects.filter(pk=self.destinations[-1].pk).update(maps_embed_url='')
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        out = io.StringIO()
+        with override_settings(MEDIA_ROOT=media_root):
+            call_command('backfill_coordinates', '--batch-size', '7', stdout=out)
+        self.assertIn('Located: 29', out.getvalue())
+        self.assertEqual(Destination.objects.exclude(geohash='').count(), 29)
+        with gzip.open(os.path.join(media_root, maps.GEOJSON_SNAPSHOT_NAME + '.gz')) as handle:
+            snapshot = json.load(handle)
+        self.assertEqual(len(snapshot['features']), 29)
+        feature = next(item for item in snapshot['features'] if item['id'] == self.destinations[0].pk)
+        lat, lng = parse_coordinates(self.destinations[0].maps_embed_url)
+        self.assertEqual(feature['geometry']['coordinates'], [round(lng, 6), round(lat, 6)])
+        self.assertEqual(feature['properties']['district'], 'Batu Layar')
+        storage = Destination._meta.get_field('main_image').storage
+        self.assertEqual(feature['properties']['image'], storage.url('destinations/primary/missing.jpg'))
+    
+    def test_geojson_snapshot_writes_unique_temp_files(self):
+        # Test snapshot ditulis lewat file temp unik; file biasa diganti sebelum .gz.
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        replaced = []
+        real_replace = os.replace
+        
+        def replace(source, target):
+            replaced.append((os.path.dirname(source), os.path.basename(target)))
+            real_replace(source, target)
+        
+        with override_settings(MEDIA_ROOT=media_root), mock.patch.object(maps.os, 'replace', replace):
+            count = maps.write_geojson_snapshot()
+            maps.write_geojson_snapshot()
+        directory, name = os.path.split(os.path.join(media_root, maps.GEOJSON_SNAPSHOT_NAME))
+        self.assertEqual(replaced, [(directory, name), (directory, f'{name}.gz')] * 2)
+        self.assertEqual(sorted(os.listdir(directory)), [name, f'{name}.gz'])
+        self.assertEqual(oct(os.stat(os.path.join(directory, name)).st_mode & 0o777), oct(0o644))
+        path = os.path.join(directory, name)
+        with open(path, 'rb') as plain, gzip.open(f'{path}.gz') as packed:
+            self.assertEqual(plain.read(), packed.read())
+        self.assertEqual(count, 30)
+        # Dua penulis bersamaan mendapat file temp yang berbeda
+        self.assertNotEqual(maps._write_temp(path, b'a'), maps._write_temp(path, b'b'))
+    
+    def test_catalog_changes_refresh_geojson_snapshot(self):
+        # Test simpan/hapus destinasi & kecamatan menjadwalkan penulisan ulang snapshot setelah commit.
+        destination = self.destinations[0]
+        with mock.patch.object(maps.snapshot_refresher, 'schedule') as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                destination.save()
+            schedule.assert_not_called()
+            with override_settings(GEOJSON_SNAPSHOT_AUTO_REFRESH=True):
+                with self.captureOnCommitCallbacks(execute=True):
+                    destination.name = "Titik Baru"
+                    destination.save()
+                self.assertEqual(schedule.call_count, 1)
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.district.save()
+                    destination.delete()
+                self.assertEqual(schedule.call_count, 3)
+    
+    def test_snapshot_refresher_coalesces_changes(self):
+        # Test perubahan beruntun sebelum thread latar berjalan hanya menghasilkan satu penulisan.
+        refresher = maps.SnapshotRefresher()
+        refresher._executor = mock.Mock()
+        refresher.schedule()
+        refresher.schedule()
+        self.assertEqual(refresher._executor.submit.call_count, 1)
+        with mock.patch.object(maps, 'write_geojson_snapshot') as write, mock.patch.object(maps, 'close_old_connections'):
+            refresher._refresh()
+        write.assert_called_once_with()
+        refresher.schedule()
+        self.assertEqual(refresher._executor.submit.call_count, 2)
+
+
+class StaticSiteExportTest(TestCase):
+    # Test cases untuk command export_static_site (penuh & inkremental).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Pantai", icon="waves")
+        cls.district = District.objects.create(name="Sekotong")
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Gili {index}", description="Pulau kecil", category=cls.category,
+                district=cls.district, main_image='destinations/primary/missing.jpg'
+            )
+            for index in range(8)
+        ]
+    
+    def setUp(self):
+        cache.clear()
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output, ignore_errors=True)
+    
+    def export(self, **options):
+        out = io.StringIO()
+        call_command('export_static_site', output=self.output, workers=1, no_assets=True, stdout=out, **options)
+        return out.getvalue()
+    
+    def exists(self, path):
+        return os.path.exists(os.path.join(self.output, path))
+    
+    def test_full_export_writes_pages_and_sitemap(self):
+        # Test semua halaman publik, halaman ke-2, 404 dan sitemap ditulis.
+        self.export()
+        destination = self.destinations[0]
+        for path in (
+            'index.html', 'about/index.html', 'destinations/index.html', 'destinations/page/2/index.html',
+            f'destinations/{destination.slug}/index.html', f'categories/{self.category.slug}/index.html',
+            f'districts/{self.district.slug}/index.html', 'categories/index.html', '404.html',
+        ):
+            self.assertTrue(self.exists(path), path)
+        with open(os.path.join(self.output, f'destinations/{destination.slug}/index.html'), encoding='utf-8') as handle:
+            self.assertIn('Gili 0', handle.read())
+        with open(os.path.join(self.output, 'sitemap.xml'), encoding='utf-8') as handle:
+            sitemap = handle.read()
+        self.assertIn(f'http://localhost/destinations/{destination.slug}/', sitemap)
+        self.assertNotIn('?page=', sitemap)
+        # Render ekspor tidak dihitung sebagai tayangan
+        self.assertEqual(view_counter.pending(destination.pk), 0)
+    
+    def test_incremental_export_renders_only_changed_pages(self):
+        # Test ekspor ulang hanya merender halaman yang memuat baris berubah.
+        self.export()
+        self.assertIn('rendered 0,', self.export())
+        destination = Destination.objects.get(pk=self.destinations[0].pk)
+        destination.name = "Gili Baru"
+        destination.save()
+        output = self.export()
+        # Detail + halaman daftar, kategori & kecamatan yang memuatnya
+        self.assertIn('rendered 4,', output)
+        with open(os.path.join(self.output, f'destinations/{destination.slug}/index.html'), encoding='utf-8') as handle:
+            self.assertIn('Gili Baru', handle.read())
+    
+    def test_deleted_destination_page_is_removed(self):
+        # Test halaman destinasi yang dihapus ikut dihapus dari hasil ekspor.
+        self.export()
+        destination = self.destinations[1]
+        destination.delete()
+        self.assertIn('removed 1', self.export())
+        self.assertFalse(self.exists(f'destinations/{destination.slug}'))
+    
+    def test_full_flag_rerenders_everything(self):
+        # Test --full mengabaikan state ekspor sebelumnya.
+        self.export()
+        self.assertNotIn('rendered 0,', self.export(full=True))
+
+
+class DestinationViewTest(TempMediaRootMixin, TestCase):
     # Test cases untuk views Destination.
     
     @classmethod
@@ -225,6 +861,7 @@ class DestinationViewTest(TestCase):
     def setUp(self):
         # Setup client untuk setiap test.
         self.client = Client()
+        view_counter.clear()
     
     def test_destination_list_view_status_code(self):
         # Test view list destinasi mengembalikan 200.
@@ -262,9 +899,18 @@ class DestinationViewTest(TestCase):
         self.client.get(
             reverse('core:destination_detail', kwargs={'slug': self.destination.slug})
         )
+        view_counter.flush()
         self.destination.refresh_from_db()
         self.assertEqual(self.destination.view_count, initial_views + 1)
     
+    def test_destination_detail_shows_buffered_views(self):
+        # Test halaman menampilkan total DB + buffer sebelum flush.
+        view_counter.increment(self.destination.pk, 4)
+        response = self.client.get(
+            reverse('core:destination_detail', kwargs={'slug': self.destination.slug})
+        )
+        self.assertEqual(response.context['destination'].view_count, self.destination.view_count + 5)
+    
     def test_destination_detail_404_for_invalid_slug(self):
         # Test 404 untuk slug yang tidak ada.
         response = self.client.get(
@@ -290,6 +936,1461 @@ class DestinationViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class ViewCountBufferTest(TestCase):
+    # Test cases untuk buffer penghitung tayangan (write-behind).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Destination.objects.create(name="Pantai Satu", description="Test", main_image="destinations/primary/satu.jpg")
+        cls.second = Destination.objects.create(name="Pantai Dua", description="Test", main_image="destinations/primary/dua.jpg")
+    
+    def test_increment_does_not_write_until_flush(self):
+        # Test increment hanya mengubah buffer, bukan database.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1000)
+        self.assertEqual(buffer.increment(self.first.pk), 1)
+        self.assertEqual(buffer.increment(self.first.pk), 2)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 0)
+        self.assertEqual(buffer.pending(self.first.pk), 2)
+    
+    def test_flush_writes_all_rows_in_one_query(self):
+        # Test flush menulis semua destinasi dalam satu statement UPDATE.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1000)
+        buffer.increment(self.first.pk, 3)
+        buffer.increment(self.second.pk, 7)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(buffer.flush(), 2)
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "core_destination"')]
+        self.assertEqual(len(updates), 1)
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.view_count, 3)
+        self.assertEqual(self.second.view_count, 7)
+        self.assertEqual(buffer.pending(self.first.pk), 0)
+    
+    def test_threshold_triggers_flush(self):
+        # Test buffer otomatis flush setelah N hit.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=3)
+        for _ in range(3):
+            buffer.increment(self.first.pk)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 3)
+    
+    def test_interval_flush_without_new_hits(self):
+        # Test timer mem-flush setelah interval lewat walau tidak ada kunjungan baru (jam di-mock).
+        with mock.patch('apps.core.counters.time.monotonic', return_value=1000.0) as clock:
+            buffer = ViewCountBuffer(flush_interval=10, flush_threshold=1000, flush_timer=False)
+            buffer.increment(self.first.pk, 4)
+            clock.return_value = 1009.0
+            self.assertFalse(buffer.flush_if_due())
+            self.assertEqual(buffer.pending(self.first.pk), 4)
+            clock.return_value = 1010.0
+            self.assertTrue(buffer.flush_if_due())
+            self.assertFalse(buffer.flush_if_due())
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 4)
+        self.assertEqual(buffer.pending(self.first.pk), 0)
+    
+    def test_timer_thread_started_once_per_process(self):
+        # Test hit pertama menyalakan satu thread timer daemon; hit berikutnya tidak menambah thread.
+        buffer = ViewCountBuffer(flush_interval=10, flush_threshold=1000, flush_timer=True)
+        with mock.patch('apps.core.counters.threading.Thread') as thread:
+            buffer.increment(self.first.pk)
+            buffer.increment(self.second.pk)
+        thread.assert_called_once_with(target=buffer._run_timer, name='view-count-timer', daemon=True)
+        thread.return_value.start.assert_called_once_with()
+        with mock.patch('apps.core.counters.os.getpid', return_value=-1), \
+                mock.patch('apps.core.counters.threading.Thread') as thread:
+            # Proses hasil fork tidak mewarisi thread: timer dibuat ulang
+            buffer.increment(self.first.pk)
+        thread.return_value.start.assert_called_once_with()
+    
+    def test_empty_flush_is_noop(self):
+        # Test flush tanpa data tidak menjalankan query.
+        buffer = ViewCountBuffer()
+        with self.assertNumQueries(0):
+            self.assertEqual(buffer.flush(), 0)
+    
+    def test_locked_flush_keeps_counts_and_page_working(self):
+        # Test flush yang gagal karena database terkunci tidak menggagalkan request; hitungan kembali ke buffer.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=2)
+        buffer.increment(self.first.pk)
+        with mock.patch('apps.core.counters.record_views', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('apps.core.counters', 'WARNING'):
+                self.assertEqual(buffer.increment(self.first.pk), 2)
+        self.assertEqual(buffer.pending(self.first.pk), 2)
+        buffer.flush()
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 2)
+
+
+class SQLiteProfileTest(SimpleTestCase):
+    # Test cases untuk profil SQLite production (WAL, pragma, retry saat terkunci).
+    databases = {'default'}
+    # Pragma profil prod/bench (WAL), apa pun profil test runner
+    PRAGMAS = {**settings.SQLITE_WAL_PRAGMAS, **settings.SQLITE_PRAGMAS}
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'stress.sqlite3')
+        setup = self.connect(self.PRAGMAS)
+        setup.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, views INTEGER)')
+        setup.executemany('INSERT INTO item (views) VALUES (?)', [(0,)] * 100)
+        setup.close()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def connect(self, pragmas):
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        apply_pragmas(db, pragmas)
+        return db
+    
+    def test_pragmas_applied_to_django_connection(self):
+        # Test pragma dipasang lewat connection_created.
+        connection.ensure_connection()
+        busy_timeout = connection.connection.execute('PRAGMA busy_timeout').fetchone()[0]
+        self.assertEqual(busy_timeout, settings.SQLITE_PRAGMAS['busy_timeout'])
+    
+    def test_wal_reader_not_blocked_by_writer(self):
+        # Test dengan WAL pembaca langsung membaca snapshot lama saat penulis memegang lock.
+        writer = self.connect(self.PRAGMAS)
+        writer.execute('BEGIN EXCLUSIVE')
+        writer.execute('UPDATE item SET views = views + 1')
+        reader = self.connect(dict(self.PRAGMAS, busy_timeout=0))
+        started = time.perf_counter()
+        self.assertEqual(reader.execute('SELECT SUM(views) FROM item').fetchone()[0], 0)
+        self.assertLess(time.perf_counter() - started, 0.05)
+        writer.execute('COMMIT')
+        self.assertEqual(reader.execute('SELECT SUM(views) FROM item').fetchone()[0], 100)
+        writer.close()
+        reader.close()
+    
+    def test_rollback_journal_reader_is_blocked(self):
+        # Test pembanding: tanpa WAL pembaca terkunci selama penulis memegang lock.
+        writer = self.connect({'journal_mode': 'DELETE'})
+        writer.execute('BEGIN EXCLUSIVE')
+        reader = self.connect({'busy_timeout': 0})
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute('SELECT SUM(views) FROM item').fetchone()
+        writer.execute('COMMIT')
+        writer.close()
+        reader.close()
+    
+    def test_concurrent_readers_do_not_stall(self):
+        # Stress test: penulis terus mengambil lock tulis, pembaca tanpa busy_timeout tidak pernah gagal.
+        deadline = time.monotonic() + 0.5
+        errors = []
+        reads = []
+        
+        def write():
+            db = self.connect(self.PRAGMAS)
+            while time.monotonic() < deadline:
+                db.execute('BEGIN IMMEDIATE')
+                db.execute('UPDATE item SET views = views + 1 WHERE id % 7 = 0')
+                time.sleep(0.002)
+                db.execute('COMMIT')
+            db.close()
+        
+        def read():
+            db = self.connect(dict(self.PRAGMAS, busy_timeout=0))
+            while time.monotonic() < deadline:
+                try:
+                    db.execute('SELECT SUM(views) FROM item').fetchone()
+                    reads.append(1)
+                except sqlite3.OperationalError as exc:
+                    errors.append(exc)
+            db.close()
+        
+        threads = [threading.Thread(target=write), threading.Thread(target=write)]
+        threads += [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertGreater(len(reads), 0)
+    
+    def test_retry_on_lock_backs_off_and_succeeds(self):
+        # Test penulisan dicoba ulang saat terkunci, error lain langsung dilempar.
+        calls = []
+        
+        @retry_on_lock(attempts=4, delay=0)
+        def write():
+            calls.append(1)
+            if len(calls) < 3:
+                raise OperationalError('database is locked')
+            return 'ok'
+        
+        self.assertEqual(write(), 'ok')
+        self.assertEqual(len(calls), 3)
+        
+        @retry_on_lock(attempts=4, delay=0)
+        def broken():
+            calls.append(1)
+            raise OperationalError('no such table: item')
+        
+        calls.clear()
+        with self.assertRaises(OperationalError):
+            broken()
+        self.assertEqual(len(calls), 1)
+    
+    def test_retry_gives_up_and_skips_outer_transaction(self):
+        # Test retry berhenti setelah batas percobaan dan tidak berjalan di dalam transaksi luar.
+        calls = []
+        
+        @retry_on_lock(attempts=3, delay=0)
+        def write():
+            calls.append(1)
+            raise OperationalError('database is locked')
+        
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 3)
+        calls.clear()
+        with transaction.atomic():
+            with self.assertRaises(OperationalError):
+                write()
+        self.assertEqual(len(calls), 1)
+
+
+class WriteRetryTest(TransactionTestCase):
+    # Test retry "database is locked" pada jalur tulis lain (import batch, admin).
+    # TransactionTestCase: retry tidak berjalan di dalam transaksi luar TestCase.
+    
+    def setUp(self):
+        cache.clear()
+    
+    def flaky(self, original, calls):
+        # Gagal terkunci sekali, lalu memanggil fungsi asli
+        def wrapper(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return original(*args, **kwargs)
+        return wrapper
+    
+    @override_settings(DB_WRITE_RETRY_DELAY=0)
+    def test_import_batch_is_retried_with_same_slugs(self):
+        # Test batch import diulang utuh; slug yang dilepas dipakai lagi (tanpa akhiran -1).
+        calls = []
+        with mock.patch.object(QuerySet, 'bulk_create', self.flaky(QuerySet.bulk_create, calls)):
+            stats = CatalogImporter(default_model='destination').run([
+                {'name': 'Gili Nanggu', 'description': 'Pulau', 'main_image': 'x.jpg'},
+            ])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(stats.created['destination'], 1)
+        self.assertEqual(list(Destination.objects.values_list('slug', flat=True)), ['gili-nanggu'])
+    
+    @override_settings(DB_WRITE_RETRY_DELAY=0)
+    def test_admin_save_is_retried(self):
+        # Test simpan dari admin diulang jika transaksinya gagal karena terkunci.
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        calls = []
+        with mock.patch.object(
+            admin.ModelAdmin, '_changeform_view', self.flaky(admin.ModelAdmin._changeform_view, calls),
+        ):
+            response = self.client.post(reverse('admin:core_district_add'), {'name': 'Gerung', 'description': ''})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(District.objects.filter(name='Gerung').exists())
+
+
+    @override_settings(DB_WRITE_RETRY_DELAY=0, DB_WRITE_RETRIES=2, IMAGE_DERIVATIVES_EAGER=False)
+    def test_failed_admin_save_removes_uploaded_files(self):
+        # Test upload dari percobaan admin yang gagal dihapus; retry yang berhasil menyisakan satu file.
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        image = io.BytesIO()
+        Image.new('RGB', (100, 100), color='blue').save(image, 'JPEG')
+        
+        def post():
+            upload = SimpleUploadedFile('gerung.jpg', image.getvalue(), content_type='image/jpeg')
+            return self.client.post(reverse('admin:core_district_add'), {'name': 'Gerung', 'description': '', 'thumbnail': upload})
+        
+        def uploads():
+            directory = os.path.join(media_root, 'districts')
+            return os.listdir(directory) if os.path.isdir(directory) else []
+        
+        model_admin = admin.site._registry[District]
+        with override_settings(MEDIA_ROOT=media_root):
+            with mock.patch.object(model_admin, 'save_related', side_effect=OperationalError('database is locked')):
+                with self.assertRaises(OperationalError):
+                    post()
+            self.assertEqual(uploads(), [])
+            self.assertFalse(District.objects.exists())
+            calls = []
+            with mock.patch.object(model_admin, 'save_related', self.flaky(model_admin.save_related, calls)):
+                self.assertEqual(post().status_code, 302)
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(uploads(), [os.path.basename(District.objects.get().thumbnail.name)])
+
+
+class SettingsProfileTest(SimpleTestCase):
+    # Test profil settings (DJANGO_PROFILE) dimuat di proses terpisah,
+    # karena settings hanya dibaca sekali per proses.
+    
+    PROBE = (
+        'import json, config.settings as s; '
+        'print(json.dumps({"debug": s.DEBUG, "apps": s.INSTALLED_APPS, "middleware": s.MIDDLEWARE, '
+        '"templates": s.TEMPLATES[0], "cache": s.CACHES["default"]["BACKEND"], '
+        '"database": s.DATABASES["default"], "pragmas": s.SQLITE_PRAGMAS}, default=str))'
+    )
+    
+    def load(self, **env):
+        environ = {key: value for key, value in os.environ.items() if not key.startswith('DJANGO_')}
+        environ.update(env)
+        return subprocess.run(
+            [sys.executable, '-c', self.PROBE], cwd=settings.BASE_DIR, env=environ,
+            capture_output=True, text=True,
+        )
+    
+    def test_dev_is_default(self):
+        # Test tanpa DJANGO_PROFILE: DEBUG aktif dan app dev terpasang.
+        result = self.load()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        loaded = json.loads(result.stdout)
+        self.assertTrue(loaded['debug'])
+        self.assertIn('django_browser_reload', loaded['apps'])
+        # WAL, BEGIN IMMEDIATE & koneksi persisten hanya untuk prod/bench
+        self.assertNotIn('journal_mode', loaded['pragmas'])
+        self.assertNotIn('OPTIONS', loaded['database'])
+        self.assertEqual(loaded['database']['CONN_MAX_AGE'], 0)
+    
+    def test_bench_drops_dev_apps_and_caches_templates(self):
+        # Test profil bench: tanpa app/middleware dev, loader template ter-cache.
+        result = self.load(DJANGO_PROFILE='bench')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        loaded = json.loads(result.stdout)
+        self.assertFalse(loaded['debug'])
+        self.assertNotIn('django_browser_reload', loaded['apps'])
+        self.assertNotIn('tailwind', loaded['apps'])
+        self.assertNotIn('django_browser_reload.middleware.BrowserReloadMiddleware', loaded['middleware'])
+        self.assertFalse(loaded['templates']['APP_DIRS'])
+        self.assertEqual(loaded['templates']['OPTIONS']['loaders'][0][0], 'django.template.loaders.cached.Loader')
+        self.assertEqual(loaded['pragmas']['journal_mode'], 'WAL')
+        self.assertEqual(loaded['database']['OPTIONS'], {'transaction_mode': 'IMMEDIATE'})
+        self.assertEqual(loaded['database']['CONN_MAX_AGE'], 60)
+    
+    def test_prod_refuses_insecure_config(self):
+        # Test profil prod gagal start dengan secret key dev & tanpa host.
+        result = self.load(DJANGO_PROFILE='prod')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('ImproperlyConfigured', result.stderr)
+        self.assertIn('DJANGO_SECRET_KEY', result.stderr)
+        self.assertIn('DJANGO_ALLOWED_HOSTS', result.stderr)
+        result = self.load(DJANGO_PROFILE='prod', DJANGO_SECRET_KEY='k' * 60, DJANGO_ALLOWED_HOSTS='*')
+        self.assertIn('no "*"', result.stderr)
+    
+    def test_prod_starts_with_valid_config(self):
+        # Test profil prod berhasil dengan secret key & host yang benar.
+        result = self.load(
+            DJANGO_PROFILE='prod', DJANGO_SECRET_KEY='k' * 60, DJANGO_ALLOWED_HOSTS='example.com',
+            DJANGO_SINGLE_PROCESS='1',
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        loaded = json.loads(result.stdout)
+        self.assertFalse(loaded['debug'])
+        self.assertNotIn('django_browser_reload', loaded['apps'])
+    
+    def test_prod_refuses_process_local_cache(self):
+        # Test profil prod tanpa Redis gagal start kecuali satu proses dinyatakan.
+        result = self.load(DJANGO_PROFILE='prod', DJANGO_SECRET_KEY='k' * 60, DJANGO_ALLOWED_HOSTS='example.com')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('ImproperlyConfigured', result.stderr)
+        self.assertIn('DJANGO_REDIS_URL', result.stderr)
+        self.assertIn('DJANGO_SINGLE_PROCESS', result.stderr)
+    
+    def test_unknown_profile_is_rejected(self):
+        # Test nilai DJANGO_PROFILE yang tidak dikenal ditolak.
+        result = self.load(DJANGO_PROFILE='staging')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('DJANGO_PROFILE must be one of', result.stderr)
+
+
+class DatabaseRouterTest(SimpleTestCase):
+    # Test cases untuk router primary/replika dan stickiness read-your-writes.
+    
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = routers.PrimaryReplicaRouter()
+    
+    def route(self, method, view, cookies=None, write=False):
+        # Jalankan middleware dengan view palsu; kembalikan (alias baca, response)
+        seen = {}
+        
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            seen['read'] = self.router.db_for_read(Destination)
+            if write:
+                self.router.db_for_write(Destination)
+            return HttpResponse()
+        
+        middleware = routers.ReplicaRoutingMiddleware(get_response)
+        request = getattr(self.factory, method)('/')
+        request.COOKIES.update(cookies or {})
+        response = middleware(request)
+        return seen['read'], response
+    
+    def test_without_request_state_reads_primary(self):
+        # Test di luar request (command, shell) semua bacaan ke primary.
+        self.assertEqual(self.router.db_for_read(Destination), 'default')
+        self.assertEqual(self.router.db_for_write(Destination), 'default')
+    
+    def test_primary_only_apps_ignore_replica(self):
+        # Test sesi & user tetap dibaca dari primary walau request memakai replika.
+        token = routers._state.set(routers.RoutingState('replica1'))
+        try:
+            self.assertEqual(self.router.db_for_read(Destination), 'replica1')
+            self.assertEqual(self.router.db_for_read(User), 'default')
+            # Statistik di-cache bersama dengan admin: selalu dari primary
+            self.assertEqual(self.router.db_for_read(CatalogStats), 'default')
+        finally:
+            routers._state.reset(token)
+    
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_replicas_are_not_migrated(self):
+        # Test replika tidak dimigrasi (disalin lewat sync_replicas).
+        self.assertFalse(self.router.allow_migrate('replica1', 'core'))
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+    
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_marked_view_reads_replica(self):
+        # Test GET ke view @replica_reads dibaca dari replika, view lain dari primary.
+        marked = routers.replica_reads(lambda request: None)
+        self.assertEqual(self.route('get', marked)[0], 'replica1')
+        self.assertEqual(self.route('get', lambda request: None)[0], 'default')
+        self.assertEqual(self.route('post', marked)[0], 'default')
+    
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        # Test tanpa replika view bertanda tetap membaca primary.
+        marked = routers.replica_reads(lambda request: None)
+        self.assertEqual(self.route('get', marked)[0], 'default')
+    
+    @override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_SECONDS=10)
+    def test_write_request_sets_sticky_cookie(self):
+        # Test request tulis memberi cookie; request berikutnya membaca primary.
+        marked = routers.replica_reads(lambda request: None)
+        _, response = self.route('post', marked, write=True)
+        cookie = response.cookies[routers.STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertEqual(self.route('get', marked, cookies={routers.STICKY_COOKIE: cookie.value})[0], 'default')
+        expired = {routers.STICKY_COOKIE: str(time.time() - 1)}
+        self.assertEqual(self.route('get', marked, cookies=expired)[0], 'replica1')
+        self.assertNotIn(routers.STICKY_COOKIE, self.route('post', marked)[1].cookies)
+    
+    def test_public_catalog_views_are_marked(self):
+        # Test view katalog publik boleh membaca replika, detail destinasi (menulis tayangan) tidak.
+        from apps.base.views import HomeView
+        from . import views
+        for view in (HomeView, views.DestinationListView, views.CategoryListView, views.DistrictDetailView):
+            self.assertTrue(routers._allows_replica(view.as_view()), view)
+        self.assertTrue(routers._allows_replica(views.surprise_me))
+        self.assertFalse(routers._allows_replica(views.DestinationDetailView.as_view()))
+
+
+class ViewAnalyticsTest(TestCase):
+    # Test cases untuk bucket analitik tayangan dan rollup.
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Destination.objects.create(name="Pantai Satu", description="Test", main_image="destinations/primary/satu.jpg")
+        cls.second = Destination.objects.create(name="Pantai Dua", description="Test", main_image="destinations/primary/dua.jpg")
+    
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.make_aware(datetime(2026, 6, 15, 10, 30))
+    
+    def hour(self, days=0, hours=0):
+        return analytics.bucket_start(self.now - timedelta(days=days, hours=hours), DestinationViewBucket.HOUR)
+    
+    def bucket_views(self, destination, granularity):
+        return dict(
+            DestinationViewBucket.objects.filter(destination=destination, granularity=granularity)
+            .values_list('bucket_start', 'views')
+        )
+    
+    def test_flush_writes_hourly_buckets(self):
+        # Test flush buffer membuat bucket per jam lalu menambahkannya pada flush berikutnya.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1000)
+        with mock.patch('apps.core.counters.timezone.now', return_value=self.now):
+            buffer.increment(self.first.pk, 3)
+            buffer.increment(self.second.pk)
+            buffer.flush()
+            buffer.increment(self.first.pk, 2)
+            buffer.flush()
+        self.assertEqual(self.bucket_views(self.first, 'hour'), {self.hour(): 5})
+        self.assertEqual(self.bucket_views(self.second, 'hour'), {self.hour(): 1})
+    
+    @override_settings(VIEW_ANALYTICS_ENABLED=False)
+    def test_disabled_analytics_skips_buckets(self):
+        # Test analitik nonaktif tidak menulis bucket.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1000)
+        buffer.increment(self.first.pk)
+        buffer.flush()
+        self.assertFalse(DestinationViewBucket.objects.exists())
+    
+    def test_upsert_in_single_statement(self):
+        # Test upsert menjumlahkan ke bucket lama dengan satu INSERT ... ON CONFLICT.
+        analytics.upsert_buckets({(self.first.pk, 'hour', self.hour()): 4})
+        counts = {
+            (self.first.pk, 'hour', self.hour()): 6,
+            (self.first.pk, 'hour', self.hour(hours=1)): 1,
+            (self.second.pk, 'hour', self.hour()): 2,
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(analytics.upsert_buckets(counts), 3)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.bucket_views(self.first, 'hour'), {self.hour(): 10, self.hour(hours=1): 1})
+    
+    def test_upsert_skips_deleted_destination(self):
+        # Test tayangan untuk destinasi yang sudah dihapus diabaikan.
+        gone = Destination.objects.create(name="Pantai Hilang", description="Test", main_image="destinations/primary/hilang.jpg")
+        pk = gone.pk
+        gone.delete()
+        written = analytics.upsert_buckets({
+            (pk, 'hour', self.hour()): 3,
+            (self.first.pk, 'hour', self.hour()): 1,
+        })
+        self.assertEqual(written, 1)
+        self.assertEqual(DestinationViewBucket.objects.count(), 1)
+    
+    def test_top_destinations_in_range(self):
+        # Test destinasi terpopuler hanya menghitung bucket dalam rentang.
+        analytics.upsert_buckets({
+            (self.first.pk, 'hour', self.hour()): 2,
+            (self.first.pk, 'hour', self.hour(hours=2)): 2,
+            (self.second.pk, 'hour', self.hour(hours=1)): 3,
+            (self.second.pk, 'hour', self.hour(days=10)): 50,
+        })
+        top = analytics.top_destinations(self.now - timedelta(days=1), self.now)
+        self.assertEqual(top, [(self.first.pk, 4), (self.second.pk, 3)])
+        self.assertEqual(analytics.top_destinations(self.now - timedelta(days=1), self.now, limit=1), [(self.first.pk, 4)])
+    
+    def test_rollup_merges_and_prunes(self):
+        # Test rollup menggabungkan bucket per jam lama ke harian dan menghapus yang kedaluwarsa.
+        day = DestinationViewBucket.DAY
+        analytics.upsert_buckets({
+            (self.first.pk, 'hour', self.hour()): 1,
+            (self.first.pk, 'hour', self.hour(days=10)): 2,
+            (self.first.pk, 'hour', self.hour(days=10, hours=1)): 3,
+            (self.first.pk, 'hour', self.hour(days=500)): 9,
+            (self.first.pk, day, analytics.bucket_start(self.now - timedelta(days=10), day)): 4,
+        })
+        merged, pruned = analytics.rollup(now=self.now, hourly_days=7, retention_days=400)
+        self.assertEqual(merged, 3)
+        self.assertEqual(pruned, 1)
+        self.assertEqual(self.bucket_views(self.first, 'hour'), {self.hour(): 1})
+        self.assertEqual(
+            self.bucket_views(self.first, day),
+            {analytics.bucket_start(self.now - timedelta(days=10), day): 9},
+        )
+        # Total tayangan dalam rentang tidak berubah oleh rollup
+        series = analytics.daily_views(self.first.pk, self.now - timedelta(days=30), self.now + timedelta(days=1))
+        self.assertEqual(series, {
+            (self.now - timedelta(days=10)).date(): 9,
+            self.now.date(): 1,
+        })
+    
+    def test_rollup_command(self):
+        # Test command rollup_view_analytics berjalan dan melaporkan hasil.
+        out = io.StringIO()
+        call_command('rollup_view_analytics', stdout=out)
+        self.assertIn('=== DONE ===', out.getvalue())
+
+
+class ResetViewsCommandTest(TestCase):
+    # Test cases untuk command reset_views (set tayangan massal).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.senggigi = Destination.objects.create(name="Pantai Senggigi", description="Test", main_image="destinations/primary/senggigi.jpg")
+        cls.nanggu = Destination.objects.create(name="Gili Nanggu", description="Test", main_image="destinations/primary/nanggu.jpg")
+        cls.other = Destination.objects.create(name="Pantai Lain", description="Test", main_image="destinations/primary/lain.jpg", view_count=5)
+    
+    def setUp(self):
+        cache.clear()
+    
+    def run_command(self, *args, stdin=None):
+        out = io.StringIO()
+        with mock.patch('sys.stdin', io.StringIO(stdin or '')):
+            call_command('reset_views', *args, stdout=out)
+        return out.getvalue()
+    
+    def test_builtin_table_uses_bulk_queries(self):
+        # Test tabel bawaan: satu SELECT ... IN dan satu UPDATE untuk semua baris.
+        with CaptureQueriesContext(connection) as ctx:
+            output = self.run_command()
+        selects = [q for q in ctx.captured_queries if 'WHERE "core_destination"."name" IN' in q['sql']]
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "core_destination"')]
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(len(updates), 1)
+        self.assertIn('Updated: 2 destinations', output)
+        self.assertIn('Not found: Gili Sudak', output)
+        self.senggigi.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.senggigi.view_count, 185)
+        self.assertEqual(self.other.view_count, 5)
+        # bulk_update melewati signal: statistik dibangun ulang
+        self.assertEqual(stats.get_stats().total_views, 185 + 142 + 5)
+    
+    def test_dry_run_writes_nothing(self):
+        # Test --dry-run tidak mengubah database.
+        output = self.run_command('--dry-run')
+        self.assertIn('Dry run', output)
+        self.senggigi.refresh_from_db()
+        self.assertEqual(self.senggigi.view_count, 0)
+    
+    def test_stdin_json_and_csv_file(self):
+        # Test mapping dari stdin (objek JSON) dan dari file CSV.
+        self.run_command('-', '--format', 'json', stdin='{"Pantai Lain": 40}')
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.view_count, 40)
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('name,views\nGili Nanggu,9\n')
+        self.addCleanup(os.remove, handle.name)
+        self.run_command(handle.name)
+        self.nanggu.refresh_from_db()
+        self.assertEqual(self.nanggu.view_count, 9)
+    
+    def test_invalid_count_is_rejected(self):
+        # Test jumlah tayangan tidak valid menghentikan command tanpa menulis.
+        with self.assertRaises(CommandError):
+            self.run_command('-', '--format', 'json', stdin='{"Pantai Lain": -1}')
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.view_count, 5)
+    
+    def test_scale_distributes_total_over_catalog(self):
+        # Test --scale membagi tepat TOTAL tayangan ke seluruh katalog, nama bawaan di peringkat atas.
+        self.run_command('--scale', '1000')
+        counts = dict(Destination.objects.values_list('name', 'view_count'))
+        self.assertEqual(sum(counts.values()), 1000)
+        self.assertGreater(counts['Pantai Senggigi'], counts['Gili Nanggu'])
+        self.assertGreater(counts['Gili Nanggu'], counts['Pantai Lain'])
+
+
+class DestinationSearchTest(TestCase):
+    # Test cases untuk indeks pencarian full-text (FTS5).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.district = District.objects.create(name="Batu Layar")
+        cls.beach = Destination.objects.create(
+            name="Pantai Senggigi",
+            description="Pantai berpasir putih dengan sunset",
+            district=cls.district,
+            main_image="destinations/primary/senggigi.jpg"
+        )
+        cls.temple = Destination.objects.create(
+            name="Pura Batu Bolong",
+            description="Pura di atas batu karang dekat pantai",
+            main_image="destinations/primary/pura.jpg"
+        )
+    
+    def search(self, text):
+        return list(search_destinations(Destination.objects.all(), text))
+    
+    def test_match_query_uses_prefix_tokens(self):
+        # Test input pengguna diubah jadi token prefix.
+        self.assertEqual(build_match_query('Sengg "gili"'), '"sengg"* "gili"*')
+        self.assertEqual(build_match_query('!!!'), '')
+    
+    def test_prefix_search(self):
+        # Test pencarian awalan kata menemukan destinasi.
+        self.assertEqual(self.search('sengg'), [self.beach])
+    
+    def test_name_match_ranks_first(self):
+        # Test kecocokan di nama lebih relevan dibanding di deskripsi.
+        self.assertEqual(self.search('pantai'), [self.beach, self.temple])
+        self.assertEqual(self.search('pura'), [self.temple])
+    
+    def test_district_name_is_indexed(self):
+        # Test nama kecamatan ikut dicari dan diperbarui saat diganti.
+        self.assertEqual(self.search('layar'), [self.beach])
+        self.district.name = "Gunungsari"
+        self.district.save()
+        self.assertEqual(self.search('layar'), [])
+        self.assertEqual(self.search('gunungsari'), [self.beach])
+    
+    def test_index_follows_save_and_delete(self):
+        # Test indeks sinkron saat destinasi diubah dan dihapus.
+        self.temple.name = "Pura Lingsar"
+        self.temple.save()
+        self.assertEqual(self.search('lingsar'), [self.temple])
+        self.temple.delete()
+        self.assertEqual(self.search('lingsar'), [])
+    
+    def test_search_queryset_is_composable(self):
+        # Test hasil pencarian bisa dirangkai dengan select_related, filter & count tanpa extra().
+        queryset = search_destinations(Destination.objects.select_related('district'), 'pantai')
+        self.assertFalse(queryset.query.extra)
+        with self.assertNumQueries(1):
+            results = list(queryset.filter(district__isnull=False))
+            self.assertEqual([item.district.name for item in results], ["Batu Layar"])
+        self.assertEqual(queryset.count(), 2)
+        self.assertLess(queryset[0].search_rank, queryset[1].search_rank)
+    
+    def test_search_index_available_on_sqlite(self):
+        # Test tabel FTS dibuat oleh migrasi di SQLite.
+        if connection.vendor == 'sqlite':
+            self.assertTrue(fts_available())
+
+
+class ImageDerivativeTest(TestCase):
+    # Test cases untuk pipeline gambar turunan (srcset WebP + JPEG).
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            IMAGE_DERIVATIVE_WIDTHS=(160, 320, 640),
+            IMAGE_DERIVATIVES_EAGER=False
+        )
+        self.override.enable()
+        cache.clear()
+    
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def create_destination(self, width=500):
+        image = Image.new('RGB', (width, width // 2), color='red')
+        image_io = io.BytesIO()
+        image.save(image_io, format='JPEG')
+        return Destination.objects.create(
+            name="Gili Nanggu",
+            description="Pulau",
+            main_image=SimpleUploadedFile('gili.jpg', image_io.getvalue(), content_type='image/jpeg')
+        )
+    
+    def test_derivatives_generated_for_smaller_widths(self):
+        # Test turunan dibuat untuk lebar di bawah sumber + lebar sumber.
+        destination = self.create_destination(width=500)
+        manifest = get_derivatives(destination.main_image)
+        self.assertEqual(manifest['widths'], [160, 320, 500])
+        for ext in ('webp', 'jpg'):
+            for width, path in manifest['files'][ext].items():
+                self.assertIn(manifest['hash'], path)
+                with Image.open(f"{self.media_root}/{path}") as derivative:
+                    self.assertEqual(derivative.width, int(width))
+    
+    def test_derivative_url_picks_smallest_sufficient_width(self):
+        # Test URL turunan memilih lebar terkecil yang cukup.
+        destination = self.create_destination(width=800)
+        self.assertTrue(derivative_url(destination.main_image, 200).endswith('/320w.jpg'))
+        self.assertTrue(derivative_url(destination.main_image, 5000, 'webp').endswith('/640w.webp'))
+    
+    def test_responsive_image_tag_renders_srcset(self):
+        # Test template tag menghasilkan <picture> dengan srcset.
+        destination = self.create_destination()
+        html = Template(
+            '{% load image_tags %}{% responsive_image d.main_image alt=d.name class="w-full" %}'
+        ).render(Context({'d': destination}))
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn('160w', html)
+        self.assertIn('class="w-full"', html)
+        self.assertIn('loading="lazy"', html)
+    
+    def test_missing_source_falls_back_to_original(self):
+        # Test file sumber yang hilang tidak memecah halaman.
+        destination = Destination.objects.create(
+            name="Tanpa File", description="Test", main_image="destinations/primary/missing.jpg"
+        )
+        self.assertIsNone(get_derivatives(destination.main_image))
+        self.assertEqual(derivative_url(destination.main_image, 320), destination.main_image.url)
+    
+    def test_decompression_bomb_falls_back_to_original(self):
+        # Test gambar melebihi batas piksel PIL tidak memecah halaman.
+        destination = self.create_destination()
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 100):
+            self.assertIsNone(get_derivatives(destination.main_image))
+            self.assertEqual(derivative_url(destination.main_image, 320), destination.main_image.url)
+    
+    def test_eager_generation_on_save(self):
+        # Test turunan dibuat saat simpan jika IMAGE_DERIVATIVES_EAGER aktif.
+        with self.settings(IMAGE_DERIVATIVES_EAGER=True):
+            self.create_destination()
+        self.assertTrue(os.path.isdir(os.path.join(self.media_root, 'derivatives', 'index')))
+
+
+class MediaServingTest(SimpleTestCase):
+    # Test cases untuk penyajian file media (ETag, Range, varian, immutable).
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_CACHE_MAX_AGE=600)
+        self.override.enable()
+        self.write('plain/photo.jpg', b'0123456789')
+    
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def write(self, name, content):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(content)
+    
+    def get(self, path, **headers):
+        response = self.client.get(f'/media/{path}', headers=headers)
+        self.addCleanup(response.close)
+        return response
+    
+    def test_full_response_with_validators(self):
+        # Test file penuh: isi, ETag, Last-Modified, Accept-Ranges, max-age.
+        response = self.get('plain/photo.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.getvalue(), b'0123456789')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=600')
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+    
+    def test_conditional_requests_return_304(self):
+        # Test If-None-Match & If-Modified-Since dijawab 304.
+        first = self.get('plain/photo.jpg')
+        response = self.get('plain/photo.jpg', if_none_match=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        response = self.get('plain/photo.jpg', if_modified_since=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+    
+    def test_byte_ranges(self):
+        # Test Range: 206 untuk rentang valid, 416 di luar file, If-Range basi = file penuh.
+        response = self.get('plain/photo.jpg', range='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.getvalue(), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response['Content-Length'], '4')
+        self.assertEqual(self.get('plain/photo.jpg', range='bytes=-3').getvalue(), b'789')
+        response = self.get('plain/photo.jpg', range='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+        response = self.get('plain/photo.jpg', range='bytes=2-5', if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(parse_range('bytes=5-100', 10), (5, 9))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+    
+    def test_precompressed_variant(self):
+        # Test varian .gz dipakai hanya jika klien menerima gzip.
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg"></svg>'
+        self.write('icons/logo.svg', svg)
+        self.write('icons/logo.svg.gz', gzip.compress(svg))
+        response = self.get('icons/logo.svg', accept_encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.getvalue()), svg)
+        response = self.get('icons/logo.svg')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.getvalue(), svg)
+    
+    def test_hashed_upload_is_immutable(self):
+        # Test upload diberi nama ber-hash konten, dilayani immutable & tanpa duplikat.
+        storage = HashedMediaStorage()
+        name = storage.save('destinations/primary/foto.jpg', SimpleUploadedFile('foto.jpg', b'isi foto'))
+        self.assertRegex(name, r'^destinations/primary/foto\.[0-9a-f]{12}\.jpg$')
+        self.assertEqual(storage.save('destinations/primary/foto.jpg', SimpleUploadedFile('foto.jpg', b'isi foto')), name)
+        self.assertNotEqual(storage.save('destinations/primary/foto.jpg', SimpleUploadedFile('foto.jpg', b'lain')), name)
+        response = self.get(name)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response.getvalue(), b'isi foto')
+    
+    def test_missing_and_traversal_are_404(self):
+        # Test file tidak ada, direktori & path traversal tidak dilayani.
+        self.assertEqual(self.get('plain/none.jpg').status_code, 404)
+        self.assertEqual(self.get('plain/').status_code, 404)
+        self.assertEqual(self.get('../config/settings.py').status_code, 404)
+
+
+class CursorPaginationTest(TestCase):
+    # Test cases untuk paginasi cursor (keyset) destinasi.
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Pantai", icon="waves")
+        cls.district = District.objects.create(name="Sekotong")
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Pantai {i}",
+                description="Test",
+                category=cls.category,
+                district=cls.district,
+                main_image=f"destinations/primary/{i}.jpg"
+            )
+            for i in range(14)
+        ]
+        # Sebagian created_at dibuat sama untuk menguji tie-breaker id
+        Destination.objects.filter(pk__in=[d.pk for d in cls.destinations[:5]]).update(
+            created_at=cls.destinations[0].created_at
+        )
+    
+    def setUp(self):
+        cache.clear()
+    
+    def expected_order(self):
+        return list(Destination.objects.order_by('-created_at', '-id'))
+    
+    def test_walk_forward_and_back(self):
+        # Test menelusuri semua halaman maju lalu mundur tanpa duplikat/hilang.
+        queryset = Destination.objects.all()
+        pages = [paginate_by_cursor(queryset, 4)]
+        while pages[-1].has_next():
+            pages.append(paginate_by_cursor(queryset, 4, pages[-1].next_cursor))
+        forward = [obj for page in pages for obj in page]
+        self.assertEqual(forward, self.expected_order())
+        self.assertFalse(pages[0].has_previous())
+        
+        page = pages[-1]
+        backward = list(page.object_list)
+        while page.has_previous():
+            page = paginate_by_cursor(queryset, 4, page.previous_cursor)
+            backward = list(page.object_list) + backward
+        self.assertEqual(backward, self.expected_order())
+    
+    def test_invalid_cursor_returns_first_page(self):
+        # Test token rusak/dipalsukan kembali ke halaman pertama.
+        page = paginate_by_cursor(Destination.objects.all(), 4, 'bukan-token')
+        self.assertEqual(list(page), self.expected_order()[:4])
+    
+    def test_deep_page_has_no_count_or_offset(self):
+        # Test halaman cursor hanya menjalankan satu SELECT tanpa OFFSET.
+        first = paginate_by_cursor(Destination.objects.all(), 4)
+        with CaptureQueriesContext(connection) as ctx:
+            paginate_by_cursor(Destination.objects.all(), 4, first.next_cursor)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql'].upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+    
+    @override_settings(CATALOG_CURSOR_PAGINATION=True)
+    def test_list_views_use_cursor_mode(self):
+        # Test view list, kategori dan kecamatan memakai token cursor.
+        urls = [
+            reverse('core:destination_list'),
+            reverse('core:category_detail', kwargs={'slug': self.category.slug}),
+            reverse('core:district_detail', kwargs={'slug': self.district.slug}),
+        ]
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.context['page_obj']
+            self.assertTrue(page.has_next())
+            self.assertContains(response, urlencode({'cursor': page.next_cursor}))
+            response = self.client.get(url, {'cursor': page.next_cursor})
+            self.assertTrue(response.context['page_obj'].has_previous())
+        self.assertEqual(response.context['result_count'], 14)
+    
+    @override_settings(CATALOG_CURSOR_PAGINATION=True)
+    def test_search_keeps_offset_pagination(self):
+        # Test hasil pencarian (urut relevansi) tetap memakai paginasi offset.
+        response = self.client.get(reverse('core:destination_list'), {'q': 'pantai'})
+        self.assertIsNotNone(response.context['paginator'])
+        self.assertContains(response, 'page=2')
+        self.assertContains(response, 'q=pantai')
+    
+    def test_offset_mode_result_count(self):
+        # Test mode offset menampilkan jumlah pasti dari paginator.
+        response = self.client.get(reverse('core:category_detail', kwargs={'slug': self.category.slug}))
+        self.assertEqual(response.context['result_count'], 14)
+        self.assertEqual(len(response.context['destination_list']), 9)
+
+
+class CatalogApiTest(TestCase):
+    # Test cases untuk API JSON katalog (values(), cursor, ETag/304).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.beach = Category.objects.create(name="Pantai", icon="waves")
+        cls.hill = Category.objects.create(name="Bukit", icon="landscape")
+        cls.district = District.objects.create(name="Sekotong")
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Pantai {i}",
+                description="Test",
+                category=cls.beach if i % 2 else cls.hill,
+                district=cls.district,
+                main_image=f"destinations/primary/{i}.jpg"
+            )
+            for i in range(5)
+        ]
+        DestinationGallery.objects.create(
+            destination=cls.destinations[0], image="destinations/gallery/a.jpg", caption="Sunset"
+        )
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_list_walks_cursor_pages(self):
+        # Test daftar destinasi berhalaman lewat link 'next'
+        url = reverse('core:api_destination_list') + '?limit=2'
+        slugs = []
+        while url:
+            data = self.client.get(url).json()
+            slugs += [item['slug'] for item in data['results']]
+            url = data['next']
+        expected = Destination.objects.order_by('-created_at', '-id').values_list('slug', flat=True)
+        self.assertEqual(slugs, list(expected))
+    
+    def test_list_payload_and_filter(self):
+        # Test isi ringkas destinasi & filter kategori berdasarkan slug
+        response = self.client.get(reverse('core:api_destination_list'), {'category': self.beach.slug})
+        results = response.json()['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['category'], {'name': 'Pantai', 'slug': self.beach.slug})
+        self.assertEqual(results[0]['district']['name'], 'Sekotong')
+        self.assertTrue(results[0]['main_image'].endswith('.jpg'))
+        self.assertNotIn('view_count', results[0])
+        
+        response = self.client.get(reverse('core:api_destination_list'), {'category': 'tidak-ada'})
+        self.assertEqual(response.json()['results'], [])
+    
+    def test_unknown_filter_slug_is_empty_not_null_filter(self):
+        # Test slug kategori/kecamatan tak dikenal tidak berubah jadi filter IS NULL
+        Destination.objects.create(name="Tanpa Kategori", description="Test", main_image="destinations/primary/x.jpg")
+        for param in ('category', 'district'):
+            response = self.client.get(reverse('core:api_destination_list'), {param: 'tidak-ada'})
+            self.assertEqual(response.json(), {'results': [], 'next': None, 'previous': None})
+    
+    def test_detail_includes_gallery(self):
+        # Test detail destinasi beserta galeri, dan 404 untuk slug tak dikenal
+        destination = self.destinations[0]
+        url = reverse('core:api_destination_detail', kwargs={'slug': destination.slug})
+        data = self.client.get(url).json()
+        self.assertEqual(data['name'], destination.name)
+        self.assertEqual(data['gallery'][0]['caption'], 'Sunset')
+        
+        response = self.client.get(reverse('core:api_destination_detail', kwargs={'slug': 'tidak-ada'}))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('ETag'))
+    
+    def test_category_and_district_counts(self):
+        # Test jumlah destinasi per kategori/kecamatan
+        categories = self.client.get(reverse('core:api_category_list')).json()['results']
+        self.assertEqual({row['slug']: row['destination_count'] for row in categories},
+                         {self.beach.slug: 2, self.hill.slug: 3})
+        districts = self.client.get(reverse('core:api_district_list')).json()['results']
+        self.assertEqual(districts[0]['destination_count'], 5)
+    
+    def test_conditional_get_returns_304_without_queries(self):
+        # Test If-None-Match yang cocok dijawab 304 tanpa query database
+        url = reverse('core:api_destination_list')
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(ctx.captured_queries), 0)
+    
+    def test_etag_changes_when_catalog_changes(self):
+        # Test ETag berubah setelah data katalog diubah
+        url = reverse('core:api_category_list')
+        etag = self.client.get(url)['ETag']
+        self.hill.name = "Bukit Hijau"
+        self.hill.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Bukit Hijau', response.content.decode())
+    
+    def test_read_only(self):
+        # Test API hanya menerima GET/HEAD
+        response = self.client.post(reverse('core:api_category_list'))
+        self.assertEqual(response.status_code, 405)
+
+
+class CatalogStatsTest(TestCase):
+    # Test cases untuk read model statistik katalog (CatalogStats).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Pantai", icon="waves")
+        cls.district = District.objects.create(name="Sekotong")
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Pantai {i}",
+                description="Test",
+                category=cls.category,
+                district=cls.district,
+                main_image=f"destinations/primary/{i}.jpg",
+                view_count=i * 10,
+            )
+            for i in range(7)
+        ]
+        User.objects.create_user(username="admin", password="secret")
+    
+    def setUp(self):
+        cache.clear()
+        view_counter.clear()
+    
+    def snapshot(self, row):
+        return {
+            field: getattr(row, field)
+            for field in ('destination_count', 'category_count', 'district_count', 'user_count',
+                          'total_views', 'top_destinations', 'recent_destinations')
+        }
+    
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot(CatalogStats.objects.get())
+        self.assertEqual(incremental, self.snapshot(stats.rebuild_stats()))
+    
+    def test_incremental_stats_match_rebuild(self):
+        # Test statistik yang dijaga signal sama dengan hasil hitung ulang penuh
+        row = stats.get_stats()
+        self.assertEqual(row.destination_count, 7)
+        self.assertEqual(row.total_views, 210)
+        self.assertEqual(row.user_count, 1)
+        self.assertEqual([entry['name'] for entry in row.top_destinations[:2]], ["Pantai 6", "Pantai 5"])
+        self.assertMatchesRebuild()
+    
+    def test_create_update_delete_destination(self):
+        # Test tambah, ubah tayangan dan hapus destinasi
+        new = Destination.objects.create(
+            name="Gili Baru", description="Test", main_image="destinations/primary/baru.jpg", view_count=500
+        )
+        row = stats.get_stats()
+        self.assertEqual(row.recent_destinations[0]['name'], "Gili Baru")
+        self.assertEqual(row.top_destinations[0]['name'], "Gili Baru")
+        self.assertEqual(row.total_views, 710)
+        self.assertMatchesRebuild()
+        
+        # Tayangan direset: destinasi lain kembali ke posisi teratas
+        new.view_count = 0
+        new.save()
+        self.assertEqual(stats.get_stats().top_destinations[0]['name'], "Pantai 6")
+        self.assertMatchesRebuild()
+        
+        self.destinations[6].delete()
+        row = stats.get_stats()
+        self.assertEqual(row.destination_count, 7)
+        self.assertNotIn("Pantai 6", [entry['name'] for entry in row.top_destinations])
+        self.assertMatchesRebuild()
+    
+    def test_view_flush_updates_total_and_top(self):
+        # Test flush buffer tayangan menaikkan total & mengubah urutan top
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1000)
+        buffer.increment(self.destinations[0].pk, 100)
+        buffer.flush()
+        row = stats.get_stats()
+        self.assertEqual(row.total_views, 310)
+        self.assertEqual(row.top_destinations[0]['id'], self.destinations[0].pk)
+        self.assertEqual(row.top_destinations[0]['view_count'], 100)
+        self.assertMatchesRebuild()
+    
+    def test_related_rename_and_delete(self):
+        # Test nama kategori/kecamatan di daftar ikut diperbarui
+        self.category.name = "Pantai Pasir Putih"
+        self.category.save()
+        self.assertEqual(stats.get_stats().top_destinations[0]['category_name'], "Pantai Pasir Putih")
+        self.assertMatchesRebuild()
+        
+        self.district.delete()
+        row = stats.get_stats()
+        self.assertEqual(row.district_count, 0)
+        self.assertIsNone(row.recent_destinations[0]['district_id'])
+        self.assertMatchesRebuild()
+    
+    def test_dashboard_reads_one_row(self):
+        # Test dashboard admin cukup satu query untuk semua angka & daftar
+        template = Template(
+            "{% load dashboard_extras %}{% get_destination_count %}|{% get_category_count %}|"
+            "{% get_user_count %}|{% get_top_destinations_json %}|"
+            "{% get_recent_destinations as recent %}{% for d in recent %}{{ d.category_name }}{% endfor %}"
+        )
+        with self.assertNumQueries(1):
+            output = template.render(Context())
+        self.assertTrue(output.startswith("7|1|1|"))
+        self.assertIn('"Pantai 6"', output)
+    
+    def test_home_uses_stats(self):
+        # Test homepage membaca statistik dari read model
+        response = self.client.get(reverse('base:home'))
+        self.assertEqual(response.context['destination_count'], 7)
+        self.assertEqual(response.context['total_views'], 210)
+        self.assertEqual(response.context['popular_destinations'][0].name, "Pantai 6")
+        self.assertContains(response, "Sekotong")
+
+
+class RequestInstrumentationTest(TestCase):
+    # Test cases untuk middleware instrumentasi query & Server-Timing.
+    
+    @classmethod
+    def setUpTestData(cls):
+        Category.objects.create(name="Pantai", icon="waves")
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_server_timing_header(self):
+        # Test header Server-Timing memuat jumlah query & durasi
+        response = self.client.get(reverse('core:category_list'))
+        timing = response['Server-Timing']
+        self.assertIn('db;desc="1 queries"', timing)
+        for metric in ('view;dur=', 'tpl;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+    
+    def test_structured_log_line(self):
+        # Test satu baris log JSON per request
+        with self.assertLogs('apps.core.instrumentation', level='INFO') as logs:
+            self.client.get(reverse('core:category_list'))
+        line = logs.records[0].getMessage()
+        self.assertTrue(line.startswith('request_metrics '))
+        metrics = json.loads(line.split(' ', 1)[1])
+        self.assertEqual(metrics['url_name'], 'core:category_list')
+        self.assertEqual(metrics['queries'], 1)
+        self.assertIn('core_category', metrics['slowest_sql'])
+        self.assertGreater(metrics['template_ms'], 0)
+    
+    @override_settings(QUERY_BUDGETS={'core:category_list': 0}, QUERY_BUDGET_STRICT=True)
+    def test_budget_fails_in_strict_mode(self):
+        # Test anggaran query terlampaui menggagalkan request saat strict
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('core:category_list'))
+    
+    @override_settings(QUERY_BUDGETS={'core:category_list': 0}, QUERY_BUDGET_STRICT=False)
+    def test_budget_warns_otherwise(self):
+        # Test anggaran query terlampaui hanya menulis warning di production
+        with self.assertLogs('apps.core.instrumentation', level='WARNING') as logs:
+            response = self.client.get(reverse('core:category_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('core:category_list', logs.output[0])
+    
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_can_be_disabled(self):
+        # Test instrumentasi bisa dimatikan lewat setting
+        response = self.client.get(reverse('core:category_list'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class QueryBudgetTest(TestCase):
+    # Test jumlah query halaman katalog konstan (tanpa N+1) di 10, 100 & 1000 destinasi.
+    
+    SIZES = (10, 100, 1000)
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Pantai", icon="waves")
+        cls.district = District.objects.create(name="Sekotong")
+        cls.admin = User.objects.create_superuser(username="admin", password="secret")
+    
+    def setUp(self):
+        self.created = 0
+    
+    def grow_catalog(self, size):
+        # Tambah destinasi (bulk) sampai jumlahnya = size, lengkap dengan galeri
+        objects = [
+            Destination(
+                name=f"Destinasi {i}",
+                description="Test",
+                category=self.category,
+                district=self.district,
+                main_image=f"destinations/primary/{i}.jpg",
+                view_count=i,
+            )
+            for i in range(self.created, size)
+        ]
+        Destination.objects.bulk_create(allocate_slugs(objects))
+        self.created = size
+        self.destination = Destination.objects.order_by('-id').first()
+        DestinationGallery.objects.bulk_create([
+            DestinationGallery(destination=self.destination, image=f"destinations/gallery/{i}.jpg")
+            for i in range(3)
+        ])
+        stats.rebuild_stats()
+    
+    def pages(self):
+        # (nama, url, jumlah query yang diharapkan) untuk pengunjung anonim
+        return [
+            ('home', reverse('base:home'), 2),
+            ('destination_list', reverse('core:destination_list'), 3),
+            ('destination_list_filtered', reverse('core:destination_list') + f'?category={self.category.slug}', 3),
+            ('destination_detail', reverse('core:destination_detail', kwargs={'slug': self.destination.slug}), 2),
+            ('category_list', reverse('core:category_list'), 1),
+            ('category_detail', reverse('core:category_detail', kwargs={'slug': self.category.slug}), 3),
+            ('district_detail', reverse('core:district_detail', kwargs={'slug': self.district.slug}), 3),
+            ('api_destination_list', reverse('core:api_destination_list'), 3),
+            ('api_destination_detail', reverse('core:api_destination_detail', kwargs={'slug': self.destination.slug}), 4),
+        ]
+    
+    def test_public_pages_have_constant_query_count(self):
+        for size in self.SIZES:
+            self.grow_catalog(size)
+            for name, url, expected in self.pages():
+                with self.subTest(size=size, page=name):
+                    cache.clear()
+                    view_counter.clear()
+                    with self.assertNumQueries(expected):
+                        self.assertEqual(self.client.get(url).status_code, 200)
+    
+    @override_settings(VIEW_COUNT_FLUSH_THRESHOLD=1)
+    def test_view_count_flush_is_counted_separately(self):
+        # Test flush buffer tayangan di dalam request dicatat terpisah, bukan ke anggaran halaman detail.
+        self.grow_catalog(10)
+        cache.clear()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+        url = reverse('core:destination_detail', kwargs={'slug': self.destination.slug})
+        with self.assertLogs('apps.core.instrumentation', level='INFO') as logs:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        metrics = json.loads(logs.records[0].getMessage().split(' ', 1)[1])
+        self.assertEqual(metrics['queries'], 2)
+        self.assertGreater(metrics['background_queries'], 0)
+        self.assertEqual(Destination.objects.get(pk=self.destination.pk).view_count, self.destination.view_count + 1)
+    
+    @override_settings(CATALOG_CURSOR_PAGINATION=True)
+    def test_cursor_pages_have_constant_query_count(self):
+        for size in self.SIZES:
+            self.grow_catalog(size)
+            # Mode cursor: tanpa COUNT di daftar destinasi
+            expected_counts = {'destination_list': 2, 'category_detail': 3, 'district_detail': 3}
+            for name, url, _ in self.pages():
+                if name not in expected_counts:
+                    continue
+                expected = expected_counts[name]
+                with self.subTest(size=size, page=name):
+                    cache.clear()
+                    with self.assertNumQueries(expected):
+                        self.assertEqual(self.client.get(url).status_code, 200)
+    
+    def test_admin_dashboard_has_constant_query_count(self):
+        # Test dashboard admin: jumlah query sama berapapun ukuran katalog
+        self.client.force_login(self.admin)
+        counts = []
+        for size in self.SIZES:
+            self.grow_catalog(size)
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.client.get(reverse('admin:index')).status_code, 200)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(len(set(counts)), 1, counts)
+    
+    def test_admin_changelists_have_constant_query_count(self):
+        # Test changelist admin (destinasi, kategori, kecamatan) tanpa N+1 & tanpa COUNT ulang
+        self.client.force_login(self.admin)
+        urls = [
+            reverse('admin:core_destination_changelist'),
+            reverse('admin:core_destination_changelist') + f'?category__id__exact={self.category.pk}',
+            reverse('admin:core_category_changelist'),
+            reverse('admin:core_district_changelist'),
+        ]
+        counts = {url: set() for url in urls}
+        for size in self.SIZES:
+            self.grow_catalog(size)
+            for url in urls:
+                cache.clear()
+                # Permintaan pertama mengisi cache estimasi jumlah hasil
+                self.client.get(url)
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                counts[url].add(len(ctx.captured_queries))
+        for url, seen in counts.items():
+            self.assertEqual(len(seen), 1, (url, seen))
+        
+        response = self.client.get(reverse('admin:core_category_changelist'))
+        self.assertContains(response, "1000 Destinations")
+    
+    def test_admin_fk_autocomplete(self):
+        # Test field kecamatan memakai autocomplete (AJAX), bukan dropdown penuh
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'core', 'model_name': 'destination', 'field_name': 'district', 'term': 'Sekot',
+        })
+        self.assertEqual(response.json()['results'][0]['text'], "Sekotong")
+
+
+class BenchmarkSuiteTest(TestCase):
+    # Test cases untuk suite benchmark HTTP (benchmark_site).
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.district = District.objects.create(name="Batulayar")
+        cls.destination = Destination.objects.create(name="Pantai Senggigi", description="Test", district=cls.district, main_image="destinations/primary/senggigi.jpg")
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_percentile_nearest_rank(self):
+        # Test persentil nearest-rank.
+        values = list(range(1, 101))
+        self.assertEqual(benchmarks.percentile(values, 50), 50)
+        self.assertEqual(benchmarks.percentile(values, 99), 99)
+        self.assertEqual(benchmarks.percentile([7], 95), 7)
+        self.assertIsNone(benchmarks.percentile([], 50))
+    
+    def test_targets_cover_public_routes(self):
+        # Test semua route publik ikut, route tanpa data contoh dilewati.
+        targets, skipped = benchmarks.build_targets(samples=5)
+        self.assertIn('base:home', targets)
+        self.assertIn('core:api_district_list', targets)
+        self.assertEqual(targets['core:destination_detail'], [reverse('core:destination_detail', kwargs={'slug': self.destination.slug})])
+        self.assertIn('core:destination_list?q=pantai', targets)
+        self.assertIn('core:category_detail', skipped)
+    
+    def test_transports_do_not_count_views(self):
+        # Test request benchmark in-process (WSGI & ASGI) tidak menaikkan tayangan.
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+        url = reverse('core:destination_detail', kwargs={'slug': self.destination.slug})
+        self.assertEqual(benchmarks.ClientTransport().get(url)[0], 200)
+        self.assertEqual(async_to_sync(benchmarks.ASGITransport().get)(url)[0], 200)
+        self.assertEqual(view_counter.pending(self.destination.pk), 0)
+        self.assertEqual(Destination.objects.get(pk=self.destination.pk).view_count, 0)
+    
+    def test_compare_flags_regressions_beyond_threshold(self):
+        # Test regresi p95, query per request dan error; noise kecil diabaikan.
+        baseline = {
+            'a': {'p95_ms': 10.0, 'queries_per_request': 2.0, 'errors': 0},
+            'b': {'p95_ms': 0.5, 'queries_per_request': 1.0, 'errors': 0},
+        }
+        current = {
+            'a': {'p95_ms': 15.0, 'queries_per_request': 3.0, 'errors': 1},
+            'b': {'p95_ms': 0.9, 'queries_per_request': 1.0, 'errors': 0},
+            'new': {'p95_ms': 99.0, 'queries_per_request': 9.0, 'errors': 0},
+        }
+        regressions = benchmarks.compare(baseline, current, threshold=0.2)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(all(line.startswith('a:') for line in regressions))
+        self.assertEqual(benchmarks.compare(baseline, current, threshold=1.0), regressions[1:])
+    
+    def test_compare_interfaces_rows(self):
+        # Test perbandingan WSGI/ASGI per route (rasio throughput ASGI/WSGI).
+        wsgi = {'a': {'throughput_rps': 100.0, 'p95_ms': 5.0}, 'b': {'throughput_rps': 0, 'p95_ms': None}}
+        asgi = {'a': {'throughput_rps': 150.0, 'p95_ms': 4.0}, 'b': {'throughput_rps': 10.0, 'p95_ms': 1.0}}
+        rows = benchmarks.compare_interfaces(wsgi, asgi)
+        self.assertEqual(rows[0], ('a', 100.0, 150.0, 1.5, 5.0, 4.0))
+        self.assertIsNone(rows[1][3])
+    
+    def test_command_saves_and_compares_baseline(self):
+        # Test command in-process: laporan JSON tersimpan, lalu dibandingkan dengan baseline.
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, 'baseline.json')
+        out = io.StringIO()
+        call_command('benchmark_site', '--requests', '3', '--warmup', '0', '--route', 'about', '--route', 'api_district', '--output', path, stdout=out)
+        with open(path) as handle:
+            report = json.load(handle)
+        self.assertEqual(set(report['routes']), {'base:about', 'core:api_district_list'})
+        result = report['routes']['core:api_district_list']
+        self.assertEqual(result['status'], {'200': 3})
+        self.assertEqual(result['queries_per_request'], 1)
+        self.assertIsNotNone(result['p99_ms'])
+        
+        # Baseline dengan query lebih sedikit -> regresi terdeteksi
+        report['routes']['core:api_district_list']['queries_per_request'] = 0
+        with open(path, 'w') as handle:
+            json.dump(report, handle)
+        with self.assertRaises(CommandError):
+            call_command('benchmark_site', '--requests', '3', '--route', 'api_district', '--baseline', path, stdout=io.StringIO())
+
+
 class CategoryViewTest(TestCase):
     # Test cases untuk views Category.
     
@@ -305,6 +2406,7 @@ class CategoryViewTest(TestCase):
     def setUp(self):
         # Setup client untuk setiap test.
         self.client = Client()
+        cache.clear()
     
     def test_category_list_view_status_code(self):
         # Test view list kategori mengembalikan 200.
@@ -331,12 +2433,134 @@ class CategoryViewTest(TestCase):
         self.assertTemplateUsed(response, 'core/category_detail.html')
 
 
+class AsyncViewsTest(TestCase):
+    # Test cases untuk view async (ASGI): ORM async, tanpa query saat render.
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Pantai", icon="beach_access")
+        cls.district = District.objects.create(name="Batulayar")
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Pantai Async {index}", description="Pasir putih", district=cls.district,
+                category=cls.category, main_image="destinations/primary/async.jpg", view_count=index,
+            )
+            for index in range(3)
+        ]
+    
+    def setUp(self):
+        cache.clear()
+        view_counter.clear()
+    
+    def make_request(self, path, **params):
+        # Request async anonim seperti setelah AuthenticationMiddleware
+        request = AsyncRequestFactory().get(path, params)
+        request.user = AnonymousUser()
+        
+        async def auser():
+            return request.user
+        
+        request.auser = auser
+        return request
+    
+    async def test_async_list_view(self):
+        # Test daftar async: halaman & kategori sudah berupa list, render tanpa query.
+        from .views import AsyncDestinationListView
+        response = await AsyncDestinationListView.as_view()(self.make_request('/destinations/'))
+        self.assertIsInstance(response.context_data['destination_list'], list)
+        self.assertEqual(response.context_data['paginator'].count, 3)
+        self.assertEqual(response.context_data['category_list'], [self.category])
+        response.render()
+        self.assertContains(response, "Pantai Async 2")
+    
+    async def test_async_list_view_search_and_last_page(self):
+        # Test pencarian (cek FTS di thread) dan ?page=last pada view async.
+        from .views import AsyncDestinationListView
+        view = AsyncDestinationListView.as_view(paginate_by=2)
+        response = await view(self.make_request('/destinations/', q='async 1'))
+        self.assertEqual([item.name for item in response.context_data['destination_list']], ["Pantai Async 1"])
+        response = await view(self.make_request('/destinations/', page='last'))
+        self.assertEqual(len(response.context_data['destination_list']), 1)
+        with self.assertRaises(Http404):
+            await view(self.make_request('/destinations/', page='9'))
+    
+    async def test_async_detail_view_buffers_views(self):
+        # Test detail async: total tayangan termasuk buffer, flush tidak dijalankan di request.
+        from .views import AsyncDestinationDetailView
+        destination = self.destinations[2]
+        view = AsyncDestinationDetailView.as_view()
+        with mock.patch.object(view_counter, 'flush') as flush:
+            response = await view(self.make_request('/'), slug=destination.slug)
+        flush.assert_not_called()
+        self.assertEqual(response.context_data['destination'].view_count, destination.view_count + 1)
+        self.assertEqual(view_counter.pending(destination.pk), 1)
+        response.render()
+        with self.assertRaises(Http404):
+            await view(self.make_request('/'), slug='tidak-ada')
+    
+    async def test_async_home_view_uses_page_cache(self):
+        # Test homepage async: statistik & kategori, lalu dilayani dari cache halaman.
+        from apps.base.views import AsyncHomeView
+        view = AsyncHomeView.as_view()
+        response = await view(self.make_request('/'))
+        self.assertEqual(response.context_data['destination_count'], 3)
+        self.assertEqual(response.context_data['category_list'], [self.category])
+        response.render()
+        cached = await view(self.make_request('/'))
+        self.assertFalse(hasattr(cached, 'context_data'))
+        self.assertEqual(cached.content, response.content)
+    
+    async def test_async_surprise_view(self):
+        # Test surprise async mengambil sampel lewat ORM async.
+        from .views import async_surprise_me
+        reset_snapshot()
+        with self.settings(SURPRISE_REEL_SIZE=2):
+            response = await async_surprise_me(self.make_request('/surprise/'))
+        self.assertEqual(len(response.context_data['destination_list']), 2)
+        response.render()
+    
+    async def test_async_client_through_middleware(self):
+        # Test rantai middleware async (tanpa adapter) tetap mengukur query.
+        response = await self.async_client.get(reverse('core:destination_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;desc="', response['Server-Timing'])
+    
+    def test_middleware_is_async_capable(self):
+        # Test semua middleware mendukung async agar ASGI tidak jatuh ke thread adapter.
+        for path in settings.MIDDLEWARE:
+            self.assertTrue(getattr(import_string(path), 'async_capable', False), path)
+    
+    def test_background_flush_is_scheduled_once(self):
+        # Test flush latar: selama masih antre, flush berikutnya tidak ditambahkan.
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1)
+        self.addCleanup(buffer.clear)
+        gate = threading.Event()
+        # Thread latar ditahan agar flush berikutnya menunggu di antrean
+        buffer._executor = ThreadPoolExecutor(max_workers=1)
+        buffer._executor.submit(gate.wait, 5)
+        with mock.patch.object(buffer, '_flush_or_postpone') as flush:
+            buffer.increment(self.destinations[0].pk, background=True)
+            buffer.increment(self.destinations[0].pk, background=True)
+            gate.set()
+            buffer._executor.shutdown(wait=True)
+        flush.assert_called_once()
+        self.assertEqual(buffer.pending(self.destinations[0].pk), 2)
+    
+    def test_asgi_transport_benchmark(self):
+        # Test benchmark in-process lewat ASGIHandler dengan worker coroutine.
+        result = benchmarks.measure(benchmarks.ASGITransport(), [reverse('base:about')], requests=4, concurrency=2)
+        self.assertEqual(result['status'], {'200': 4})
+        self.assertEqual(result['errors'], 0)
+        self.assertIsNotNone(result['queries_per_request'])
+
+
 class BaseViewTest(TestCase):
     # Test cases untuk views di apps.base.
     
     def setUp(self):
         """Setup client for each test."""
         self.client = Client()
+        cache.clear()
     
     def test_home_view_status_code(self):
         # Test view home mengembalikan 200.
@@ -359,6 +2583,51 @@ class BaseViewTest(TestCase):
         self.assertTemplateUsed(response, 'base/about.html')
 
 
+class CatalogPageCacheTest(TestCase):
+    # Test cases untuk cache halaman publik berbasis versi katalog.
+    
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+    
+    def test_anonymous_home_served_from_cache(self):
+        # Test request kedua dari pengunjung anonim tidak menjalankan query.
+        self.client.get(reverse('base:home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('base:home'))
+        self.assertEqual(response.status_code, 200)
+    
+    def test_content_change_invalidates_cache(self):
+        # Test simpan kategori menaikkan versi dan halaman dirender ulang.
+        self.client.get(reverse('core:category_list'))
+        version = get_catalog_version()
+        Category.objects.create(name="Waterfall", icon="water")
+        self.assertEqual(get_catalog_version(), version + 1)
+        response = self.client.get(reverse('core:category_list'))
+        self.assertContains(response, 'Waterfall')
+    
+    def test_unused_query_params_share_cache_entry(self):
+        # Test parameter query yang tidak dipakai view tidak membuat entri cache baru.
+        district = District.objects.create(name="Lembar")
+        url = reverse('core:district_detail', args=[district.slug])
+        self.client.get(url, {'page': 1})
+        self.client.get(reverse('base:home'))
+        with self.assertNumQueries(0):
+            self.client.get(url, {'utm_source': 'promo', 'page': 1})
+            self.client.get(reverse('base:home'), {'fbclid': 'abc'})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {'page': 2})
+        self.assertGreater(len(queries), 0)
+    
+    def test_authenticated_user_bypasses_cache(self):
+        # Test editor yang login selalu melihat halaman baru.
+        User.objects.create_user(username='editor', password='testpass123', is_staff=True)
+        self.client.get(reverse('base:home'))
+        self.client.login(username='editor', password='testpass123')
+        response = self.client.get(reverse('base:home'))
+        self.assertTemplateUsed(response, 'base/home.html')
+
+
 class SurpriseMeViewTest(TestCase):
     # Test cases untuk fitur Surprise Me.
     
@@ -382,6 +2651,80 @@ class SurpriseMeViewTest(TestCase):
         self.assertIn('destination_list', response.context)
 
 
+class SurpriseSamplingTest(TestCase):
+    # Test cases untuk sampling acak Surprise Me.
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Gili {i}",
+                description="Pulau kecil",
+                main_image=f"destinations/primary/gili-{i}.jpg",
+                view_count=i * 10
+            )
+            for i in range(12)
+        ]
+    
+    def setUp(self):
+        reset_snapshot()
+    
+    def test_sample_is_bounded_and_unique(self):
+        # Test jumlah sampel dibatasi k dan tidak ada duplikat.
+        sample = sample_destinations(5)
+        self.assertEqual(len(sample), 5)
+        self.assertEqual(len({item['slug'] for item in sample}), 5)
+        self.assertEqual(set(sample[0]), {'name', 'district__name', 'main_image', 'slug'})
+    
+    def test_sample_larger_than_catalog(self):
+        # Test k lebih besar dari katalog mengembalikan seluruh katalog.
+        self.assertEqual(len(sample_destinations(50)), 12)
+        self.assertEqual(len(sample_destinations(50, weighted=True)), 12)
+    
+    def test_sample_uses_cached_ids(self):
+        # Test setelah snapshot terbentuk, satu sampel hanya butuh satu query.
+        sample_destinations(3)
+        with self.assertNumQueries(1):
+            sample_destinations(3, weighted=True)
+    
+    def test_deleted_ids_are_skipped(self):
+        # Test id yang sudah dihapus tidak muncul di sampel.
+        sample_destinations(1)
+        Destination.objects.filter(pk=self.destinations[0].pk).delete()
+        slugs = {item['slug'] for item in sample_destinations(12)}
+        self.assertNotIn(self.destinations[0].slug, slugs)
+    
+    def test_surprise_page_payload_is_bounded(self):
+        # Test halaman surprise hanya mengirim SURPRISE_REEL_SIZE destinasi.
+        with self.settings(SURPRISE_REEL_SIZE=4):
+            response = self.client.get(reverse('core:surprise_me'))
+        self.assertEqual(len(response.context['destination_list']), 4)
+    
+    def test_reel_endpoint(self):
+        # Test endpoint JSON reel mengembalikan k destinasi.
+        response = self.client.get(reverse('core:surprise_reel'), {'k': 3, 'weighted': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['destinations']), 3)
+    
+    def test_reel_weighting_follows_setting(self):
+        # Test bobot reel mengikuti SURPRISE_REEL_WEIGHTED kecuali ?weighted diberikan.
+        url = reverse('core:surprise_reel')
+        with mock.patch('apps.core.views.sample_destinations', return_value=[]) as sample:
+            for value in (False, True):
+                with self.settings(SURPRISE_REEL_WEIGHTED=value):
+                    self.client.get(url, {'k': 3})
+                    self.assertEqual(sample.call_args.kwargs['weighted'], value)
+                    self.client.get(url, {'k': 3, 'weighted': '1'})
+                    self.assertTrue(sample.call_args.kwargs['weighted'])
+                    self.client.get(url, {'k': 3, 'weighted': '0'})
+                    self.assertFalse(sample.call_args.kwargs['weighted'])
+    
+    def test_surprise_views_read_replicas(self):
+        # Test halaman surprise dan endpoint reel sama-sama boleh membaca replika.
+        self.assertTrue(resolve(reverse('core:surprise_me')).func.replica_reads)
+        self.assertTrue(resolve(reverse('core:surprise_reel')).func.replica_reads)
+
+
 class URLRoutingTest(TestCase):
     # Test URL routing berfungsi dengan benar.
     
@@ -1,14 +1,25 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'core'
 
+# Di bawah ASGI (ASYNC_VIEWS) halaman utama katalog memakai view async
+if settings.ASYNC_VIEWS:
+    destination_list = views.AsyncDestinationListView.as_view()
+    destination_detail = views.AsyncDestinationDetailView.as_view()
+    surprise_me = views.async_surprise_me
+else:
+    destination_list = views.DestinationListView.as_view()
+    destination_detail = views.DestinationDetailView.as_view()
+    surprise_me = views.surprise_me
+
 urlpatterns = [
     # Daftar Destinasi & Pencarian
-    path('destinations/', views.DestinationListView.as_view(), name='destination_list'),
+    path('destinations/', destination_list, name='destination_list'),
     
     # Detail Destinasi
-    path('destinations/<slug:slug>/', views.DestinationDetailView.as_view(), name='destination_detail'),
+    path('destinations/<slug:slug>/', destination_detail, name='destination_detail'),
 
     # Detail Kecamatan
     path('districts/<slug:slug>/', views.DistrictDetailView.as_view(), name='district_detail'),
@@ -20,5 +31,12 @@ urlpatterns = [
     path('categories/<slug:slug>/', views.CategoryDetailView.as_view(), name='category_detail'),
 
     # Fitur Tambahan
-    path('surprise/', views.surprise_me, name='surprise_me'),
+    path('surprise/', surprise_me, name='surprise_me'),
+    path('surprise/reel/', views.surprise_reel, name='surprise_reel'),
+
+    # API JSON read-only (mobile & kiosk)
+    path('api/destinations/', api.destination_list, name='api_destination_list'),
+    path('api/destinations/<slug:slug>/', api.destination_detail, name='api_destination_detail'),
+    path('api/categories/', api.category_list, name='api_category_list'),
+    path('api/districts/', api.district_list, name='api_district_list'),
 ]
\ No newline at end of file
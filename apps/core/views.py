@@ -1,35 +1,55 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
+from django.template.response import TemplateResponse
 from django.views.generic import DetailView, ListView
-from django.http import Http404
-from django.db.models import F
+from django.http import Http404, JsonResponse
+from django.conf import settings
 from .models import Destination, Category, District
-from django.db.models import Q
-import random
+from .counters import view_counter
+from .maps import nearby_destinations
+from .cache import CatalogPageCacheMixin
+from .search import search_destinations
+from .sampling import asample_destinations, sample_destinations
+from .pagination import CatalogPaginationMixin
+from .routers import replica_reads
+
+
+# Kunci environ WSGI untuk request dari export_static_site dan benchmark
+# in-process (ASGI: kunci yang sama di scope). Bukan header HTTP (HTTP_*),
+# jadi pengunjung tidak bisa mengirimnya sendiri.
+STATIC_EXPORT_KEY = 'westlombok.static_export'
+BENCHMARK_KEY = 'westlombok.benchmark'
+
+
+def counts_view(request):
+    # Render untuk ekspor statis & benchmark tidak dihitung sebagai tayangan
+    scope = getattr(request, 'scope', {})
+    return not any(request.META.get(key) or scope.get(key) for key in (STATIC_EXPORT_KEY, BENCHMARK_KEY))
 
 
 # --- List Views ---
 
-class DestinationListView(ListView):
+@replica_reads
+class DestinationListView(CatalogPaginationMixin, ListView):
     # Menampilkan daftar seluruh destinasi wisata.
-    # Mendukung paginasi dan pencarian sederhana.
+    # Mendukung paginasi (offset/cursor) dan pencarian.
     model = Destination
     template_name = "core/destination_list.html"
     context_object_name = "destination_list"
     paginate_by = 6 
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
 
     def get_queryset(self):
         # Override query untuk fitur cari & filter kategori
-        queryset = super().get_queryset()
+        # Kecamatan diambil lewat JOIN agar kartu destinasi tidak query per baris
+        queryset = super().get_queryset().select_related('district')
         
-        # Filter Pencarian Teks
+        # Filter Pencarian Teks (FTS5 + BM25, fallback icontains)
         query = self.request.GET.get('q')
         if query:
-            queryset = queryset.filter(
-                Q(name__icontains=query) |
-                Q(description__icontains=query) |
-                Q(district__name__icontains=query)
-            )
+            queryset = search_destinations(queryset, query)
             
         # Filter Dropdown Kategori
         category_slug = self.request.GET.get('category')
@@ -38,6 +58,10 @@ class DestinationListView(ListView):
             
         return queryset
 
+    def use_cursor_pagination(self):
+        # Hasil pencarian diurutkan berdasarkan relevansi, jadi tetap pakai offset
+        return not self.request.GET.get('q') and super().use_cursor_pagination()
+
     def get_context_data(self, **kwargs):
         # Data kategori untuk dropdown filter
         context = super().get_context_data(**kwargs)
@@ -45,11 +69,13 @@ class DestinationListView(ListView):
         return context
 
 
-class CategoryListView(ListView):
+@replica_reads
+class CategoryListView(CatalogPageCacheMixin, ListView):
     # Menampilkan daftar kategori wisata.
     model = Category
     template_name = 'core/category_list.html'
     context_object_name = 'category_list'
+    cache_query_params = ()
 
 
 # --- Detail Views ---
@@ -60,35 +86,53 @@ class DestinationDetailView(DetailView):
     template_name = "core/destination_detail.html"
     context_object_name = "destination"
     slug_url_kwarg = "slug"
+    # Kecamatan & kategori lewat JOIN, galeri dalam satu query tambahan
+    queryset = Destination.objects.select_related('district', 'category').prefetch_related('images')
 
     def get_object(self):
-        # Override get_object untuk tambah counter views secara atomik
+        # Override get_object untuk tambah counter views lewat buffer write-behind
         obj = super().get_object()
-        # Update atomik untuk performa lebih baik
-        Destination.objects.filter(pk=obj.pk).update(
-            view_count=F('view_count') + 1
-        )
-        obj.refresh_from_db()
+        # Tampilkan total terkini (DB + buffer) tanpa query tambahan
+        if counts_view(self.request):
+            obj.view_count += view_counter.increment(obj.pk)
         return obj
 
-class DistrictDetailView(DetailView):
-    # Menampilkan detail Kecamatan dan destinasinya.
+    def get_context_data(self, **kwargs):
+        # Destinasi terdekat lewat indeks geohash (view async mengirimnya lewat kwargs)
+        if 'nearby_destinations' not in kwargs:
+            kwargs['nearby_destinations'] = nearby_destinations(self.object)
+        return super().get_context_data(**kwargs)
+
+@replica_reads
+class DistrictDetailView(CatalogPageCacheMixin, CatalogPaginationMixin, DetailView):
+    # Menampilkan detail Kecamatan dan destinasinya (berhalaman).
     model = District
     template_name = "core/district_detail.html"
     context_object_name = "district"
     slug_url_kwarg = "slug"
+    paginate_by = 9
+    cache_query_params = ('page', 'cursor')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Ambil semua destinasi dalam kecamatan ini
-        context['destination_list'] = self.object.destinations.all()
+        # Ambil destinasi dalam kecamatan ini, urut dari yang terbaru
+        queryset = self.object.destinations.select_related('category').order_by('-created_at', '-id')
+        paginator, page, destination_list, is_paginated = self.paginate_catalog(queryset, self.paginate_by)
+        context.update({
+            'destination_list': destination_list,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'result_count': self.get_result_count(queryset, paginator),
+        })
         return context
 
-class CategoryDetailView(ListView):
-    # Menampilkan destinasi dalam kategori spesifik.
+class CategoryDetailView(CatalogPaginationMixin, ListView):
+    # Menampilkan destinasi dalam kategori spesifik (berhalaman).
     model = Destination
     template_name = 'core/category_detail.html'
     context_object_name = 'destination_list'
+    paginate_by = 9
 
     def get_queryset(self):
         # Error handling jika kategori tidak ditemukan
@@ -98,20 +142,98 @@ class CategoryDetailView(ListView):
             raise Http404("Category not found")
         
         # Ambil destinasi dari kategori ini, urut dari yang terbaru
-        return Destination.objects.filter(category=self.category).order_by('-created_at')
+        return (
+            Destination.objects.filter(category=self.category)
+            .select_related('district')
+            .order_by('-created_at', '-id')
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
+        context['result_count'] = self.get_result_count(self.object_list, context['paginator'])
         return context
 
 
 # --- Feature Views ---
 
+@replica_reads
 def surprise_me(request):
     # Fitur 'Surprise Me', menampilkan destinasi acak untuk inspirasi.
-    # Logika: Ambil semua data lalu acak
-    # Memastikan klien mendapatkan dataset penuh untuk animasi
-    destination_list = list(Destination.objects.all().values('name', 'district__name', 'main_image', 'slug'))
-    random.shuffle(destination_list)
-    return render(request, 'core/surprise.html', {'destination_list': destination_list})
\ No newline at end of file
+    # Hanya satu 'reel' berisi sampel acak berukuran tetap yang dikirim,
+    # berapapun jumlah destinasi di katalog.
+    destination_list = sample_destinations(settings.SURPRISE_REEL_SIZE, weighted=settings.SURPRISE_REEL_WEIGHTED)
+    return render(request, 'core/surprise.html', {'destination_list': destination_list})
+
+@replica_reads
+def surprise_reel(request):
+    # Endpoint JSON untuk reel berikutnya pada animasi Surprise Me.
+    # ?k=<jumlah> (dibatasi SURPRISE_REEL_MAX), ?weighted=0/1 menimpa SURPRISE_REEL_WEIGHTED
+    try:
+        k = int(request.GET.get('k', settings.SURPRISE_REEL_SIZE))
+    except ValueError:
+        k = settings.SURPRISE_REEL_SIZE
+    k = max(1, min(k, settings.SURPRISE_REEL_MAX))
+    weighted = request.GET.get('weighted')
+    if weighted is None:
+        weighted = settings.SURPRISE_REEL_WEIGHTED
+    else:
+        weighted = weighted.lower() in ('1', 'true', 'yes')
+    return JsonResponse({'destinations': sample_destinations(k, weighted=weighted)})
+
+
+# --- Async Views (ASGI) ---
+# Dipakai urls.py jika ASYNC_VIEWS aktif (default di config/asgi.py), sehingga
+# request tidak lagi melewati adapter sync-to-thread. Query lewat ORM async;
+# template tetap dirender oleh handler Django seperti view sinkron.
+
+async def alist(queryset):
+    # Evaluasi queryset secara async (untuk asyncio.gather)
+    return [obj async for obj in queryset]
+
+
+class AsyncDestinationListView(DestinationListView):
+
+    async def get(self, request, *args, **kwargs):
+        if request.GET.get('q'):
+            # Pengecekan tabel FTS menjalankan query: susun queryset di thread
+            queryset = await sync_to_async(self.get_queryset)()
+        else:
+            queryset = self.get_queryset()
+        # Halaman destinasi dan daftar kategori dropdown tidak saling bergantung
+        (paginator, page, destination_list, is_paginated), category_list = await asyncio.gather(
+            self.apaginate_catalog(queryset, self.get_paginate_by(queryset)),
+            alist(Category.objects.all()),
+        )
+        self.object_list = destination_list
+        return self.render_to_response({
+            'view': self,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': destination_list,
+            'destination_list': destination_list,
+            'category_list': category_list,
+        })
+
+
+class AsyncDestinationDetailView(DestinationDetailView):
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.object = await self.get_queryset().aget(slug=self.kwargs[self.slug_url_kwarg])
+        except Destination.DoesNotExist:
+            raise Http404("No destination found matching the query")
+        # Tayangan masuk buffer; flush yang jatuh tempo tidak ditunggu request ini
+        if counts_view(request):
+            self.object.view_count += view_counter.increment(self.object.pk, background=True)
+        nearby = await sync_to_async(nearby_destinations)(self.object)
+        return self.render_to_response(self.get_context_data(object=self.object, nearby_destinations=nearby))
+
+
+@replica_reads
+async def async_surprise_me(request):
+    destination_list = await asample_destinations(
+        settings.SURPRISE_REEL_SIZE, weighted=settings.SURPRISE_REEL_WEIGHTED
+    )
+    return TemplateResponse(request, 'core/surprise.html', {'destination_list': destination_list})
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Halaman katalog memakai view async (lihat ASYNC_VIEWS di settings)
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
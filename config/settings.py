@@ -11,8 +11,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -20,16 +23,26 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
+# Profil settings lewat DJANGO_PROFILE:
+# - dev   : default lokal (DEBUG, browser reload, tailwind)
+# - prod  : server; tanpa app/middleware dev, loader template ter-cache,
+#           cache yang disetel, dan gagal start jika konfigurasi tidak aman
+# - bench : seperti prod tanpa validasi deploy, untuk benchmark lokal
+SETTINGS_PROFILES = ('dev', 'prod', 'bench')
+SETTINGS_PROFILE = os.environ.get('DJANGO_PROFILE', 'dev').lower()
+if SETTINGS_PROFILE not in SETTINGS_PROFILES:
+    raise ImproperlyConfigured(
+        f'DJANGO_PROFILE must be one of {", ".join(SETTINGS_PROFILES)} (got {SETTINGS_PROFILE!r})'
+    )
+
 # SECURITY: Secret key dari environment variable
 # Untuk production, SET environment variable DJANGO_SECRET_KEY
-SECRET_KEY = os.environ.get(
-    'DJANGO_SECRET_KEY',
-    'django-insecure-dev-only-hgo+vx!-710p&@=os*_4o_2360$ntomw2(#$nb2llfw*zpkhd_'
-)
+DEV_SECRET_KEY = 'django-insecure-dev-only-hgo+vx!-710p&@=os*_4o_2360$ntomw2(#$nb2llfw*zpkhd_'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', DEV_SECRET_KEY)
 
-# SECURITY: Debug mode dari environment variable
+# SECURITY: Debug mode dari environment variable (default hanya aktif di profil dev)
 # Untuk production, JANGAN set DEBUG=True
-DEBUG = os.environ.get('DJANGO_DEBUG', 'True').lower() in ('true', '1', 'yes')
+DEBUG = os.environ.get('DJANGO_DEBUG', str(SETTINGS_PROFILE == 'dev')).lower() in ('true', '1', 'yes')
 
 # SECURITY: Allowed hosts dari environment variable
 # Untuk production, set DJANGO_ALLOWED_HOSTS dengan comma-separated values
@@ -40,6 +53,8 @@ ALLOWED_HOSTS = [host.strip() for host in _allowed_hosts.split(',') if host.stri
 # Tambahkan localhost untuk development jika DEBUG=True
 if DEBUG:
     ALLOWED_HOSTS.extend(['localhost', '127.0.0.1', '[::1]', '*'])
+elif SETTINGS_PROFILE == 'bench':
+    ALLOWED_HOSTS.extend(['localhost', '127.0.0.1', 'testserver'])
 
 
 # Application definition
@@ -56,11 +71,15 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'apps.base',
     'apps.core',
-    'tailwind',
-    'theme',
-    'django_browser_reload',
+    'theme',  # <--- CSS hasil build Tailwind (static), dipakai semua profil
 ]
 
+# App khusus development: build Tailwind & auto-reload browser.
+# Jalankan 'manage.py tailwind build' dengan profil dev sebelum collectstatic.
+DEV_APPS = ['tailwind', 'django_browser_reload']
+if SETTINGS_PROFILE == 'dev':
+    INSTALLED_APPS += DEV_APPS
+
 TAILWIND_APP_NAME = 'theme'
 
 INTERNAL_IPS = [
@@ -68,9 +87,10 @@ INTERNAL_IPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.instrumentation.QueryInstrumentationMiddleware',  # <--- Paling luar agar mengukur seluruh request
+    'apps.core.routers.ReplicaRoutingMiddleware',  # <--- Pilih primary/replika per request (termasuk render template)
     'django.middleware.security.SecurityMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # <--- Ditambahkan untuk file statis
-    'django_browser_reload.middleware.BrowserReloadMiddleware',
+    'apps.core.middleware.WhiteNoiseMiddleware',  # <--- File statis (whitenoise, juga mode async)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -79,6 +99,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if SETTINGS_PROFILE == 'dev':
+    # Tepat setelah whitenoise, seperti anjuran django-browser-reload
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('apps.core.middleware.WhiteNoiseMiddleware') + 1,
+        'django_browser_reload.middleware.BrowserReloadMiddleware',
+    )
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -96,6 +123,17 @@ TEMPLATES = [
     },
 ]
 
+if SETTINGS_PROFILE != 'dev':
+    # Loader ter-cache dipasang eksplisit (tanpa autoreload): template
+    # dikompilasi sekali per proses. Butuh APP_DIRS = False.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
@@ -106,9 +144,94 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Koneksi persisten (detik, prod/bench); health check membuang koneksi yang putus
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 0 if SETTINGS_PROFILE == 'dev' else 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+if SETTINGS_PROFILE != 'dev':
+    # BEGIN IMMEDIATE: transaksi tulis mengambil lock di awal sehingga
+    # busy_timeout berlaku, bukan gagal langsung saat upgrade read -> write
+    DATABASES['default']['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+
+# Replika baca (opsional), daftar file SQLite dipisah koma, mis.
+# DJANGO_DB_REPLICAS=/srv/db/replica1.sqlite3. Disalin dari primary dengan
+# command sync_replicas; view publik @replica_reads membaca dari sini.
+DATABASE_REPLICAS = []
+for _index, _path in enumerate(
+    [path.strip() for path in os.environ.get('DJANGO_DB_REPLICAS', '').split(',') if path.strip()], 1
+):
+    DATABASES[f'replica{_index}'] = dict(DATABASES['default'], NAME=_path, TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(f'replica{_index}')
+
+DATABASE_ROUTERS = ['apps.core.routers.PrimaryReplicaRouter']
+
+# Lama bacaan tetap ke primary setelah request tulis (read-your-writes), detik
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+# Pragma SQLite yang dipasang di setiap koneksi baru (apps/core/db.py)
+SQLITE_PRAGMAS = {
+    # Tunggu lock hingga N ms sebelum "database is locked"
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+    # Cache halaman per koneksi (negatif = KiB) & memory-mapped IO (byte)
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+# WAL hanya untuk prod/bench (dev & test runner memakai journal bawaan)
+SQLITE_WAL_PRAGMAS = {
+    # Pembaca tidak diblokir penulis; penulis tidak menunggu pembaca
+    'journal_mode': 'WAL',
+    # Aman untuk WAL: fsync saat checkpoint, bukan tiap commit
+    'synchronous': 'NORMAL',
+}
+if SETTINGS_PROFILE != 'dev':
+    SQLITE_PRAGMAS = {**SQLITE_WAL_PRAGMAS, **SQLITE_PRAGMAS}
+
+# Retry penulisan saat database terkunci: jumlah percobaan & backoff (detik)
+DB_WRITE_RETRIES = 5
+DB_WRITE_RETRY_DELAY = 0.05
+DB_WRITE_RETRY_MAX_DELAY = 1.0
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Untuk multi-proses production, ganti ke Redis/Memcached agar versi katalog terbagi
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'westlombok',
     }
 }
 
+if SETTINGS_PROFILE != 'dev':
+    # Default LocMem hanya 300 entri: halaman, manifest gambar & hitungan
+    # katalog saling mengusir. DJANGO_REDIS_URL = cache terbagi antar proses.
+    if os.environ.get('DJANGO_REDIS_URL'):
+        CACHES['default'] = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['DJANGO_REDIS_URL'],
+            'KEY_PREFIX': 'westlombok',
+        }
+    else:
+        CACHES['default']['OPTIONS'] = {
+            'MAX_ENTRIES': int(os.environ.get('DJANGO_CACHE_MAX_ENTRIES', 20000)),
+            'CULL_FREQUENCY': 4,
+        }
+
+# LocMem hanya aman untuk satu proses worker: proses lain tetap melayani
+# halaman & versi katalog lama. Prod tanpa Redis wajib menyatakannya.
+SINGLE_PROCESS = os.environ.get('DJANGO_SINGLE_PROCESS', 'False').lower() in ('true', '1', 'yes')
+
+# Lama cache halaman publik (detik). Invalidasi utama lewat versi katalog.
+CATALOG_PAGE_CACHE_TIMEOUT = int(os.environ.get('CATALOG_PAGE_CACHE_TIMEOUT', 60 * 15))
+# Lama cache fragmen kartu destinasi (detik). Invalidasi lewat card_version per baris.
+CATALOG_CARD_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CARD_CACHE_TIMEOUT', 60 * 60 * 24))
+# Jumlah destinasi terdekat di halaman detail (0 = nonaktif)
+NEARBY_DESTINATIONS_LIMIT = int(os.environ.get('NEARBY_DESTINATIONS_LIMIT', 4))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -159,11 +282,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Layani MEDIA_URL dari Django (apps/core/media.py). Set False jika web server
+# di depan (nginx, CDN) sudah melayani MEDIA_ROOT langsung.
+MEDIA_SERVE = os.environ.get('DJANGO_MEDIA_SERVE', 'True').lower() in ('true', '1', 'yes')
+# max-age untuk file media tanpa hash di nama (upload lama); yang ber-hash immutable
+MEDIA_CACHE_MAX_AGE = 60 * 60
 
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# Konfigurasi Whitenoise
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# Konfigurasi Whitenoise: file statis ber-hash + terkompresi di production
+# (butuh collectstatic). STATICFILES_STORAGE sudah tidak dibaca sejak Django 5.1.
+if SETTINGS_PROFILE == 'prod':
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'apps.core.storage.CompressedManifestStaticFilesStorage'},
+    }
 
 # Pengaturan Admin Unfold
 UNFOLD = {
@@ -226,3 +359,127 @@ UNFOLD = {
         ],
     },
 }
+
+# View async untuk halaman katalog (list, detail, home, surprise).
+# Aktif otomatis lewat config/asgi.py; server WSGI tetap memakai view sinkron.
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS', 'False').lower() in ('true', '1', 'yes')
+
+# Buffer penghitung tayangan destinasi (write-behind)
+# Tayangan ditulis ke database setiap N detik atau setiap N hit, mana yang lebih dulu
+VIEW_COUNT_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNT_FLUSH_INTERVAL', 10))
+VIEW_COUNT_FLUSH_THRESHOLD = int(os.environ.get('VIEW_COUNT_FLUSH_THRESHOLD', 100))
+
+# Fitur Surprise Me: ukuran reel acak yang dikirim ke animasi
+SURPRISE_REEL_SIZE = 20
+SURPRISE_REEL_MAX = 50
+# True: reel diberi bobot popularitas (view_count); False: acak merata
+SURPRISE_REEL_WEIGHTED = os.environ.get('SURPRISE_REEL_WEIGHTED', 'False').lower() in ('true', '1', 'yes')
+# Umur snapshot id destinasi (detik) sebelum bobot popularitas dimuat ulang
+SURPRISE_ID_CACHE_TTL = 300
+
+# Gambar turunan responsif (srcset WebP + JPEG)
+IMAGE_DERIVATIVE_WIDTHS = (160, 320, 640, 1024, 1600)
+# True: buat turunan saat objek disimpan; False: saat pertama kali dirender
+IMAGE_DERIVATIVES_EAGER = os.environ.get('IMAGE_DERIVATIVES_EAGER', 'True').lower() in ('true', '1', 'yes')
+
+# Paginasi cursor (keyset) untuk daftar destinasi: tanpa COUNT(*) dan OFFSET
+CATALOG_CURSOR_PAGINATION = os.environ.get('CATALOG_CURSOR_PAGINATION', 'False').lower() in ('true', '1', 'yes')
+# Lama cache estimasi jumlah hasil (detik) pada mode cursor
+CATALOG_COUNT_CACHE_TIMEOUT = 60 * 10
+
+# API JSON katalog: ukuran halaman default & maksimum (?limit=), dan max-age
+# Cache-Control (0 = klien selalu revalidasi dengan ETag, dijawab 304 jika sama)
+CATALOG_API_PAGE_SIZE = 20
+CATALOG_API_MAX_PAGE_SIZE = 100
+CATALOG_API_MAX_AGE = 0
+
+# Statistik katalog (read model CatalogStats) untuk dashboard & homepage:
+# panjang daftar top/terbaru yang disimpan dan lama cache barisnya (detik)
+CATALOG_STATS_TOP_SIZE = 5
+CATALOG_STATS_RECENT_SIZE = 5
+CATALOG_STATS_CACHE_TIMEOUT = 60 * 15
+
+# Analitik tayangan per periode (DestinationViewBucket): bucket per jam dari
+# request, digabung jadi harian setelah N hari, dihapus setelah masa retensi
+VIEW_ANALYTICS_ENABLED = os.environ.get('VIEW_ANALYTICS_ENABLED', 'True').lower() in ('true', '1', 'yes')
+VIEW_ANALYTICS_HOURLY = True
+VIEW_ANALYTICS_HOURLY_DAYS = 7
+VIEW_ANALYTICS_RETENTION_DAYS = 400
+
+# Instrumentasi per request: header Server-Timing + log JSON (jumlah query,
+# waktu SQL, query terlambat, waktu view & template)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'True').lower() in ('true', '1', 'yes')
+REQUEST_METRICS_HEADER = os.environ.get('REQUEST_METRICS_HEADER', 'True').lower() in ('true', '1', 'yes')
+# Anggaran jumlah query per nama URL; dilampaui = warning di log, gagal saat test
+QUERY_BUDGETS = {
+    'base:home': 2,
+    'base:about': 0,
+    'core:destination_list': 3,
+    # 2 + destinasi terdekat: 1 (in_bulk) jika hasil grid ter-cache; saat cache
+    # kosong +1 query sel grid per presisi yang dicoba (hingga 4, lihat
+    # maps.NEARBY_PRECISIONS) di data jarang. Flush buffer tayangan dihitung
+    # terpisah (background_queries).
+    'core:destination_detail': 7,
+    'core:district_detail': 3,
+    'core:category_list': 1,
+    'core:category_detail': 3,
+    'core:surprise_me': 3,
+    'core:surprise_reel': 3,
+    'core:api_destination_list': 3,
+    'core:api_destination_detail': 4,
+    'core:api_category_list': 1,
+    'core:api_district_list': 1,
+}
+QUERY_BUDGET_STRICT = TESTING or os.environ.get('QUERY_BUDGET_STRICT', 'False').lower() in ('true', '1', 'yes')
+
+# Thread timer yang mem-flush buffer tayangan tiap VIEW_COUNT_FLUSH_INTERVAL
+# walau tidak ada kunjungan baru; nonaktif saat test (flush dipanggil langsung)
+VIEW_COUNT_FLUSH_TIMER = not TESTING
+
+# Tulis ulang snapshot GeoJSON (maps.py) di thread latar setelah destinasi,
+# kategori atau kecamatan berubah; nonaktif saat test
+GEOJSON_SNAPSHOT_AUTO_REFRESH = not TESTING and os.environ.get('GEOJSON_SNAPSHOT_AUTO_REFRESH', 'True').lower() in ('true', '1', 'yes')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps.core.db': {
+            'handlers': ['console'],
+            'level': 'ERROR' if TESTING else 'WARNING',
+            'propagate': False,
+        },
+        'apps.core.instrumentation': {
+            'handlers': ['console'],
+            'level': os.environ.get(
+                'REQUEST_METRICS_LOG_LEVEL', 'WARNING' if TESTING or SETTINGS_PROFILE == 'bench' else 'INFO'
+            ),
+            'propagate': False,
+        },
+    },
+}
+
+# Validasi profil prod: gagal saat start, bukan setelah melayani request
+if SETTINGS_PROFILE == 'prod':
+    _problems = []
+    if DEBUG:
+        _problems.append('DEBUG must be off (unset DJANGO_DEBUG)')
+    if SECRET_KEY == DEV_SECRET_KEY or len(SECRET_KEY) < 50:
+        _problems.append('set DJANGO_SECRET_KEY to a random value of at least 50 characters')
+    if not ALLOWED_HOSTS or '*' in ALLOWED_HOSTS:
+        _problems.append('set DJANGO_ALLOWED_HOSTS to the real host names (no "*")')
+    if os.environ.get('DJANGO_REDIS_URL'):
+        try:
+            import redis  # noqa: F401
+        except ImportError:
+            _problems.append('DJANGO_REDIS_URL needs the "redis" package installed')
+    elif not SINGLE_PROCESS:
+        _problems.append(
+            'set DJANGO_REDIS_URL (shared cache) or DJANGO_SINGLE_PROCESS=1 for a single worker process'
+        )
+    if _problems:
+        raise ImproperlyConfigured('Production profile misconfigured: ' + '; '.join(_problems))
@@ -1,10 +1,13 @@
 # Konfigurasi URL utama untuk proyek.
 # Mengatur routing ke admin, apps base, core, dan media files.
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 # Tambahan import untuk media
 from django.conf import settings
 from django.conf.urls.static import static
+from apps.core.media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,11 +16,18 @@ urlpatterns = [
 ]
 
 if settings.DEBUG:
+    # App browser reload hanya terpasang di profil dev
+    if 'django_browser_reload' in settings.INSTALLED_APPS:
+        urlpatterns += [
+            path("__reload__/", include("django_browser_reload.urls")),
+        ]
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.BASE_DIR / 'static')
+
+if settings.MEDIA_SERVE:
+    # File upload di semua profil: ETag, Range, varian terkompresi, immutable
     urlpatterns += [
-        path("__reload__/", include("django_browser_reload.urls")),
+        re_path(rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<path>.+)$', serve_media, name='media'),
     ]
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.BASE_DIR / 'static')
 
 # Custom error handlers
 handler404 = 'apps.base.views.custom_404'
\ No newline at end of file